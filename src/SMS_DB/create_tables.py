@@ -1,6 +1,7 @@
 import os
 import logging
 from src.db_engine import DBEngine
+from src.SMS_DB.migrate import apply_migrations
 import psycopg2
 
 def create_tables() -> None:
@@ -8,6 +9,7 @@ def create_tables() -> None:
 
     This function connects to the database using the DBEngine class, reads SQL
     commands from the 'SMS_tables.sql' file, and executes them to create tables.
+    Pending migrations from the 'migrations' directory are applied afterwards.
     If the table creation is successful, a success message is logged. If an
     error occurs, it is logged, the transaction is rolled back, and the error
     is raised.
@@ -27,6 +29,7 @@ def create_tables() -> None:
             db_engine.cursor.execute(sql_commands)
             db_engine.connection.commit()
             logger.info('Tables created successfully.')
+            apply_migrations(logger)
         else:
             raise RuntimeError("Database connection or cursor is not initialized.")
 
@@ -4,6 +4,8 @@ from psycopg2 import sql
 from dotenv import load_dotenv, set_key
 import logging
 from src.db_engine import DBEngine
+from src.query_log import query_log
+from src.SMS_DB.migrate import apply_migrations
 from typing import Optional
 
 dotenv_path = os.path.join(os.path.dirname(__file__), '..', 'config', '.env')
@@ -87,7 +89,8 @@ def create_tables() -> None:
 
     Connects to the 'SMS' database using the DBEngine class, reads SQL commands from the
     'SMS_tables.sql' file, and executes them to create tables. Logs the success or failure of
-    the table creation and continues gracefully if a table already exists.
+    the table creation and continues gracefully if a table already exists. Pending
+    migrations are applied afterwards in both cases.
     """
     logging.basicConfig(level=logging.INFO)
     logger = logging.getLogger(__name__)
@@ -113,6 +116,7 @@ def create_tables() -> None:
                 logger.error(f"Error executing SQL commands: {e}")
                 db_engine.connection.rollback()
                 raise
+            apply_migrations(logger)
         else:
             raise RuntimeError("Database connection or cursor is not initialized.")
 
@@ -159,20 +163,38 @@ def list_tables() -> None:
             db_engine.connection.close()
 
 
+def run_migrations() -> None:
+    """Apply pending migrations and report which ones ran."""
+    logging.basicConfig(level=logging.INFO)
+    logger = logging.getLogger(__name__)
+
+    try:
+        applied = apply_migrations(logger)
+    except (Exception, psycopg2.Error) as error:
+        print(f"Error applying migrations: {error}")
+        return
+    if applied:
+        print(f"Applied migrations: {', '.join(applied)}")
+    else:
+        print("Database schema is up to date.")
+
+
 def database_management_menu() -> None:
     """Display a menu for database management options.
 
     Provides options to create or update the .env file, check or create the database,
-    create tables, list tables, and exit. Handles user input to perform these actions.
+    create tables, list tables, apply migrations, show query statistics, and exit. Handles user input to perform these actions.
     """
     while True:
         print("\nDatabase Management Menu")
         print("1. Create or Update .env File")
         print("2. Check/Create Database and Create Tables")
         print("3. List Tables in Database")
-        print("4. Exit")
+        print("4. Apply Database Migrations")
+        print("5. Show Query Statistics")
+        print("6. Exit")
 
-        choice = input("Enter your choice (1-4): ")
+        choice = input("Enter your choice (1-6): ")
 
         if choice == '1':
             # Allow the user to enter new values for the .env file
@@ -186,9 +208,13 @@ def database_management_menu() -> None:
         elif choice == '3':
             list_tables()
         elif choice == '4':
+            run_migrations()
+        elif choice == '5':
+            query_log.report()
+        elif choice == '6':
             break
         else:
-            print("Invalid choice, please select between 1 and 4.")
+            print("Invalid choice, please select between 1 and 6.")
 
 
 if __name__ == '__main__':
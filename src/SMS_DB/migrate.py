@@ -0,0 +1,150 @@
+import os
+import re
+import logging
+import psycopg2
+from typing import List, Optional, Set, Tuple
+from src.db_engine import DBEngine
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(__file__), 'migrations')
+MIGRATION_FILE = re.compile(r'^(\d+)_[\w-]+\.sql$')
+NO_TRANSACTION_MARKER = '-- migrate: no-transaction'
+
+# Set once check_migrations() has found the schema up to date.
+_schema_checked = False
+
+
+class PendingMigrationsError(RuntimeError):
+    """Raised when the database lacks migrations the models rely on, such as the "Version" columns."""
+
+    def __init__(self, versions: List[str]) -> None:
+        super().__init__(f"The database schema is out of date; pending migrations: {', '.join(versions)}. "
+                         "Apply them with Database Management > Apply Database Migrations (menu 6, option 4).")
+        self.versions = versions
+
+
+def available_migrations(directory: str = MIGRATIONS_DIR) -> List[Tuple[str, str]]:
+    """List the migration files in version order.
+
+    Migrations are files named ``NNN_description.sql``; the file name without its
+    extension is the version recorded once the migration has been applied.
+
+    :param directory: Directory holding the migration files.
+    :return: List of (version, path) tuples.
+    """
+    if not os.path.isdir(directory):
+        return []
+    names = [name for name in os.listdir(directory) if MIGRATION_FILE.match(name)]
+    names.sort(key=lambda name: (int(MIGRATION_FILE.match(name).group(1)), name))  # type: ignore[union-attr]
+    return [(os.path.splitext(name)[0], os.path.join(directory, name)) for name in names]
+
+
+def split_statements(sql_commands: str) -> List[str]:
+    """Split a migration into its statements, one per line ending with ';'.
+
+    Only used for no-transaction migrations, whose statements must be sent one at a
+    time; keep each statement's terminating semicolon at the end of a line.
+    """
+    lines = [line for line in sql_commands.splitlines() if not line.strip().startswith('--')]
+    statements = re.split(r';\s*(?:\n|$)', '\n'.join(lines))
+    return [statement.strip() for statement in statements if statement.strip()]
+
+
+def applied_migrations(cursor: psycopg2.extensions.cursor) -> Set[str]:
+    """Create the tracking table if needed and return the versions already applied."""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS "Schema Migrations" (
+            "Version"            VARCHAR PRIMARY KEY,
+            "AppliedAt"          TIMESTAMP NOT NULL DEFAULT NOW()
+        )
+    """)
+    cursor.execute('SELECT "Version" FROM "Schema Migrations"')
+    return {row[0] for row in cursor.fetchall()}
+
+
+def pending_migrations(cursor: psycopg2.extensions.cursor, directory: str = MIGRATIONS_DIR) -> List[str]:
+    """Return the versions in ``directory`` not applied yet, without creating the tracking table."""
+    cursor.execute("SELECT to_regclass('\"Schema Migrations\"')")
+    done: Set[str] = set()
+    if cursor.fetchone()[0] is not None:
+        cursor.execute('SELECT "Version" FROM "Schema Migrations"')
+        done = {row[0] for row in cursor.fetchall()}
+    return [version for version, _ in available_migrations(directory) if version not in done]
+
+
+def check_migrations(directory: str = MIGRATIONS_DIR) -> None:
+    """Make sure every migration has been applied before the models query the database.
+
+    The database is only asked until a check passes; later calls return at once.
+
+    :param directory: Directory holding the migration files.
+    :raises PendingMigrationsError: If some migrations have not been applied.
+    """
+    global _schema_checked
+    if _schema_checked:
+        return
+    with DBEngine() as db:
+        if db.connection is None or db.cursor is None:
+            raise RuntimeError("Database connection or cursor is not initialized.")
+        pending = pending_migrations(db.cursor, directory)
+        db.connection.rollback()
+    if pending:
+        raise PendingMigrationsError(pending)
+    _schema_checked = True
+
+
+def apply_migrations(logger: Optional[logging.Logger] = None, directory: str = MIGRATIONS_DIR) -> List[str]:
+    """Apply every migration that has not been applied yet, in version order.
+
+    Each migration runs in its own transaction together with its entry in
+    "Schema Migrations". Migrations whose first line is ``-- migrate: no-transaction``
+    run in autocommit mode instead, which ``CREATE INDEX CONCURRENTLY`` requires;
+    their statements should be idempotent (``IF NOT EXISTS``) so a failed run can
+    simply be repeated.
+
+    :param logger: Optional logging.Logger instance.
+    :param directory: Directory holding the migration files.
+    :return: Versions applied by this call.
+    :raises psycopg2.Error: If a migration fails; later migrations are not attempted.
+    """
+    logger = logger or logging.getLogger(__name__)
+    applied: List[str] = []
+
+    with DBEngine(logger=logger) as db:
+        if db.connection is None or db.cursor is None:
+            raise RuntimeError("Database connection or cursor is not initialized.")
+        connection, cursor = db.connection, db.cursor
+
+        done = applied_migrations(cursor)
+        connection.commit()
+
+        for version, path in available_migrations(directory):
+            if version in done:
+                continue
+            with open(path, 'r') as file:
+                sql_commands = file.read()
+
+            try:
+                if sql_commands.lstrip().startswith(NO_TRANSACTION_MARKER):
+                    connection.autocommit = True
+                    try:
+                        for statement in split_statements(sql_commands):
+                            cursor.execute(statement)
+                    finally:
+                        connection.autocommit = False
+                else:
+                    cursor.execute(sql_commands)
+                cursor.execute('INSERT INTO "Schema Migrations" ("Version") VALUES (%s)', (version,))
+                connection.commit()
+            except (Exception, psycopg2.Error) as error:
+                logger.error(f"Error applying migration {version}: {error}")
+                connection.rollback()
+                raise
+            logger.info(f"Applied migration {version}.")
+            applied.append(version)
+
+    return applied
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    apply_migrations()
@@ -0,0 +1,3 @@
+-- migrate: no-transaction
+-- Supports FoodItem.expiring_between range scans over the whole catalog without locking "Food Item" for writes.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS "Food Item_ExpiryDate_idx" ON "Food Item" ("ExpiryDate", "FoodItemID");
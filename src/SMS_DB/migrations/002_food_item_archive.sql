@@ -0,0 +1,15 @@
+-- migrate: no-transaction
+-- Expired food items moved out of "Food Item" by src/product/expiry_sweeper.py.
+CREATE TABLE IF NOT EXISTS "Food Item Archive" (
+    "FoodItemID"         INTEGER PRIMARY KEY,
+    "Name"               VARCHAR,
+    "Amount"             INTEGER,
+    "Price"              INTEGER,
+    "StorageCondition"   VARCHAR,
+    "ExpiryDate"         DATE,
+    "StoreIDs"           INTEGER[] NOT NULL DEFAULT '{}',
+    "ArchivedAt"         TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+-- Each sweep batch deletes "StoreFoodProduct" links by "FoodID", which the StoreID-led primary key cannot serve.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS "StoreFoodProduct_FoodID_idx" ON "StoreFoodProduct" ("FoodID", "StoreID");
@@ -0,0 +1,41 @@
+-- Dry and food stock of every store in one pre-joined relation, read by src/store/inventory_view.py.
+CREATE MATERIALIZED VIEW IF NOT EXISTS "Store Inventory" AS
+SELECT sdp."StoreID",
+       'dry'::VARCHAR                    AS "Kind",
+       d."DryStorageItemID"              AS "ItemID",
+       d."Name",
+       d."Amount",
+       d."Price",
+       d."Amount"::BIGINT * d."Price"    AS "Value",
+       d."RecipeItem",
+       d."Chemical",
+       d."PackageType",
+       NULL::VARCHAR                     AS "StorageCondition",
+       NULL::DATE                        AS "ExpiryDate"
+FROM "StoreDryProduct" sdp
+JOIN "Dry Storage Item" d ON d."DryStorageItemID" = sdp."DryStorageID"
+UNION ALL
+SELECT sfp."StoreID",
+       'food'::VARCHAR,
+       f."FoodItemID",
+       f."Name",
+       f."Amount",
+       f."Price",
+       f."Amount"::BIGINT * f."Price",
+       NULL::BOOLEAN,
+       NULL::BOOLEAN,
+       NULL::VARCHAR,
+       f."StorageCondition",
+       f."ExpiryDate"
+FROM "StoreFoodProduct" sfp
+JOIN "Food Item" f ON f."FoodItemID" = sfp."FoodID";
+
+-- Required by REFRESH MATERIALIZED VIEW CONCURRENTLY; also serves per-store reads.
+CREATE UNIQUE INDEX IF NOT EXISTS "Store Inventory_key" ON "Store Inventory" ("StoreID", "Kind", "ItemID");
+
+CREATE TABLE IF NOT EXISTS "Materialized View Refresh" (
+    "ViewName"           VARCHAR PRIMARY KEY,
+    "RefreshedAt"        TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+INSERT INTO "Materialized View Refresh" ("ViewName") VALUES ('Store Inventory') ON CONFLICT DO NOTHING;
@@ -0,0 +1,5 @@
+-- migrate: no-transaction
+-- The link tables' primary keys lead with "StoreID"; these serve lookups by product (stores_for).
+-- "StoreFoodProduct_FoodID_idx" already exists from 002; repeated here so the pair is defined together.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS "StoreDryProduct_DryStorageID_idx" ON "StoreDryProduct" ("DryStorageID", "StoreID");
+CREATE INDEX CONCURRENTLY IF NOT EXISTS "StoreFoodProduct_FoodID_idx" ON "StoreFoodProduct" ("FoodID", "StoreID");
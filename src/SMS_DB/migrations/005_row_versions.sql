@@ -0,0 +1,8 @@
+-- Row versions for optimistic concurrency (src/tracking.py): every UPDATE through save()
+-- bumps "Version" and only matches the version the row was loaded with.
+-- A constant default is a catalog-only change, so existing rows are not rewritten.
+ALTER TABLE "Dry Storage Item" ADD COLUMN IF NOT EXISTS "Version" INTEGER NOT NULL DEFAULT 1;
+ALTER TABLE "Food Item" ADD COLUMN IF NOT EXISTS "Version" INTEGER NOT NULL DEFAULT 1;
+ALTER TABLE "Worker" ADD COLUMN IF NOT EXISTS "Version" INTEGER NOT NULL DEFAULT 1;
+ALTER TABLE "Manager" ADD COLUMN IF NOT EXISTS "Version" INTEGER NOT NULL DEFAULT 1;
+ALTER TABLE "Store Manager" ADD COLUMN IF NOT EXISTS "Version" INTEGER NOT NULL DEFAULT 1;
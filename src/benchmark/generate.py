@@ -0,0 +1,346 @@
+"""Deterministic synthetic data for load testing, written with COPY.
+
+``generate(volumes, seed)`` fills all ten tables of ``SMS_tables.sql`` with
+rows whose foreign keys are valid and whose sizes are skewed the way real
+chains are: store sizes follow a Zipf distribution, so a few stores carry most
+of the products and staff and many stores carry little.
+
+Keys are assigned by the generator, following the current maximum of every
+table, so each table can be streamed by its own process with
+``COPY ... FROM STDIN`` without waiting for the keys of the tables it
+references; only the order of the three phases (referenced tables, then staff
+and product links, then responsibilities of store managers) is enforced. Every
+table is generated by its own random generator seeded from ``seed``, the table
+and its first key, so the same seed on the same starting state always writes
+the same rows, whatever the number of processes.
+
+Running it again on a populated database tops the dataset up: the new products
+are linked to existing and new stores, and new staff join existing and new
+stores. The sequences are moved past the generated keys afterwards. Nothing else
+may insert into the tables while the generator runs.
+
+    python -m src.benchmark.generate --scale 50 --seed 7 --workers 8
+"""
+
+import argparse
+import datetime
+import io
+import itertools
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+from src.db_engine import DBEngine
+
+# Rows generated per call of the weighted store picker; bounds memory for tables of tens of millions of rows.
+CHUNK_SIZE = 10_000
+
+# Exponent of the Zipf distribution of store sizes; higher means a few even larger stores.
+DEFAULT_SKEW = 1.1
+
+COUNTRIES = ('Lithuania', 'Latvia', 'Estonia', 'Poland', 'Finland', 'Sweden')
+PACKAGE_TYPES = ('Bag', 'Box', 'Bottle', 'Can', 'Jar', 'Sack')
+STORAGE_CONDITIONS = ('Frozen', 'Chilled', 'Ambient', 'Dry')
+FIRST_EXPIRY = datetime.date(2025, 1, 1)
+
+# Table -> (key column or None for link tables, copied columns).
+TABLES: Dict[str, Tuple[Optional[str], Tuple[str, ...]]] = {
+    'Responsibilities': ('ResponsibilityID', ('ResponsibilityID', 'ResponsibilityName')),
+    'Store': ('StoreID', ('StoreID', 'StoreName')),
+    'Dry Storage Item': ('DryStorageItemID', ('DryStorageItemID', 'Name', 'Amount', 'Price', 'RecipeItem',
+                                              'Chemical', 'PackageType')),
+    'Food Item': ('FoodItemID', ('FoodItemID', 'Name', 'Amount', 'Price', 'StorageCondition', 'ExpiryDate')),
+    'Store Manager': ('StoreManagerID', ('StoreManagerID', 'StoreID', 'Name', 'Country', 'Email', 'PhoneNumber',
+                                         'MonthlySalary', 'PettyCash')),
+    'Manager': ('ManagerID', ('ManagerID', 'Name', 'PhoneNumber', 'Country', 'Email', 'MonthlySalary',
+                              'ResponsibilityID', 'StoreID')),
+    'Worker': ('WorkerID', ('WorkerID', 'Name', 'PhoneNumber', 'Email', 'Country', 'HourlyRate', 'AmountWorked',
+                            'StoreID')),
+    'StoreDryProduct': (None, ('StoreID', 'DryStorageID')),
+    'StoreFoodProduct': (None, ('StoreID', 'FoodID')),
+    'SM Responsibilities': (None, ('ResponsibilityID', 'StoreManagerID')),
+}
+
+# Tables of one phase only reference tables of earlier phases.
+PHASES: Tuple[Tuple[str, ...], ...] = (
+    ('Responsibilities', 'Store', 'Dry Storage Item', 'Food Item'),
+    ('Store Manager', 'Manager', 'Worker', 'StoreDryProduct', 'StoreFoodProduct'),
+    ('SM Responsibilities',),
+)
+
+
+class Volumes(NamedTuple):
+    """Rows to add per table; link counts are totals over all stores and approximate."""
+    responsibilities: int = 20
+    stores: int = 100
+    dry_items: int = 10_000
+    food_items: int = 10_000
+    store_managers: int = 100
+    managers: int = 500
+    workers: int = 20_000
+    dry_links: int = 200_000
+    food_links: int = 200_000
+    responsibilities_per_store_manager: int = 3
+
+    def scaled(self, factor: float) -> 'Volumes':
+        """Multiply every row count except the responsibilities catalogue by ``factor``."""
+        return self._replace(**{field: max(1, round(getattr(self, field) * factor))
+                                for field in ('stores', 'dry_items', 'food_items', 'store_managers', 'managers',
+                                              'workers', 'dry_links', 'food_links')})
+
+
+class Plan(NamedTuple):
+    """Everything a table's generator needs, picklable for the worker processes.
+
+    Attributes:
+        volumes (Volumes): Rows to add.
+        seed (int): Seed of the whole run.
+        skew (float): Zipf exponent of store sizes.
+        first_ids (Dict[str, int]): First key generated per table, one past its current maximum.
+        store_ids (Tuple[int, ...]): Existing stores followed by the new ones, largest first.
+        responsibility_ids (Tuple[int, ...]): Existing and new responsibilities.
+    """
+    volumes: Volumes
+    seed: int
+    skew: float
+    first_ids: Dict[str, int]
+    store_ids: Tuple[int, ...]
+    responsibility_ids: Tuple[int, ...]
+
+    def new_ids(self, table: str, count: int) -> range:
+        """Keys of the rows added to a table."""
+        return range(self.first_ids[table], self.first_ids[table] + count)
+
+    def rng(self, table: str) -> random.Random:
+        """Random generator of one table, independent of the other tables and of scheduling."""
+        return random.Random(f'{self.seed}:{table}:{self.first_ids.get(table, 0)}')
+
+
+def zipf_cumulative_weights(count: int, skew: float) -> List[float]:
+    """Cumulative Zipf weights of ``count`` ranks, for ``random.choices(cum_weights=...)``."""
+    return list(itertools.accumulate(1 / rank ** skew for rank in range(1, count + 1)))
+
+
+def make_plan(volumes: Volumes, seed: int, skew: float, max_ids: Dict[str, int], existing_store_ids: Sequence[int],
+              existing_responsibility_ids: Sequence[int]) -> Plan:
+    """Lay out the keys of a run on top of the current state of the database."""
+    first_ids = {table: max_ids.get(table, 0) + 1 for table, (key, _) in TABLES.items() if key is not None}
+    new_stores = range(first_ids['Store'], first_ids['Store'] + volumes.stores)
+    new_responsibilities = range(first_ids['Responsibilities'],
+                                 first_ids['Responsibilities'] + volumes.responsibilities)
+    return Plan(volumes, seed, skew, first_ids, tuple(existing_store_ids) + tuple(new_stores),
+                tuple(existing_responsibility_ids) + tuple(new_responsibilities))
+
+
+def _stores(plan: Plan, rng: random.Random, count: int) -> Iterator[int]:
+    """Pick ``count`` stores with Zipf-skewed probability, in bounded chunks."""
+    cumulative = zipf_cumulative_weights(len(plan.store_ids), plan.skew)
+    for start in range(0, count, CHUNK_SIZE):
+        yield from rng.choices(plan.store_ids, cum_weights=cumulative, k=min(CHUNK_SIZE, count - start))
+
+
+def _links(plan: Plan, rng: random.Random, items: range, total: int) -> Iterator[Tuple[Any, ...]]:
+    """Link new items to stores, each store getting a Zipf share of ``total`` distinct items."""
+    if not items:
+        return
+    cumulative = zipf_cumulative_weights(len(plan.store_ids), plan.skew)
+    weight_sum = cumulative[-1]
+    previous = 0.0
+    for store_id, weight in zip(plan.store_ids, cumulative):
+        share = min(len(items), round(total * (weight - previous) / weight_sum))
+        previous = weight
+        for item_id in sorted(rng.sample(items, share)):
+            yield store_id, item_id
+
+
+def _people(plan: Plan, rng: random.Random, table: str, count: int,
+            build: Callable[[random.Random, int, int], Tuple[Any, ...]]) -> Iterator[Tuple[Any, ...]]:
+    for id, store_id in zip(plan.new_ids(table, count), _stores(plan, rng, count)):
+        yield build(rng, id, store_id)
+
+
+def rows(plan: Plan, table: str) -> Iterator[Tuple[Any, ...]]:
+    """Generate the new rows of a table in the column order of TABLES."""
+    volumes = plan.volumes
+    rng = plan.rng(table)
+    if table == 'Responsibilities':
+        return ((id, f'Responsibility {id}') for id in plan.new_ids(table, volumes.responsibilities))
+    if table == 'Store':
+        return ((id, f'Store {id}') for id in plan.new_ids(table, volumes.stores))
+    if table == 'Dry Storage Item':
+        return ((id, f'Dry item {id}', rng.randint(0, 1000), rng.randint(1, 200), rng.random() < 0.3,
+                 rng.random() < 0.05, rng.choice(PACKAGE_TYPES)) for id in plan.new_ids(table, volumes.dry_items))
+    if table == 'Food Item':
+        return ((id, f'Food item {id}', rng.randint(0, 1000), rng.randint(1, 200), rng.choice(STORAGE_CONDITIONS),
+                 FIRST_EXPIRY + datetime.timedelta(days=rng.randint(0, 730)))
+                for id in plan.new_ids(table, volumes.food_items))
+    if table == 'Store Manager':
+        return _people(plan, rng, table, volumes.store_managers, lambda r, id, store_id: (
+            id, store_id, f'Store manager {id}', r.choice(COUNTRIES), f'store.manager{id}@example.lt',
+            600000000 + id % 100000000, r.randint(3000, 7000), r.randint(0, 1000)))
+    if table == 'Manager':
+        return _people(plan, rng, table, volumes.managers, lambda r, id, store_id: (
+            id, f'Manager {id}', 610000000 + id % 100000000, r.choice(COUNTRIES), f'manager{id}@example.lt',
+            r.randint(2000, 5000), r.choice(plan.responsibility_ids), store_id))
+    if table == 'Worker':
+        return _people(plan, rng, table, volumes.workers, lambda r, id, store_id: (
+            id, f'Worker {id}', 620000000 + id % 100000000, f'worker{id}@example.lt', r.choice(COUNTRIES),
+            r.randint(8, 30), r.randint(0, 200), store_id))
+    if table == 'StoreDryProduct':
+        return _links(plan, rng, plan.new_ids('Dry Storage Item', volumes.dry_items), volumes.dry_links)
+    if table == 'StoreFoodProduct':
+        return _links(plan, rng, plan.new_ids('Food Item', volumes.food_items), volumes.food_links)
+    if table == 'SM Responsibilities':
+        per_manager = min(volumes.responsibilities_per_store_manager, len(plan.responsibility_ids))
+        return ((responsibility_id, store_manager_id)
+                for store_manager_id in plan.new_ids('Store Manager', volumes.store_managers)
+                for responsibility_id in sorted(rng.sample(plan.responsibility_ids, per_manager)))
+    raise ValueError(f"Unknown table: {table}")
+
+
+def _copy_value(value: Any) -> str:
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    return str(value)
+
+
+class RowStream(io.RawIOBase):
+    """File-like object feeding generated rows to ``copy_expert`` in COPY text format without buffering them all.
+
+    Generated values never contain tabs, newlines or backslashes, so they are not escaped.
+    """
+
+    def __init__(self, rows: Iterable[Tuple[Any, ...]]) -> None:
+        super().__init__()
+        self._rows = iter(rows)
+        self._buffer = b''
+        self.count = 0
+
+    def readable(self) -> bool:
+        """Tell io and psycopg2 that the stream can be read."""
+        return True
+
+    def read(self, size: int = -1) -> bytes:
+        """Return up to ``size`` bytes of COPY lines, or all of them if ``size`` is negative."""
+        lines = [self._buffer]
+        length = len(self._buffer)
+        while size < 0 or length < size:
+            row = next(self._rows, None)
+            if row is None:
+                break
+            line = ('\t'.join(_copy_value(value) for value in row) + '\n').encode('utf-8')
+            lines.append(line)
+            length += len(line)
+            self.count += 1
+        data = b''.join(lines)
+        if size < 0:
+            self._buffer = b''
+            return data
+        self._buffer = data[size:]
+        return data[:size]
+
+
+def copy_table(plan: Plan, table: str) -> Tuple[str, int, float]:
+    """Generate one table's rows and COPY them in on a connection of its own.
+
+    :return: The table, the rows written and the seconds it took.
+    """
+    started = time.perf_counter()
+    _, columns = TABLES[table]
+    stream = RowStream(rows(plan, table))
+    with DBEngine() as db:
+        if db.connection is None or db.cursor is None:
+            raise RuntimeError("Database connection or cursor is not initialized.")
+        names = ', '.join(f'"{column}"' for column in columns)
+        db.cursor.copy_expert(f'COPY "{table}" ({names}) FROM STDIN', stream, size=1 << 16)
+        db.connection.commit()
+    return table, stream.count, time.perf_counter() - started
+
+
+def current_state(cursor: Any) -> Tuple[Dict[str, int], List[int], List[int]]:
+    """Read the maximum key of every table and the existing store and responsibility keys.
+
+    Stores are returned largest first, so existing big stores stay big after a top-up.
+    """
+    max_ids = {}
+    for table, (key, _) in TABLES.items():
+        if key is not None:
+            cursor.execute(f'SELECT COALESCE(MAX("{key}"), 0) FROM "{table}"')
+            max_ids[table] = cursor.fetchone()[0]
+    cursor.execute("""
+        SELECT s."StoreID"
+        FROM "Store" s
+        LEFT JOIN "StoreDryProduct" sdp ON sdp."StoreID" = s."StoreID"
+        GROUP BY s."StoreID"
+        ORDER BY COUNT(sdp."DryStorageID") DESC, s."StoreID"
+    """)
+    store_ids = [row[0] for row in cursor.fetchall()]
+    cursor.execute('SELECT "ResponsibilityID" FROM "Responsibilities" ORDER BY "ResponsibilityID"')
+    responsibility_ids = [row[0] for row in cursor.fetchall()]
+    return max_ids, store_ids, responsibility_ids
+
+
+def _finish(cursor: Any) -> None:
+    for table, (key, _) in TABLES.items():
+        if key is not None:
+            cursor.execute(f"""SELECT setval(pg_get_serial_sequence('"{table}"', '{key}'), MAX("{key}"))
+                               FROM "{table}" HAVING MAX("{key}") IS NOT NULL""")
+    cursor.execute('ANALYZE')
+
+
+def generate(volumes: Volumes, seed: int = 42, workers: Optional[int] = None,
+             skew: float = DEFAULT_SKEW) -> Dict[str, int]:
+    """Add a synthetic dataset of the given volumes to the database.
+
+    :param volumes: Rows to add per table.
+    :param seed: Seed making the run repeatable.
+    :param workers: Tables copied at the same time, each in its own process; 1 copies in this process.
+    :param skew: Zipf exponent of store sizes.
+    :return: Rows written per table.
+    """
+    workers = workers or os.cpu_count() or 1
+    with DBEngine() as db:
+        if db.connection is None or db.cursor is None:
+            raise RuntimeError("Database connection or cursor is not initialized.")
+        plan = make_plan(volumes, seed, skew, *current_state(db.cursor))
+        db.connection.commit()
+
+    written: Dict[str, int] = {}
+    for phase in PHASES:
+        if workers == 1:
+            results = [copy_table(plan, table) for table in phase]
+        else:
+            with ProcessPoolExecutor(max_workers=min(workers, len(phase))) as executor:
+                results = list(executor.map(copy_table, itertools.repeat(plan), phase))
+        for table, count, seconds in results:
+            written[table] = count
+            print(f"{table}: {count} rows in {seconds:.1f}s")
+
+    with DBEngine() as db:
+        if db.connection is None or db.cursor is None:
+            raise RuntimeError("Database connection or cursor is not initialized.")
+        _finish(db.cursor)
+        db.connection.commit()
+    return written
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Command line entry point: ``python -m src.benchmark.generate [--scale N] [--seed N] [--workers N]``."""
+    parser = argparse.ArgumentParser(description="Add synthetic data to the database configured in .env.")
+    parser.add_argument('--scale', type=float, default=1.0,
+                        help="Multiple of the base volumes (about 450k rows); 50 writes over 20 million rows.")
+    parser.add_argument('--seed', type=int, default=42, help="Seed making the data repeatable.")
+    parser.add_argument('--workers', type=int, default=None, help="Tables copied in parallel (default: CPU count).")
+    parser.add_argument('--skew', type=float, default=DEFAULT_SKEW, help="Zipf exponent of store sizes.")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    written = generate(Volumes().scaled(args.scale), args.seed, args.workers, args.skew)
+    print(f"Wrote {sum(written.values())} rows in {time.perf_counter() - started:.1f}s.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,161 @@
+"""Throwaway PostgreSQL database for the benchmarks, seeded at a chosen scale.
+
+``throwaway_database()`` creates a new database on the server from the .env
+file, points DB_NAME at it, builds the schema from ``SMS_tables.sql`` plus the
+migrations, and drops it again on exit. A name that is already taken is refused,
+so an existing database is never dropped.
+``seed()`` then fills it with a deterministic dataset.
+"""
+
+import contextlib
+import logging
+import os
+import random
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+import psycopg2
+from psycopg2 import sql
+from psycopg2.extras import execute_values
+from src.db_engine import DBEngine, close_pool, configure_pool
+from src.SMS_DB.create_tables import create_tables
+
+logger = logging.getLogger(__name__)
+
+DATABASE_PREFIX = 'SMS_benchmark'
+
+
+class Scale(NamedTuple):
+    """Row counts of a seeded dataset."""
+    stores: int
+    dry_items: int
+    food_items: int
+    workers: int
+    managers: int
+    store_managers: int
+    links_per_store: int
+    responsibilities: int
+
+
+SCALES: Dict[str, Scale] = {
+    'small': Scale(10, 500, 500, 1_000, 50, 10, 100, 10),
+    'medium': Scale(100, 5_000, 5_000, 20_000, 500, 100, 500, 20),
+    'large': Scale(1_000, 50_000, 50_000, 200_000, 5_000, 1_000, 2_000, 50),
+}
+
+
+class Dataset(NamedTuple):
+    """Keys of the seeded rows, for picking benchmark targets."""
+    store_ids: List[int]
+    dry_item_ids: List[int]
+    food_item_ids: List[int]
+    worker_ids: List[int]
+    manager_ids: List[int]
+    store_manager_ids: List[int]
+
+
+@contextlib.contextmanager
+def throwaway_database(name: Optional[str] = None, keep: bool = False) -> Iterator[str]:
+    """Create an empty SMS database, route every DBEngine to it and drop it afterwards.
+
+    :param name: Database name; defaults to one unique to this process.
+    :param keep: Leave the database in place, e.g. to inspect it.
+    :return: Name of the database.
+    :raises psycopg2.errors.DuplicateDatabase: If a database with that name already exists.
+    """
+    name = name or f'{DATABASE_PREFIX}_{os.getpid()}'
+    create_database(name)
+    previous = os.environ.get('DB_NAME')
+    os.environ['DB_NAME'] = name
+    try:
+        configure_pool()
+        create_tables()
+        yield name
+    finally:
+        close_pool()
+        if previous is None:
+            del os.environ['DB_NAME']
+        else:
+            os.environ['DB_NAME'] = previous
+        if not keep:
+            drop_database(name)
+
+
+def create_database(name: str) -> None:
+    """Create a database on the configured server, failing if the name is taken."""
+    _run_on_server(sql.SQL("CREATE DATABASE {}").format(sql.Identifier(name)))
+    logger.info(f"Database '{name}' created.")
+
+
+def drop_database(name: str) -> None:
+    """Drop a database on the configured server; its connections must be closed already."""
+    _run_on_server(sql.SQL("DROP DATABASE IF EXISTS {}").format(sql.Identifier(name)))
+
+
+def _run_on_server(statement: sql.Composed) -> None:
+    connection = psycopg2.connect(dbname='postgres', user=os.getenv('DB_USERNAME'), password=os.getenv('DB_PASSWORD'),
+                                  host=os.getenv('HOST'), port=os.getenv('PORT'))
+    try:
+        connection.autocommit = True
+        with connection.cursor() as cursor:
+            cursor.execute(statement)
+    finally:
+        connection.close()
+
+
+def _insert(cursor: psycopg2.extensions.cursor, table: str, columns: Sequence[str], key: Optional[str],
+            rows: List[Tuple[object, ...]]) -> List[int]:
+    names = ', '.join(f'"{column}"' for column in columns)
+    query = f'INSERT INTO "{table}" ({names}) VALUES %s'
+    if key is None:
+        execute_values(cursor, query, rows, page_size=1000)
+        return []
+    found = execute_values(cursor, f'{query} RETURNING "{key}"', rows, page_size=1000, fetch=True)
+    return [row[0] for row in found]
+
+
+def seed(scale: Scale, seed: int = 42) -> Dataset:
+    """Fill the database with a deterministic dataset of the given size in one transaction."""
+    rng = random.Random(seed)
+    countries = ['Lithuania', 'Latvia', 'Estonia', 'Poland', 'Finland']
+    with DBEngine() as db:
+        if db.connection is None or db.cursor is None:
+            raise RuntimeError("Database connection or cursor is not initialized.")
+        cursor = db.cursor
+        responsibility_ids = _insert(cursor, 'Responsibilities', ['ResponsibilityName'], 'ResponsibilityID',
+                                     [(f'Responsibility {i}',) for i in range(scale.responsibilities)])
+        store_ids = _insert(cursor, 'Store', ['StoreName'], 'StoreID',
+                            [(f'Store {i}',) for i in range(scale.stores)])
+        dry_item_ids = _insert(
+            cursor, 'Dry Storage Item', ['Name', 'Amount', 'Price', 'RecipeItem', 'Chemical', 'PackageType'],
+            'DryStorageItemID',
+            [(f'Dry item {i}', rng.randint(0, 500), rng.randint(1, 100), rng.random() < 0.3, rng.random() < 0.1,
+              rng.choice(['Bag', 'Box', 'Bottle', 'Can'])) for i in range(scale.dry_items)])
+        food_item_ids = _insert(
+            cursor, 'Food Item', ['Name', 'Amount', 'Price', 'StorageCondition', 'ExpiryDate'], 'FoodItemID',
+            [(f'Food item {i}', rng.randint(0, 500), rng.randint(1, 100), rng.choice(['Frozen', 'Chilled', 'Dry']),
+              f'2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}') for i in range(scale.food_items)])
+        store_manager_ids = _insert(
+            cursor, 'Store Manager',
+            ['StoreID', 'Name', 'Country', 'Email', 'PhoneNumber', 'MonthlySalary', 'PettyCash'], 'StoreManagerID',
+            [(rng.choice(store_ids), f'Store manager {i}', rng.choice(countries), f'sm{i}@example.lt',
+              860000000 + i, rng.randint(3000, 6000), rng.randint(0, 500)) for i in range(scale.store_managers)])
+        manager_ids = _insert(
+            cursor, 'Manager',
+            ['Name', 'PhoneNumber', 'Country', 'Email', 'MonthlySalary', 'ResponsibilityID', 'StoreID'], 'ManagerID',
+            [(f'Manager {i}', 861000000 + i, rng.choice(countries), f'manager{i}@example.lt', rng.randint(2000, 5000),
+              rng.choice(responsibility_ids), rng.choice(store_ids)) for i in range(scale.managers)])
+        worker_ids = _insert(
+            cursor, 'Worker',
+            ['Name', 'PhoneNumber', 'Email', 'Country', 'HourlyRate', 'AmountWorked', 'StoreID'], 'WorkerID',
+            [(f'Worker {i}', 862000000 + i, f'worker{i}@example.lt', rng.choice(countries), rng.randint(8, 30),
+              rng.randint(0, 200), rng.choice(store_ids)) for i in range(scale.workers)])
+        _insert(cursor, 'SM Responsibilities', ['ResponsibilityID', 'StoreManagerID'], None,
+                [(responsibility_id, store_manager_id) for store_manager_id in store_manager_ids
+                 for responsibility_id in rng.sample(responsibility_ids, min(3, len(responsibility_ids)))])
+        for table, column, item_ids in (('StoreDryProduct', 'DryStorageID', dry_item_ids),
+                                        ('StoreFoodProduct', 'FoodID', food_item_ids)):
+            _insert(cursor, table, ['StoreID', column], None,
+                    [(store_id, item_id) for store_id in store_ids
+                     for item_id in rng.sample(item_ids, min(scale.links_per_store, len(item_ids)))])
+        cursor.execute('ANALYZE')
+        db.connection.commit()
+    return Dataset(store_ids, dry_item_ids, food_item_ids, worker_ids, manager_ids, store_manager_ids)
@@ -0,0 +1,205 @@
+"""Benchmarks of the CRUD, store-product and payroll paths against a real PostgreSQL.
+
+Run ``python -m src.benchmark.suite`` with the .env file pointing at a server the
+user may create databases on. A throwaway database is created, seeded at the
+chosen scale and dropped afterwards. Every case reports operations per second
+and p50/p99 latency; with ``--baseline FILE`` the results are compared with a
+stored run and the command exits with status 1 if any case got slower than the
+tolerance allows. ``--save-baseline`` writes the current results to that file.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import math
+import os
+import random
+import sys
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence
+from src.benchmark.provision import SCALES, Dataset, seed, throwaway_database
+from src.person import payroll
+from src.person.worker import Worker
+from src.product.product import DryStorageItem, FoodItem
+from src.store.store import Store
+from src.store.store_product import StoreDryProduct, StoreFoodProduct
+from src.store.valuation import valuation_report
+
+# Allowed slowdown against the baseline before a case counts as a regression.
+DEFAULT_TOLERANCE = 0.2
+
+
+class Result(NamedTuple):
+    """Timings of one benchmark case."""
+    name: str
+    operations: int
+    seconds: float
+    p50_ms: float
+    p99_ms: float
+
+    @property
+    def ops_per_sec(self) -> float:
+        """Operations completed per second of measured time."""
+        return self.operations / self.seconds if self.seconds else 0.0
+
+
+class Case(NamedTuple):
+    """A benchmarked operation; ``weight`` divides the iteration count for scans over whole tables."""
+    name: str
+    operation: Callable[[], Any]
+    weight: int = 1
+
+
+def percentile(samples: Sequence[float], percent: float) -> float:
+    """Pick the sample at the given nearest-rank percentile, 0 to 100; no samples give 0."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(len(ordered) * percent / 100))
+    return ordered[rank - 1]
+
+
+def measure(name: str, operation: Callable[[], Any], iterations: int, warmup: int = 3) -> Result:
+    """Time ``iterations`` calls of ``operation`` after ``warmup`` untimed ones; its output is discarded."""
+    samples = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(warmup):
+            operation()
+        for _ in range(iterations):
+            started = time.perf_counter()
+            operation()
+            samples.append(time.perf_counter() - started)
+    return Result(name, iterations, sum(samples), percentile(samples, 50) * 1000, percentile(samples, 99) * 1000)
+
+
+def cases(data: Dataset, rng: random.Random) -> List[Case]:
+    """Build the benchmark cases over a seeded dataset."""
+    def insert_worker() -> None:
+        Worker("Bench", 860000000, "bench@example.lt", "Lithuania", 10, 0, rng.choice(data.store_ids)).save()
+
+    def update_worker() -> None:
+        worker = Worker.find_by_id(rng.choice(data.worker_ids))
+        if worker is not None:
+            worker.hourly_rate = rng.randint(8, 30)
+            worker.save()
+
+    def find_worker() -> None:
+        Worker.cache.clear()
+        Worker.find_by_id(rng.choice(data.worker_ids))
+
+    def find_food_item() -> None:
+        FoodItem.cache.clear()
+        FoodItem.find_by_id(rng.choice(data.food_item_ids))
+
+    def find_workers() -> None:
+        Worker.cache.clear()
+        Worker.find_by_ids(rng.sample(data.worker_ids, min(100, len(data.worker_ids))))
+
+    return [
+        Case('Worker.save (insert)', insert_worker),
+        Case('Worker.save (update)', update_worker),
+        Case('Store.save (insert)', lambda: Store("Bench store").save()),
+        Case('DryStorageItem.save (insert)', lambda: DryStorageItem("Bench", 1, 1, False, False, "Box").save()),
+        Case('Worker.find_by_id', find_worker),
+        Case('Worker.find_by_id (cached)', lambda: Worker.find_by_id(data.worker_ids[0])),
+        Case('Worker.find_by_ids (100)', find_workers),
+        Case('FoodItem.find_by_id', find_food_item),
+        Case('DryStorageItem.view_all', DryStorageItem.view_all, weight=20),
+        Case('Worker.iter_all', lambda: sum(1 for _ in Worker.iter_all()), weight=20),
+        Case('StoreDryProduct.view', lambda: StoreDryProduct.view(rng.choice(data.store_ids))),
+        Case('StoreFoodProduct.view', lambda: StoreFoodProduct.view(rng.choice(data.store_ids))),
+        Case('StoreDryProduct.stores_for_many (100)',
+             lambda: StoreDryProduct.stores_for_many(rng.sample(data.dry_item_ids, min(100, len(data.dry_item_ids))))),
+        Case('payroll.totals (store)', lambda: payroll.totals('store'), weight=10),
+        Case('payroll.iter_salaries (Worker)', lambda: sum(1 for _ in payroll.iter_salaries('Worker')), weight=20),
+        Case('valuation_report', valuation_report, weight=10),
+    ]
+
+
+def run(scale: str, iterations: int, seed_value: int = 42, keep_database: bool = False,
+        only: Optional[Sequence[str]] = None) -> List[Result]:
+    """Provision and seed a throwaway database, then run every case (or those named in ``only``)."""
+    with throwaway_database(keep=keep_database):
+        data = seed(SCALES[scale], seed_value)
+        rng = random.Random(seed_value)
+        return [measure(case.name, case.operation, max(1, iterations // case.weight))
+                for case in cases(data, rng) if not only or case.name in only]
+
+
+def load_baseline(path: str) -> Dict[str, Dict[str, float]]:
+    """Read a baseline written by save_baseline; a missing file is an empty baseline."""
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as file:
+        baseline: Dict[str, Dict[str, Any]] = json.load(file)
+    return {name: {key: float(value) for key, value in stats.items()} for name, stats in baseline.items()}
+
+
+def save_baseline(path: str, results: Sequence[Result]) -> None:
+    """Write the results as the baseline later runs are compared with."""
+    baseline = {result.name: {'ops_per_sec': round(result.ops_per_sec, 2), 'p50_ms': round(result.p50_ms, 4),
+                              'p99_ms': round(result.p99_ms, 4)} for result in results}
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(baseline, file, indent=2, sort_keys=True)
+        file.write('\n')
+
+
+def compare(results: Sequence[Result], baseline: Dict[str, Dict[str, float]],
+            tolerance: float = DEFAULT_TOLERANCE) -> List[str]:
+    """Describe every case whose throughput or p50 latency is worse than the baseline by more than ``tolerance``."""
+    regressions = []
+    for result in results:
+        expected = baseline.get(result.name)
+        if expected is None:
+            continue
+        if result.ops_per_sec < expected['ops_per_sec'] * (1 - tolerance):
+            regressions.append(f"{result.name}: {result.ops_per_sec:.1f} ops/s, baseline {expected['ops_per_sec']:.1f}")
+        if result.p50_ms > expected['p50_ms'] * (1 + tolerance):
+            regressions.append(f"{result.name}: p50 {result.p50_ms:.3f} ms, baseline {expected['p50_ms']:.3f}")
+    return regressions
+
+
+def print_results(results: Sequence[Result], baseline: Dict[str, Dict[str, float]]) -> None:
+    """Print one line per case, with the change in throughput against the baseline when known."""
+    print(f"{'Case':<40} {'Ops':>6} {'Ops/s':>10} {'p50 ms':>9} {'p99 ms':>9} {'vs baseline':>12}")
+    for result in results:
+        expected = baseline.get(result.name)
+        change = f"{result.ops_per_sec / expected['ops_per_sec'] - 1:+.1%}" if expected and expected['ops_per_sec'] else ''
+        print(f"{result.name:<40} {result.operations:>6} {result.ops_per_sec:>10.1f} "
+              f"{result.p50_ms:>9.3f} {result.p99_ms:>9.3f} {change:>12}")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Command line entry point: ``python -m src.benchmark.suite [--scale small|medium|large] [--baseline FILE]``."""
+    parser = argparse.ArgumentParser(description="Benchmark the database access paths against a throwaway database.")
+    parser.add_argument('--scale', choices=sorted(SCALES), default='small', help="Size of the seeded dataset.")
+    parser.add_argument('--iterations', type=int, default=200, help="Timed calls per case (fewer for full scans).")
+    parser.add_argument('--seed', type=int, default=42, help="Seed of the dataset and of the benchmark targets.")
+    parser.add_argument('--case', action='append', dest='cases', help="Only run this case; may be repeated.")
+    parser.add_argument('--baseline', help="JSON file to compare the results with.")
+    parser.add_argument('--save-baseline', action='store_true', help="Write the results to the --baseline file.")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help="Allowed slowdown against the baseline, as a fraction.")
+    parser.add_argument('--keep-database', action='store_true', help="Do not drop the benchmark database afterwards.")
+    args = parser.parse_args(argv)
+    if args.save_baseline and not args.baseline:
+        parser.error("--save-baseline needs --baseline FILE.")
+
+    results = run(args.scale, args.iterations, args.seed, args.keep_database, args.cases)
+    baseline = load_baseline(args.baseline) if args.baseline and not args.save_baseline else {}
+    print_results(results, baseline)
+    if args.save_baseline:
+        save_baseline(args.baseline, results)
+        print(f"Baseline written to {args.baseline}.")
+        return
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print("\nRegressions against the baseline:")
+        for regression in regressions:
+            print(f"  {regression}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+"""Load and delete many rows by primary key with ``= ANY(%s)`` instead of one query per ID."""
+
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, TypeVar
+from src.cache import IdentityMap
+from src.db_engine import DBEngine
+
+T = TypeVar('T')
+
+# Keeps each array parameter well below the size where planning a huge ANY() starts to cost more than it saves.
+ANY_CHUNK_SIZE = 5000
+
+
+def unique_ids(ids: Iterable[int]) -> List[int]:
+    """Return the IDs without duplicates, keeping their first-seen order."""
+    return list(dict.fromkeys(ids))
+
+
+def _chunks(ids: List[int], chunk_size: int) -> Iterable[List[int]]:
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1.")
+    for start in range(0, len(ids), chunk_size):
+        yield ids[start:start + chunk_size]
+
+
+def _invalidate(cache: Optional[IdentityMap[Any]], ids: List[int]) -> None:
+    if cache is not None:
+        for id in ids:
+            cache.invalidate(id)
+
+
+def load_by_ids(engine: Callable[[], DBEngine], query: str, key_column: str, ids: Iterable[int],
+                build: Callable[[Tuple[Any, ...]], T], cache: Optional[IdentityMap[T]] = None,
+                chunk_size: int = ANY_CHUNK_SIZE) -> List[T]:
+    """Load the rows with the given keys and return them in the order the IDs were given.
+
+    IDs already in ``cache`` are answered from it; the rest are read with one
+    ``WHERE key = ANY(%s)`` query per ``chunk_size`` IDs on a single connection.
+    Duplicate IDs are returned once and IDs that do not exist are skipped.
+
+    :param engine: DBEngine factory, passed in so callers use their own module's engine.
+    :param query: SELECT statement without WHERE whose first column is the key.
+    :param key_column: Quoted name of the primary key column.
+    :param ids: Primary keys to load.
+    :param build: Function turning a row into a model instance.
+    :param cache: Optional identity map consulted first and filled with the loaded instances.
+    :param chunk_size: Maximum number of IDs sent per query.
+    """
+    wanted = unique_ids(ids)
+    found: Dict[int, T] = {}
+    missing = []
+    for id in wanted:
+        cached = cache.get(id) if cache is not None else None
+        if cached is not None:
+            found[id] = cached
+        else:
+            missing.append(id)
+
+    if missing:
+        with engine() as db:
+            if db.connection is None or db.cursor is None:
+                print("Database connection error.")
+                return []
+            for chunk in _chunks(missing, chunk_size):
+                db.cursor.execute(f'{query} WHERE {key_column} = ANY(%s)', (chunk,))
+                for row in db.cursor.fetchall():
+                    instance = build(row)
+                    found[row[0]] = instance
+                    if cache is not None:
+                        cache.put(row[0], instance)
+    return [found[id] for id in wanted if id in found]
+
+
+def delete_by_ids(engine: Callable[[], DBEngine], table: str, key_column: str, ids: Iterable[int],
+                  cache: Optional[IdentityMap[Any]] = None, chunk_size: int = ANY_CHUNK_SIZE) -> int:
+    """Delete the rows with the given keys in one transaction.
+
+    :param engine: DBEngine factory, passed in so callers use their own module's engine.
+    :param table: Quoted table name.
+    :param key_column: Quoted name of the primary key column.
+    :param ids: Primary keys to delete.
+    :param cache: Optional identity map whose entries for the IDs are dropped, before the
+        delete and again after it commits.
+    :param chunk_size: Maximum number of IDs sent per statement.
+    :return: Number of rows deleted.
+    """
+    wanted = unique_ids(ids)
+    if not wanted:
+        return 0
+    _invalidate(cache, wanted)
+
+    deleted = 0
+    with engine() as db:
+        if db.connection is None or db.cursor is None:
+            print("Database connection error.")
+            return 0
+        for chunk in _chunks(wanted, chunk_size):
+            db.cursor.execute(f'DELETE FROM {table} WHERE {key_column} = ANY(%s)', (chunk,))
+            deleted += db.cursor.rowcount
+        db.connection.commit()
+    _invalidate(cache, wanted)
+    return deleted
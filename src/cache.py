@@ -0,0 +1,97 @@
+"""Per-model identity map used as a read-through cache for find_by_id lookups."""
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Generic, Hashable, Optional, Tuple, TypeVar
+
+T = TypeVar('T')
+
+
+class IdentityMap(Generic[T]):
+    """Bounded mapping from primary key to loaded model instance.
+
+    Entries are evicted least recently used first once ``max_size`` is reached and,
+    when ``ttl`` is set, expire that many seconds after they were stored. A model
+    class owns one map and invalidates its entries from ``save()`` and ``delete()``.
+
+    Instances are shallow-copied on the way in and out, so a caller editing what
+    ``get`` returned changes neither the cached entry nor what other callers see.
+
+    Attributes:
+        max_size (int): Maximum number of cached instances.
+        ttl (Optional[float]): Seconds an entry stays valid, or None to keep it until evicted.
+        hits (int): Lookups answered from the map.
+        misses (int): Lookups that had to go to the database.
+        evictions (int): Entries dropped because the map was full or the entry expired.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: Optional[float] = None) -> None:
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1.")
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: 'OrderedDict[Hashable, Tuple[T, float]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[T]:
+        """Return a copy of the cached instance for ``key`` and mark it as recently used, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl is not None and time.monotonic() - entry[1] > self.ttl:
+                del self._entries[key]
+                self.evictions += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return copy.copy(entry[0])
+
+    def put(self, key: Hashable, instance: T) -> None:
+        """Store a copy of ``instance`` under ``key``, evicting the least recently used entries if full."""
+        with self._lock:
+            self._entries[key] = (copy.copy(instance), time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop the entry for ``key`` if present."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop every entry and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups answered from the map."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the current size and counters."""
+        return {
+            'size': len(self._entries),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hit_rate,
+        }
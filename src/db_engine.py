@@ -1,49 +1,354 @@
 import os
+import threading
+import time
 import psycopg2
+from psycopg2 import extensions
 from psycopg2.extensions import connection as Psycopg2Connection, cursor as Psycopg2Cursor
 from dotenv import load_dotenv
 import logging
-from typing import Optional, Type, Any
+from typing import TYPE_CHECKING, Optional, Type, Any, Dict, List, Tuple, Union
+from src.query_counter import CountingCursor, active_counters, connection_borrowed
+from src.query_log import InstrumentedCursor, enabled as query_stats_enabled
+
+if TYPE_CHECKING:
+    from src.prepared import StatementRegistry
 
 dotenv_path = os.path.join(os.path.dirname(__file__), '..', 'config', '.env')
 load_dotenv(dotenv_path=dotenv_path)
 
+
+class PoolTimeoutError(psycopg2.OperationalError):  # type: ignore[misc]
+    """Raised when no pooled connection becomes available within the checkout timeout."""
+
+
+class PooledConnection(Psycopg2Connection):  # type: ignore[misc]
+    """psycopg2 connection whose close() hands it back to the pool it was borrowed from.
+
+    This keeps call sites that close ``db.connection`` themselves on pooled connections.
+    """
+
+    pool: Optional['ConnectionPool'] = None
+    lease: int = 0
+    # Statements prepared on this session by src.prepared; empty again after a reconnect.
+    prepared: Optional['StatementRegistry'] = None
+
+    def close(self) -> None:
+        """Return the connection to its pool, or close it if it is not pooled."""
+        if self.pool is not None and not self.closed:
+            self.pool.putconn(self)
+        else:
+            super().close()
+
+
+class ConnectionPool:
+    """Thread-safe pool of PostgreSQL connections shared by every DBEngine in the process.
+
+    Idle connections are kept in LIFO order so the most recently used (and therefore
+    warmest) connection is handed out first. Connections idle for longer than
+    ``idle_timeout`` are closed, and connections idle for longer than ``ping_after``
+    are checked with ``SELECT 1`` before being handed out again.
+    """
+
+    def __init__(self, min_size: int = 1, max_size: int = 10, idle_timeout: float = 300.0,
+                 ping_after: float = 30.0, checkout_timeout: float = 30.0,
+                 logger: Optional[logging.Logger] = None, **connect_kwargs: Any) -> None:
+        """Initializes the pool and opens its ``min_size`` connections up front.
+
+        :param min_size: Number of connections opened up front and kept open even past the idle timeout.
+        :param max_size: Maximum number of connections open at the same time.
+        :param idle_timeout: Seconds after which a surplus idle connection is closed.
+        :param ping_after: Seconds of idleness after which a connection is health checked on checkout.
+        :param checkout_timeout: Seconds to wait for a free connection before raising PoolTimeoutError.
+        :param logger: Optional logging.Logger instance.
+        :param connect_kwargs: Keyword arguments passed to psycopg2.connect.
+        """
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError("Pool sizes must satisfy 0 <= min_size <= max_size and max_size >= 1.")
+        self.min_size = min_size
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.ping_after = ping_after
+        self.checkout_timeout = checkout_timeout
+        self.connect_kwargs = connect_kwargs
+        self.logger: logging.Logger = logger or logging.getLogger(__name__)
+        self._idle: List[Tuple[Psycopg2Connection, float]] = []
+        self._in_use: Dict[int, Psycopg2Connection] = {}
+        # Slots taken by connections being opened or health checked outside the lock.
+        self._pending = 0
+        self._closed = False
+        self._condition = threading.Condition()
+        self._pid = os.getpid()
+        self.connections_opened = 0
+        self.checkouts = 0
+        try:
+            for _ in range(min_size):
+                self._idle.append((self._open(), time.monotonic()))
+        except Exception:
+            self.closeall()
+            raise
+
+    @property
+    def size(self) -> int:
+        """Number of connections currently owned by the pool, idle or in use."""
+        return len(self._idle) + len(self._in_use) + self._pending
+
+    def getconn(self) -> Psycopg2Connection:
+        """Borrow a healthy connection, opening a new one if the pool has room.
+
+        :return: An open psycopg2 connection in a clean, non-autocommit state.
+        :raises PoolTimeoutError: If the pool stays exhausted for ``checkout_timeout`` seconds.
+        """
+        deadline = time.monotonic() + self.checkout_timeout
+        while True:
+            with self._condition:
+                if self._closed:
+                    raise psycopg2.InterfaceError("Connection pool is closed.")
+                self._reset_after_fork()
+                conn, stale = self._reserve(deadline)
+                if conn is not None and not stale:
+                    return self._checkout(conn)
+                # Reserve the slot before connecting or pinging so other threads respect max_size.
+                self._pending += 1
+            # Network I/O happens without the lock so other checkouts and returns are not blocked.
+            try:
+                if conn is None:
+                    conn = self._open()
+                elif not self._ping(conn):
+                    self._discard(conn)
+                    conn = None
+            except Exception:
+                with self._condition:
+                    self._pending -= 1
+                    self._condition.notify()
+                raise
+            with self._condition:
+                self._pending -= 1
+                if conn is not None:
+                    return self._checkout(conn)
+                self._condition.notify()
+
+    def _reserve(self, deadline: float) -> Tuple[Optional[Psycopg2Connection], bool]:
+        """Wait, holding the lock, for an idle connection or for room to open a new one.
+
+        :return: An idle connection and whether it must be pinged first, or (None, False) to open one.
+        """
+        while True:
+            self._evict_idle()
+            while self._idle:
+                conn, last_used = self._idle.pop()
+                if conn.closed:
+                    self._discard(conn)
+                    continue
+                return conn, time.monotonic() - last_used >= self.ping_after
+            if self.size < self.max_size:
+                return None, False
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise PoolTimeoutError(f"No database connection available after {self.checkout_timeout}s.")
+            self._condition.wait(remaining)
+
+    def putconn(self, conn: Psycopg2Connection, lease: Optional[int] = None) -> None:
+        """Return a borrowed connection, rolling back any transaction left open.
+
+        Closed or broken connections are dropped instead of being returned to the idle list.
+
+        :param conn: The connection previously obtained from getconn.
+        :param lease: The lease number seen at checkout. When given, a connection that has
+            already been returned and borrowed again by someone else is left alone.
+        """
+        with self._condition:
+            if id(conn) not in self._in_use:
+                return
+            if lease is not None and getattr(conn, 'lease', None) != lease:
+                return
+            del self._in_use[id(conn)]
+            try:
+                if conn.closed:
+                    return
+                if self._closed:
+                    self._discard(conn)
+                    return
+                if conn.info.transaction_status != extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+                if conn.autocommit:
+                    conn.autocommit = False
+                self._idle.append((conn, time.monotonic()))
+            except (Exception, psycopg2.Error) as error:
+                self.logger.warning(f"Dropping pooled connection after failed reset: {error}")
+                self._discard(conn)
+            finally:
+                self._condition.notify()
+
+    def closeall(self) -> None:
+        """Close every idle connection; connections still in use are closed when returned."""
+        with self._condition:
+            self._closed = True
+            for conn, _ in self._idle:
+                self._discard(conn)
+            self._idle.clear()
+            self._condition.notify_all()
+
+    def _checkout(self, conn: Psycopg2Connection) -> Psycopg2Connection:
+        self._in_use[id(conn)] = conn
+        self.checkouts += 1
+        conn.lease = self.checkouts
+        return conn
+
+    def _open(self) -> Psycopg2Connection:
+        conn = psycopg2.connect(connection_factory=PooledConnection, **self.connect_kwargs)
+        conn.pool = self
+        with self._condition:
+            self.connections_opened += 1
+        return conn
+
+    def _ping(self, conn: Psycopg2Connection) -> bool:
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute('SELECT 1')
+            conn.rollback()
+            return True
+        except (Exception, psycopg2.Error):
+            return False
+
+    def _evict_idle(self) -> None:
+        now = time.monotonic()
+        keep = max(self.min_size - len(self._in_use), 0)
+        # The idle list is ordered oldest first, so surplus connections are at the front.
+        while len(self._idle) > keep and now - self._idle[0][1] > self.idle_timeout:
+            conn, _ = self._idle.pop(0)
+            self._discard(conn)
+
+    def _reset_after_fork(self) -> None:
+        if self._pid != os.getpid():
+            self._idle.clear()
+            self._in_use.clear()
+            self._pid = os.getpid()
+
+    def _discard(self, conn: Psycopg2Connection) -> None:
+        if isinstance(conn, PooledConnection):
+            conn.pool = None
+        try:
+            conn.close()
+        except (Exception, psycopg2.Error):
+            pass
+
+
+_pool: Optional[ConnectionPool] = None
+_pool_lock = threading.Lock()
+
+
+def _env_connect_kwargs() -> Dict[str, Any]:
+    """Connection parameters read from the environment variables."""
+    return {
+        'dbname': os.getenv('DB_NAME'),
+        'user': os.getenv('DB_USERNAME'),
+        'password': os.getenv('DB_PASSWORD'),
+        'host': os.getenv('HOST'),
+        'port': os.getenv('PORT'),
+    }
+
+
+def get_pool() -> ConnectionPool:
+    """Return the process-wide connection pool, creating it from environment variables on first use.
+
+    Pool sizing is read from DB_POOL_MIN, DB_POOL_MAX, DB_POOL_IDLE_TIMEOUT and DB_POOL_PING_AFTER.
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(
+                    min_size=int(os.getenv('DB_POOL_MIN', '1')),
+                    max_size=int(os.getenv('DB_POOL_MAX', '10')),
+                    idle_timeout=float(os.getenv('DB_POOL_IDLE_TIMEOUT', '300')),
+                    ping_after=float(os.getenv('DB_POOL_PING_AFTER', '30')),
+                    **_env_connect_kwargs()
+                )
+    return _pool
+
+
+def configure_pool(**kwargs: Any) -> ConnectionPool:
+    """Replace the process-wide pool with one built from the given ConnectionPool arguments.
+
+    Connection parameters not given fall back to the environment variables used by get_pool.
+
+    :return: The new pool.
+    """
+    global _pool
+    options = _env_connect_kwargs()
+    options.update(kwargs)
+    with _pool_lock:
+        if _pool is not None:
+            _pool.closeall()
+        _pool = ConnectionPool(**options)
+    return _pool
+
+
+def close_pool() -> None:
+    """Close all idle connections of the process-wide pool and drop it."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.closeall()
+            _pool = None
+
+
 class DBEngine:
     """DBEngine is responsible for managing the connection to the PostgreSQL database.
 
-    This class handles establishing and closing connections, as well as managing
-    the database cursor. It utilizes environment variables for connection parameters.
+    This class borrows a connection from the process-wide ConnectionPool, manages the
+    database cursor, and returns the connection to the pool when the context exits.
     """
 
-    def __init__(self, logger: Optional[logging.Logger] = None) -> None:
-        """Initializes the DBEngine instance and establishes a database connection.
+    def __init__(self, logger: Optional[logging.Logger] = None, pool: Optional[ConnectionPool] = None) -> None:
+        """Initializes the DBEngine instance and borrows a database connection.
 
         :param logger: Optional logging.Logger instance. If not provided, a default logger is used.
+        :param pool: Optional ConnectionPool. Defaults to the process-wide pool.
         """
         self.connection: Optional[Psycopg2Connection] = None
-        self.cursor: Optional[Psycopg2Cursor] = None
+        self.cursor: Optional[Union[Psycopg2Cursor, CountingCursor]] = None
         self.logger: logging.Logger = logger or logging.getLogger(__name__)
+        self.pool: ConnectionPool = pool or get_pool()
+        self._lease: Optional[int] = None
         self.connect()
 
     def connect(self) -> None:
-        """Establishes a connection to the PostgreSQL database using credentials from environment variables.
+        """Borrows a connection from the pool using credentials from environment variables.
 
-        Logs the success or failure of the connection attempt.
+        Logs the success or failure of the connection attempt. With DB_QUERY_STATS=1 the
+        cursor records every statement in src.query_log, and inside a
+        src.query_counter block the connection and its statements are counted.
         """
         try:
-            self.connection = psycopg2.connect(
-                dbname=os.getenv('DB_NAME'),
-                user=os.getenv('DB_USERNAME'),
-                password=os.getenv('DB_PASSWORD'),
-                host=os.getenv('HOST'),
-                port=os.getenv('PORT')
-            )
-            self.cursor = self.connection.cursor()
+            self.connection = self.pool.getconn()
+            self._lease = getattr(self.connection, 'lease', None)
+            if query_stats_enabled():
+                self.cursor = self.connection.cursor(cursor_factory=InstrumentedCursor)
+            else:
+                self.cursor = self.connection.cursor()
+            if active_counters():
+                connection_borrowed()
+                self.cursor = CountingCursor(self.cursor)
             self.logger.info('Database connection established.')
         except (Exception, psycopg2.Error) as error:
             self.logger.error(f"Error connecting to the database: {error}")
             raise
 
+    def close(self) -> None:
+        """Close the cursor and return the connection to the pool."""
+        if self.cursor:
+            self.cursor.close()
+        if self.connection:
+            self.pool.putconn(self.connection, self._lease)
+        self.cursor = None
+        self.connection = None
+
+    def __del__(self) -> None:
+        """Return the connection if the engine is dropped without being closed."""
+        if getattr(self, 'connection', None) is not None:
+            self.close()
+
     def __enter__(self) -> 'DBEngine':
         """Enter the runtime context related to this object.
 
@@ -52,14 +357,13 @@ class DBEngine:
         return self
 
     def __exit__(self, exc_type: Optional[Type[BaseException]], exc_val: Optional[BaseException], exc_tb: Optional[Any]) -> None:
-        """Exit the runtime context related to this object, closing the connection and cursor.
+        """Exit the runtime context related to this object, returning the connection to the pool.
+
+        Any transaction that was not committed is rolled back before the connection is reused.
 
         :param exc_type: The exception type.
         :param exc_val: The exception value.
         :param exc_tb: The traceback object.
         """
-        if self.cursor:
-            self.cursor.close()
-        if self.connection:
-            self.connection.close()
-        self.logger.info('Database connection closed.')
+        self.close()
+        self.logger.info('Database connection released.')
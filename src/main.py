@@ -7,7 +7,21 @@ from src.store.store import manage_store_menu
 from src.store.store_product import manage_store_items_menu
 from src.list_tables import list_tables
 from src.SMS_DB.database_management import database_management_menu
+from src.SMS_DB.migrate import PendingMigrationsError, check_migrations
 from src.person.responsibilities import responsibilities_menu
+from src.person.payroll import payroll_menu
+
+def schema_ready() -> bool:
+    """Check that the migrations the models rely on have been applied.
+
+    :return: True if the schema is up to date, otherwise False after printing what to run.
+    """
+    try:
+        check_migrations()
+    except PendingMigrationsError as error:
+        print(error)
+        return False
+    return True
 
 def main_menu() -> None:
     """Display the main menu and handle user input."""
@@ -23,6 +37,8 @@ def main_menu() -> None:
 
         choice = input("Enter your choice (1-7): ").strip()
 
+        if choice in ('1', '2', '3', '5') and not schema_ready():
+            continue
         if choice == '1':
             store_menu()
         elif choice == '2':
@@ -67,9 +83,10 @@ def people_menu() -> None:
         print("1. Manage Managers")
         print("2. Manage Workers")
         print("3. Manage Store Managers")
-        print("4. Back")
+        print("4. Payroll")
+        print("5. Back")
 
-        choice = input("Enter your choice (1-4): ").strip()
+        choice = input("Enter your choice (1-5): ").strip()
 
         if choice == '1':
             Manager.manage_managers()
@@ -78,9 +95,11 @@ def people_menu() -> None:
         elif choice == '3':
             manage_store_manager_menu()
         elif choice == '4':
+            payroll_menu()
+        elif choice == '5':
             break
         else:
-            print("Invalid choice, please select between 1 and 4.")
+            print("Invalid choice, please select between 1 and 5.")
 
 def product_menu() -> None:
     """Display the product menu and handle user input."""
@@ -0,0 +1,112 @@
+"""Declarative table mapping shared by the model classes.
+
+A model declares its table once::
+
+    class Store(Mapped):
+        TABLE = 'Store'
+        ID_COLUMN = 'StoreID'
+        ID_ATTRIBUTE = 'store_id'
+        COLUMNS = (('StoreName', 'store_name'),)
+
+and gets its CRUD statements compiled into ``Store.SQL`` when the class is
+created, so no SQL is built per call. Selects always list the key first, then
+``COLUMNS`` in order, then the version column if the model has one;
+``from_row`` hydrates instances from such rows through a precomputed
+attribute-to-index mapping. Constructor arguments must be named like the
+mapped attributes.
+"""
+
+from typing import Any, ClassVar, NamedTuple, Optional, Sequence, Tuple, Type, TypeVar
+
+M = TypeVar('M', bound='Mapped')
+
+
+def quote(name: str) -> str:
+    """Quote a table or column name taken from a model mapping."""
+    return f'"{name}"'
+
+
+class Statements(NamedTuple):
+    """SQL compiled from a model's mapping.
+
+    Attributes:
+        columns (str): Select list in hydration order.
+        select (str): Select of every row, to be extended with WHERE/ORDER BY clauses.
+        select_by_id (str): Select of one row by key.
+        insert (str): Insert of the mapped columns returning the generated key.
+        update (str): Update of every mapped column by key.
+        delete_by_id (str): Delete of one row by key.
+    """
+    columns: str
+    select: str
+    select_by_id: str
+    insert: str
+    update: str
+    delete_by_id: str
+
+
+def column_list(model: Type['Mapped'], alias: Optional[str] = None) -> str:
+    """Return the select list of a model in hydration order, optionally qualified by a table alias."""
+    prefix = f'{alias}.' if alias else ''
+    names = [model.ID_COLUMN] + [column for column, _ in model.COLUMNS]
+    if model.VERSION_COLUMN is not None:
+        names.append(model.VERSION_COLUMN)
+    return ', '.join(prefix + quote(name) for name in names)
+
+
+def compile_statements(model: Type['Mapped']) -> Statements:
+    """Generate the CRUD statements of a mapped model."""
+    table, key = quote(model.TABLE), quote(model.ID_COLUMN)
+    columns = column_list(model)
+    mapped = ', '.join(quote(column) for column, _ in model.COLUMNS)
+    placeholders = ', '.join(['%s'] * len(model.COLUMNS))
+    assignments = ', '.join(f'{quote(column)} = %s' for column, _ in model.COLUMNS)
+    select = f'SELECT {columns} FROM {table}'
+    return Statements(
+        columns=columns,
+        select=select,
+        select_by_id=f'{select} WHERE {key} = %s',
+        insert=f'INSERT INTO {table} ({mapped}) VALUES ({placeholders}) RETURNING {key}',
+        update=f'UPDATE {table} SET {assignments} WHERE {key} = %s',
+        delete_by_id=f'DELETE FROM {table} WHERE {key} = %s',
+    )
+
+
+class Mapped:
+    """Base class of models mapped to a table.
+
+    Subclasses that set TABLE, ID_COLUMN and COLUMNS get ``SQL`` and the row
+    mapper compiled once, when the class is defined.
+    """
+
+    TABLE: ClassVar[str]
+    ID_COLUMN: ClassVar[str]
+    ID_ATTRIBUTE: ClassVar[str] = 'id'
+    COLUMNS: ClassVar[Tuple[Tuple[str, str], ...]]
+    VERSION_COLUMN: ClassVar[Optional[str]] = None
+    SQL: ClassVar[Statements]
+    ROW_ATTRIBUTES: ClassVar[Tuple[str, ...]] = ()
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        if all(hasattr(cls, name) for name in ('TABLE', 'ID_COLUMN', 'COLUMNS')):
+            cls.SQL = compile_statements(cls)
+            cls.ROW_ATTRIBUTES = (cls.ID_ATTRIBUTE,) + tuple(attribute for _, attribute in cls.COLUMNS)
+
+    @classmethod
+    def from_row(cls: Type[M], row: Sequence[Any]) -> M:
+        """Build an instance from a row selected with ``SQL.columns``."""
+        return cls(**dict(zip(cls.ROW_ATTRIBUTES, row)))
+
+    @property
+    def key(self) -> Any:
+        """Primary key value of the instance."""
+        return getattr(self, self.ID_ATTRIBUTE)
+
+    def insert_params(self) -> Tuple[Any, ...]:
+        """Parameters of ``SQL.insert``."""
+        return tuple(getattr(self, attribute) for _, attribute in self.COLUMNS)
+
+    def update_params(self) -> Tuple[Any, ...]:
+        """Parameters of ``SQL.update``."""
+        return self.insert_params() + (self.key,)
@@ -0,0 +1,61 @@
+"""Keyset pagination helpers shared by the model classes and the CLI menus."""
+
+from typing import Any, Callable, Iterable, Iterator, Optional, Tuple
+from src.db_engine import DBEngine
+
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_PAGE_SIZE = 20
+
+
+def iter_keyset(engine: Callable[[], DBEngine], query: str, key_column: str,
+                batch_size: int = DEFAULT_BATCH_SIZE, after_id: Optional[int] = None) -> Iterator[Tuple[Any, ...]]:
+    """Yield the rows of ``query`` in key order, fetching ``batch_size`` rows per round trip.
+
+    Each batch is read on its own pooled connection with ``WHERE key > last_key``, so
+    no transaction stays open while the caller consumes rows and memory use is bounded
+    by the batch size regardless of table size.
+
+    :param engine: DBEngine factory, passed in so callers use their own module's engine.
+    :param query: SELECT statement without WHERE, ORDER BY or LIMIT whose first column is the key.
+    :param key_column: Quoted name of the unique, indexed key column (the SERIAL primary key).
+    :param batch_size: Number of rows fetched per query.
+    :param after_id: Only rows with a key greater than this are returned.
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1.")
+    last_key = after_id
+    while True:
+        with engine() as db:
+            if db.connection is None or db.cursor is None:
+                print("Database connection error.")
+                return
+            if last_key is None:
+                db.cursor.execute(f'{query} ORDER BY {key_column} LIMIT %s', (batch_size,))
+            else:
+                db.cursor.execute(f'{query} WHERE {key_column} > %s ORDER BY {key_column} LIMIT %s',
+                                  (last_key, batch_size))
+            rows = db.cursor.fetchall()
+        yield from rows
+        if len(rows) < batch_size:
+            return
+        last_key = rows[-1][0]
+
+
+def print_paged(items: Iterable[Any], page_size: int = DEFAULT_PAGE_SIZE,
+                render: Callable[[Any], str] = str) -> int:
+    """Print items one page at a time, asking before each following page.
+
+    :param items: Items to print; consumed lazily so only one page is needed at a time.
+    :param page_size: Number of items printed per page.
+    :param render: Function turning an item into its display line.
+    :return: Number of items printed.
+    """
+    printed = 0
+    for item in items:
+        if printed and printed % page_size == 0:
+            answer = input("Press Enter for the next page or 'q' to stop: ").strip().lower()
+            if answer == 'q':
+                break
+        print(render(item))
+        printed += 1
+    return printed
@@ -0,0 +1,223 @@
+"""Write-behind buffer for Worker hours.
+
+Time clocks report many small ``AmountWorked`` increments. Instead of rewriting
+a worker row per increment, ``HoursBuffer.record()`` adds the hours to an
+in-memory total per worker. Totals are written in one
+``UPDATE "Worker" ... FROM (VALUES ...)`` statement every ``interval`` seconds
+while the background flusher runs, as soon as the buffer holds ``max_pending``
+workers, on ``stop()`` and at interpreter exit. A full buffer wakes the
+background flusher rather than writing in the caller's thread; without a
+flusher, record() flushes itself but keeps the hours buffered on failure
+instead of raising into the caller. Increments are relative
+(``"AmountWorked" + hours``), so edits made in between are not overwritten.
+
+Hours that are still buffered when the process is killed outright are lost;
+anything up to the last flush is in the database.
+"""
+
+import atexit
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+from psycopg2.extras import execute_values
+from src.cache import IdentityMap
+from src.db_engine import DBEngine
+
+DEFAULT_INTERVAL = 5.0
+DEFAULT_MAX_PENDING = 1000
+
+FLUSH_SQL = """
+    UPDATE "Worker" AS w
+    SET "AmountWorked" = w."AmountWorked" + v.hours, "Version" = w."Version" + 1
+    FROM (VALUES %s) AS v(id, hours)
+    WHERE w."WorkerID" = v.id
+    RETURNING w."WorkerID"
+"""
+
+
+class HoursBufferStats:
+    """Counters of an HoursBuffer.
+
+    Attributes:
+        recorded (int): Increments passed to record().
+        flushes (int): Successful flushes that had hours to write.
+        rows_written (int): Worker rows updated across all flushes.
+        unknown (int): Buffered workers that no longer existed when flushed.
+        failures (int): Flushes that failed and kept their hours buffered.
+        flush_seconds (float): Total time spent in successful flushes.
+        last_flush_seconds (float): Duration of the last successful flush.
+    """
+
+    def __init__(self) -> None:
+        self.recorded = 0
+        self.flushes = 0
+        self.rows_written = 0
+        self.unknown = 0
+        self.failures = 0
+        self.flush_seconds = 0.0
+        self.last_flush_seconds = 0.0
+
+    @property
+    def coalescing_ratio(self) -> float:
+        """Increments per row written; higher means fewer writes per clock event."""
+        written = self.rows_written + self.unknown
+        return self.recorded / written if written else 0.0
+
+    @property
+    def average_flush_seconds(self) -> float:
+        """Mean latency of a flush."""
+        return self.flush_seconds / self.flushes if self.flushes else 0.0
+
+    def __str__(self) -> str:
+        return (f"Recorded {self.recorded} increments, wrote {self.rows_written} rows in {self.flushes} flushes "
+                f"(coalescing {self.coalescing_ratio:.1f}x, avg flush {self.average_flush_seconds * 1000:.1f} ms, "
+                f"{self.failures} failed)")
+
+
+class HoursBuffer:
+    """Coalesces per-worker hour increments and writes them in batches.
+
+    Attributes:
+        interval (float): Seconds between flushes of the background flusher.
+        max_pending (int): Number of buffered workers that triggers an immediate flush.
+        stats (HoursBufferStats): Flush and coalescing metrics.
+        cache (Optional[IdentityMap[Any]]): Worker identity map whose flushed entries are dropped.
+    """
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL, max_pending: int = DEFAULT_MAX_PENDING,
+                 engine: Callable[[], DBEngine] = DBEngine, cache: Optional[IdentityMap[Any]] = None) -> None:
+        if max_pending < 1:
+            raise ValueError("max_pending must be at least 1.")
+        self.interval = interval
+        self.max_pending = max_pending
+        self.engine = engine
+        self.cache = cache
+        self.stats = HoursBufferStats()
+        self._pending: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._exit_hook_registered = False
+
+    @property
+    def pending(self) -> Dict[int, int]:
+        """Copy of the hours not yet written, per worker ID."""
+        with self._lock:
+            return dict(self._pending)
+
+    @property
+    def running(self) -> bool:
+        """Whether the background flusher is running."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def record(self, worker_id: int, hours: int) -> None:
+        """Add ``hours`` to a worker's buffered total, triggering a flush if the buffer is full.
+
+        Never raises database errors: a failed flush keeps the hours buffered for the next one.
+        """
+        with self._lock:
+            self._pending[worker_id] = self._pending.get(worker_id, 0) + hours
+            self.stats.recorded += 1
+            full = len(self._pending) >= self.max_pending
+        if not full:
+            return
+        if self.running:
+            self._wake.set()
+            return
+        try:
+            self.flush()
+        except Exception as e:
+            print(f"Error flushing worker hours, {sum(self.pending.values())} hours kept buffered: {e}")
+
+    def flush(self) -> int:
+        """Write all buffered hours in one statement.
+
+        On failure the hours are put back into the buffer so the next flush retries
+        them, and the error is raised.
+
+        :return: Number of worker rows updated.
+        """
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, {}
+            batch = {id: hours for id, hours in batch.items() if hours}
+            if not batch:
+                return 0
+
+            started = time.perf_counter()
+            try:
+                with self.engine() as db:
+                    if db.connection is None or db.cursor is None:
+                        raise RuntimeError("Database connection or cursor is not initialized.")
+                    try:
+                        rows = execute_values(db.cursor, FLUSH_SQL, sorted(batch.items()),
+                                              page_size=len(batch), fetch=True)
+                        db.connection.commit()
+                    except Exception:
+                        db.connection.rollback()
+                        raise
+            except Exception:
+                self._requeue(batch)
+                self.stats.failures += 1
+                raise
+            elapsed = time.perf_counter() - started
+
+            updated: List[int] = [row[0] for row in rows]
+            self.stats.flushes += 1
+            self.stats.rows_written += len(updated)
+            self.stats.unknown += len(batch) - len(updated)
+            self.stats.flush_seconds += elapsed
+            self.stats.last_flush_seconds = elapsed
+        if self.cache is not None:
+            for id in updated:
+                self.cache.invalidate(id)
+        return len(updated)
+
+    def _requeue(self, batch: Dict[int, int]) -> None:
+        with self._lock:
+            for id, hours in batch.items():
+                self._pending[id] = self._pending.get(id, 0) + hours
+
+    def start(self) -> threading.Thread:
+        """Flush every ``interval`` seconds in a daemon thread and flush once more at exit."""
+        if self.running:
+            raise RuntimeError("Flusher is already running.")
+        self._register_exit_hook()
+        self._stop.clear()
+
+        def target() -> None:
+            while True:
+                self._wake.wait(self.interval)
+                self._wake.clear()
+                if self._stop.is_set():
+                    break
+                try:
+                    self.flush()
+                except Exception as e:
+                    print(f"Error flushing worker hours: {e}")
+
+        self._thread = threading.Thread(target=target, name='worker-hours-flusher', daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop the background flusher and write whatever is still buffered."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self.flush()
+
+    def _register_exit_hook(self) -> None:
+        if not self._exit_hook_registered:
+            atexit.register(self._flush_at_exit)
+            self._exit_hook_registered = True
+
+    def _flush_at_exit(self) -> None:
+        try:
+            self.stop(self.interval)
+        except Exception as e:
+            print(f"Error flushing worker hours at exit, {sum(self.pending.values())} hours not saved: {e}")
@@ -1,10 +1,22 @@
-from typing import Optional, List, Tuple
+from typing import ClassVar, Iterable, Iterator, Optional, List, Tuple, Type
+from src.bulk import delete_by_ids, load_by_ids
+from src.cache import IdentityMap
 from src.db_engine import DBEngine
+from src.pagination import DEFAULT_BATCH_SIZE, iter_keyset, print_paged
+from src.person.payroll import display_salaries
 from src.person.person import Person
+from src.prepared import execute_prepared
+from src.tracking import INITIAL_VERSION, VersionConflictError
 
 class Manager(Person):
     """Represents a manager in a store, extending from Person."""
 
+    TABLE = 'Manager'
+    ID_COLUMN = 'ManagerID'
+    COLUMNS = (('Name', 'name'), ('PhoneNumber', 'phone'), ('Email', 'email'), ('Country', 'country'),
+               ('MonthlySalary', 'monthly_salary'), ('StoreID', 'store_id'))
+    cache: ClassVar[IdentityMap['Manager']] = IdentityMap()
+
     def __init__(self, name: str, phone: int, email: str, country: str, monthly_salary: int, store_id: int,
                  id: Optional[int] = None) -> None:
         """Initialize a new Manager instance.
@@ -22,31 +34,34 @@ class Manager(Person):
         self.monthly_salary = monthly_salary
         self.store_id = store_id
 
+    def __str__(self) -> str:
+        return (f"ID: {self.id}, Name: {self.name}, Phone: {self.phone}, Email: {self.email}, Country: {self.country}, "
+                f"Salary: {self.monthly_salary}, Store ID: {self.store_id}")
+
     def display_salary(self) -> None:
         """Display the manager's monthly salary."""
         print(f"{self.name}'s monthly salary is: {self.monthly_salary}")
 
     def save(self) -> None:
-        """Save a new manager or update an existing manager in the database."""
+        """Save a new manager or write the columns changed since it was loaded."""
+        if not self.is_dirty:
+            return
+        self._invalidate_cached()
         if self.id is None:
             self._create_manager()
         else:
             self._update_manager()
+        self._invalidate_cached()
 
     def _create_manager(self) -> None:
         """Insert a new manager into the database."""
         with DBEngine() as db:
             if db.cursor and db.connection:
                 try:
-                    db.cursor.execute(
-                        """
-                        INSERT INTO "Manager" ("Name", "PhoneNumber", "Email", "Country", "MonthlySalary", "StoreID")
-                        VALUES (%s, %s, %s, %s, %s, %s) RETURNING "ManagerID"
-                        """,
-                        (self.name, self.phone, self.email, self.country, self.monthly_salary, self.store_id)
-                    )
+                    execute_prepared(db.cursor, self.SQL.insert, self.insert_params())
                     self.id = db.cursor.fetchone()[0]
                     db.connection.commit()
+                    self.mark_clean(INITIAL_VERSION)
                     print("Manager created successfully.")
                 except Exception as e:
                     print(f"Error creating manager: {e}")
@@ -59,31 +74,23 @@ class Manager(Person):
         with DBEngine() as db:
             if db.cursor and db.connection:
                 try:
-                    sql_query = (
-                        """
-                        UPDATE "Manager"
-                        SET "Name" = %s, "PhoneNumber" = %s, "Email" = %s,
-                        "Country" = %s, "MonthlySalary" = %s, "StoreID" = %s
-                        WHERE "ManagerID" = %s
-                        """
-                    )
-                    db.cursor.execute(
-                        sql_query,
-                        (self.name, self.phone, self.email, self.country, self.monthly_salary, self.store_id, self.id)
-                    )
-                    db.connection.commit()
+                    self._write_update(db.connection, db.cursor)
                     print("Manager updated successfully.")
+                except VersionConflictError:
+                    raise
                 except Exception as e:
                     print(f"Error updating manager: {e}")
 
     def delete(self) -> None:
         """Delete a manager from the database."""
         if self.id is not None:
+            self._invalidate_cached()
             with DBEngine() as db:
                 if db.cursor and db.connection:
                     try:
-                        db.cursor.execute('DELETE FROM "Manager" WHERE "ManagerID" = %s', (self.id,))
+                        execute_prepared(db.cursor, self.SQL.delete_by_id, (self.id,))
                         db.connection.commit()
+                        self._invalidate_cached()
                         self.id = None
                         print("Manager deleted successfully.")
                     except Exception as e:
@@ -95,12 +102,7 @@ class Manager(Person):
         with DBEngine() as db:
             if db.cursor and db.connection:
                 try:
-                    db.cursor.execute(
-                        """
-                        SELECT "ManagerID", "Name", "PhoneNumber", "Email", "Country", "MonthlySalary", "StoreID"
-                        FROM "Manager"
-                        """
-                    )
+                    db.cursor.execute(cls.SQL.select)
                     managers = db.cursor.fetchall()
                     if managers:
                         print("List of All Managers:")
@@ -113,10 +115,53 @@ class Manager(Person):
                 except Exception as e:
                     print(f"Error retrieving managers: {e}")
 
+    @classmethod
+    def find_by_id(cls, id: int) -> Optional['Manager']:
+        """Find a manager by ID, answering repeated lookups from the identity map."""
+        cached = cls.cache.get(id)
+        if cached is not None:
+            return cached
+        with DBEngine() as db:
+            if db.cursor is None or db.connection is None:
+                print("Database connection error.")
+                return None
+            execute_prepared(db.cursor, cls.SQL.select_by_id, (id,))
+            row = db.cursor.fetchone()
+            if row is None:
+                return None
+            manager = cls.from_row(row)
+            cls.cache.put(id, manager)
+            return manager
+
+    @classmethod
+    def find_by_ids(cls: Type['Manager'], ids: Iterable[int]) -> List['Manager']:
+        """Find managers by ID in one round trip, returned in the order the IDs were given.
+
+        IDs that do not exist are skipped and managers already in the identity map are not read again.
+        """
+        return load_by_ids(DBEngine, cls.SQL.select, '"ManagerID"', ids, cls.from_row, cls.cache)
+
+    @classmethod
+    def delete_many(cls, ids: Iterable[int]) -> int:
+        """Delete managers by ID in one transaction and return how many were deleted."""
+        return delete_by_ids(DBEngine, '"Manager"', '"ManagerID"', ids, cls.cache)
+
+    @classmethod
+    def iter_all(cls, batch_size: int = DEFAULT_BATCH_SIZE, after_id: Optional[int] = None) -> Iterator['Manager']:
+        """Iterate over all managers in ID order, fetching them in keyset-paginated batches."""
+        for row in iter_keyset(DBEngine, cls.SQL.select, '"ManagerID"', batch_size, after_id):
+            yield cls.from_row(row)
+
+    @classmethod
+    def view_all_managers(cls) -> None:
+        """View all managers one page at a time."""
+        if not print_paged(cls.iter_all()):
+            print("No managers found.")
+
     @classmethod
     def display_all_salaries(cls) -> None:
-        """Display all managers' salaries."""
-        cls.view_all()  # Ensure view_all is called to display manager details including salaries.
+        """Display all managers' salaries one page at a time."""
+        display_salaries('Manager', "Salaries of All Managers:")
 
     @classmethod
     def manage_managers(cls) -> None:
@@ -140,7 +185,7 @@ class Manager(Person):
             elif choice == '3':
                 cls.delete_manager()
             elif choice == '4':
-                cls.view_all()  # Directly use the updated view_all method.
+                cls.view_all_managers()
             elif choice == '5':
                 cls.display_all_salaries()
             elif choice == '6':
@@ -172,26 +217,32 @@ class Manager(Person):
         """Edit an existing manager."""
         try:
             manager_id = int(input("Enter the ID of the manager to edit: ").strip())
-            with DBEngine() as db:
-                if db.cursor and db.connection:
-                    db.cursor.execute('SELECT * FROM "Manager" WHERE "ManagerID" = %s', (manager_id,))
-                    manager_data = db.cursor.fetchone()
-                    if manager_data:
-                        name = input(f"Enter new name (current: {manager_data[1]}): ").strip() or manager_data[1]
-                        phone_input = input(f"Enter new phone number (current: {manager_data[2]}): ").strip()
-                        phone = int(phone_input) if phone_input else manager_data[2]
-                        email = input(f"Enter new email (current: {manager_data[3]}): ").strip() or manager_data[3]
-                        country = input(f"Enter new country (current: {manager_data[4]}): ").strip() or manager_data[4]
-                        monthly_salary_input = input(f"Enter new monthly salary (current: {manager_data[5]}): ").strip()
-                        monthly_salary = int(monthly_salary_input) if monthly_salary_input else manager_data[5]
-                        store_id_input = input(f"Enter new store ID (current: {manager_data[6]}): ").strip()
-                        store_id = int(store_id_input) if store_id_input else manager_data[6]
-
-                        manager = cls(name, phone, email, country, monthly_salary, store_id, manager_id)
-                        manager.save()
-                        print("Manager updated successfully.")
-                    else:
-                        print("Manager not found.")
+            manager = cls.find_by_id(manager_id)
+            if manager:
+                name = input(f"Enter new name (current: {manager.name}): ").strip() or manager.name
+                phone_input = input(f"Enter new phone number (current: {manager.phone}): ").strip()
+                phone = int(phone_input) if phone_input else manager.phone
+                email = input(f"Enter new email (current: {manager.email}): ").strip() or manager.email
+                country = input(f"Enter new country (current: {manager.country}): ").strip() or manager.country
+                monthly_salary_input = input(f"Enter new monthly salary (current: {manager.monthly_salary}): ").strip()
+                monthly_salary = int(monthly_salary_input) if monthly_salary_input else manager.monthly_salary
+                store_id_input = input(f"Enter new store ID (current: {manager.store_id}): ").strip()
+                store_id = int(store_id_input) if store_id_input else manager.store_id
+
+                manager.name = name
+                manager.phone = phone
+                manager.email = email
+                manager.country = country
+                manager.monthly_salary = monthly_salary
+                manager.store_id = store_id
+                try:
+                    manager.save()
+                except VersionConflictError:
+                    print("Manager was changed by another user meanwhile. Please edit it again.")
+                    return
+                print("Manager updated successfully.")
+            else:
+                print("Manager not found.")
         except ValueError:
             print("Invalid input. Please enter the correct data type.")
 
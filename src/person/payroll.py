@@ -0,0 +1,191 @@
+"""Payroll for workers, managers and store managers.
+
+Pay is computed by PostgreSQL rather than in Python: workers earn
+``HourlyRate * AmountWorked`` and both manager tables earn their
+``MonthlySalary``. Totals are a single GROUP BY over all three tables and CSV
+exports are streamed straight from the server with ``COPY ... TO STDOUT``, so
+neither needs the staff list in memory.
+"""
+
+import argparse
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Sequence, TextIO, Tuple
+from src.db_engine import DBEngine
+from src.pagination import DEFAULT_BATCH_SIZE, iter_keyset, print_paged
+
+# Role -> (table, key column, pay expression). Pay is widened to BIGINT so large hour counts cannot overflow.
+STAFF_TABLES: Dict[str, Tuple[str, str, str]] = {
+    'Worker': ('"Worker"', '"WorkerID"', '"HourlyRate"::BIGINT * "AmountWorked"'),
+    'Manager': ('"Manager"', '"ManagerID"', '"MonthlySalary"::BIGINT'),
+    'Store Manager': ('"Store Manager"', '"StoreManagerID"', '"MonthlySalary"::BIGINT'),
+}
+
+GROUPINGS: Dict[str, str] = {
+    'store': '"StoreID"',
+    'country': '"Country"',
+    'role': '"Role"',
+}
+
+STAFF_QUERY = '\nUNION ALL\n'.join(
+    f'SELECT \'{role}\' AS "Role", {key} AS "ID", "Name", "Country", "StoreID", {pay} AS "Pay" FROM {table}'
+    for role, (table, key, pay) in STAFF_TABLES.items()
+)
+
+
+class PayrollTotal(NamedTuple):
+    """Pay total for one group; ``role`` is None on the row that sums every role of the group."""
+    group: Any
+    role: Optional[str]
+    headcount: int
+    total: int
+
+
+def _check_role(role: str) -> Tuple[str, str, str]:
+    if role not in STAFF_TABLES:
+        raise ValueError(f"Unknown role '{role}', expected one of {sorted(STAFF_TABLES)}.")
+    return STAFF_TABLES[role]
+
+
+def _check_grouping(by: str) -> str:
+    if by not in GROUPINGS:
+        raise ValueError(f"Unknown grouping '{by}', expected one of {sorted(GROUPINGS)}.")
+    return GROUPINGS[by]
+
+
+def _totals_query(by: str, role_column: bool = True) -> str:
+    """Build the totals query; ``role_column`` False leaves out the always-empty role of 'role' totals."""
+    column = _check_grouping(by)
+    if by == 'role':
+        role = ', NULL' if role_column else ''
+        return (f'SELECT "Role"{role}, COUNT(*), COALESCE(SUM("Pay"), 0)::BIGINT FROM ({STAFF_QUERY}) staff '
+                f'GROUP BY "Role" ORDER BY "Role"')
+    return (f'SELECT {column}, "Role", COUNT(*), COALESCE(SUM("Pay"), 0)::BIGINT FROM ({STAFF_QUERY}) staff '
+            f'GROUP BY GROUPING SETS (({column}, "Role"), ({column})) '
+            f'ORDER BY {column} NULLS LAST, GROUPING("Role") DESC, "Role"')
+
+
+def iter_salaries(role: str, batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[Tuple[int, str, int]]:
+    """Yield (ID, name, pay) for every employee of a role in ID order, in keyset-paginated batches."""
+    table, key, pay = _check_role(role)
+    return iter_keyset(DBEngine, f'SELECT {key}, "Name", {pay} FROM {table}', key, batch_size)
+
+
+def totals(by: str = 'store') -> List[PayrollTotal]:
+    """Compute headcount and pay per store, country or role in one aggregate query.
+
+    For 'store' and 'country' every group has one row per role followed by a row
+    with ``role`` None holding the group's total across roles.
+    """
+    query = _totals_query(by)
+    with DBEngine() as db:
+        if db.connection is None or db.cursor is None:
+            print("Database connection error.")
+            return []
+        db.cursor.execute(query)
+        return [PayrollTotal(*row) for row in db.cursor.fetchall()]
+
+
+def export_csv(destination: TextIO, by: Optional[str] = None) -> int:
+    """Stream payroll to ``destination`` as CSV with a header row.
+
+    :param destination: Open text stream, e.g. a file opened with newline=''.
+    :param by: Export totals grouped by 'store', 'country' or 'role' instead of one line per employee.
+    :return: Number of data rows written.
+    """
+    if by is None:
+        query = f'SELECT "Role", "ID", "Name", "Country", "StoreID", "Pay" FROM ({STAFF_QUERY}) staff ORDER BY "Role", "ID"'
+        header = 'Role,ID,Name,Country,StoreID,Pay'
+    elif by == 'role':
+        query = _totals_query(by, role_column=False)
+        header = 'Role,Headcount,Total'
+    else:
+        query = _totals_query(by)
+        header = f'{by.capitalize()},Role,Headcount,Total'
+    with DBEngine() as db:
+        if db.connection is None or db.cursor is None:
+            print("Database connection error.")
+            return 0
+        destination.write(header + '\n')
+        db.cursor.copy_expert(f'COPY ({query}) TO STDOUT WITH (FORMAT csv)', destination)
+        return max(int(db.cursor.rowcount), 0)
+
+
+def export_csv_file(path: str, by: Optional[str] = None) -> int:
+    """Write payroll CSV to a file; see export_csv. An unknown grouping is rejected before the file is created."""
+    if by is not None:
+        _check_grouping(by)
+    with open(path, 'w', newline='', encoding='utf-8') as destination:
+        return export_csv(destination, by)
+
+
+def display_salaries(role: str, title: str) -> None:
+    """Print the pay of every employee of a role one page at a time."""
+    print(title)
+    shown = print_paged(iter_salaries(role), render=lambda row: f"ID: {row[0]}, Name: {row[1]}, Salary: {row[2]}")
+    if not shown:
+        print(f"No {role.lower()}s found.")
+
+
+def display_totals(by: str) -> None:
+    """Print payroll totals grouped by store, country or role."""
+    rows = totals(by)
+    if not rows:
+        print("No staff found.")
+        return
+    label = by.capitalize()
+    for row in rows:
+        role = row.role if row.role is not None else "All roles"
+        if by == 'role':
+            print(f"{row.group}: Headcount: {row.headcount}, Total: {row.total}")
+        else:
+            print(f"{label}: {row.group}, {role}: Headcount: {row.headcount}, Total: {row.total}")
+
+
+def payroll_menu() -> None:
+    """Payroll menu with totals and CSV export."""
+    while True:
+        print("\nPayroll")
+        print("1. Totals per Store")
+        print("2. Totals per Country")
+        print("3. Totals per Role")
+        print("4. Export Payroll to CSV")
+        print("5. Back")
+
+        choice = input("Enter your choice (1-5): ").strip()
+
+        if choice == '1':
+            display_totals('store')
+        elif choice == '2':
+            display_totals('country')
+        elif choice == '3':
+            display_totals('role')
+        elif choice == '4':
+            export_payroll()
+        elif choice == '5':
+            break
+        else:
+            print("Invalid choice, please select between 1 and 5.")
+
+
+def export_payroll() -> None:
+    """Prompt for a CSV path and grouping, then export payroll."""
+    path = input("Enter CSV file path: ").strip()
+    by = input("Group by store, country or role (leave empty for one line per employee): ").strip().lower() or None
+    try:
+        rows = export_csv_file(path, by)
+    except Exception as e:
+        print(f"Error exporting payroll: {e}")
+        return
+    print(f"Exported {rows} rows to {path}.")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Command line entry point: ``python -m src.person.payroll FILE [--by store|country|role]``."""
+    parser = argparse.ArgumentParser(description="Export payroll to CSV.")
+    parser.add_argument('path', help="CSV file to write.")
+    parser.add_argument('--by', choices=sorted(GROUPINGS), help="Export totals per group instead of per employee.")
+    args = parser.parse_args(argv)
+    print(f"Exported {export_csv_file(args.path, args.by)} rows to {args.path}.")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,7 +1,18 @@
-from typing import Optional
+from typing import Iterable, Iterator, List, Optional, Type, TypeVar
+from src.pagination import DEFAULT_BATCH_SIZE
+from src.tracking import ChangeTracking
 
-class Person:
-    """Represents a person in the system."""
+P = TypeVar('P', bound='Person')
+
+class Person(ChangeTracking):
+    """Represents a person in the system.
+
+    Updates only write the columns changed since the person was loaded and fail with
+    VersionConflictError if the row was changed meanwhile; see src.tracking.
+    """
+
+    ID_ATTRIBUTE = 'id'
+    VERSION_COLUMN = 'Version'
 
     def __init__(self, name: str, phone: int, email: str, country: str, id: Optional[int] = None) -> None:
         """Initialize a new person with the given details.
@@ -32,6 +43,26 @@ class Person:
         """View all people in the table."""
         raise NotImplementedError("Subclasses should implement this method.")
 
+    @classmethod
+    def find_by_ids(cls: Type[P], ids: Iterable[int]) -> List[P]:
+        """Find several people by ID, returned in the order the IDs were given."""
+        raise NotImplementedError("Subclasses should implement this method.")
+
+    @classmethod
+    def delete_many(cls, ids: Iterable[int]) -> int:
+        """Delete several people by ID and return how many were deleted."""
+        raise NotImplementedError("Subclasses should implement this method.")
+
+    @classmethod
+    def iter_all(cls, batch_size: int = DEFAULT_BATCH_SIZE, after_id: Optional[int] = None) -> Iterator['Person']:
+        """Iterate over all people in ID order, fetching them in batches."""
+        raise NotImplementedError("Subclasses should implement this method.")
+
+    @classmethod
+    def find_by_id(cls, id: int) -> Optional['Person']:
+        """Find a person by ID."""
+        raise NotImplementedError("Subclasses should implement this method.")
+
     def __str__(self) -> str:
         """Return a string representation of the person.
 
@@ -6,10 +6,17 @@ and provides methods to add, remove, and view responsibilities.
 
 from typing import Optional, List
 from src.db_engine import DBEngine
+from src.mapping import Mapped
+from src.prepared import execute_prepared
 
-class Responsibilities:
+class Responsibilities(Mapped):
     """Class for managing responsibilities in the database."""
 
+    TABLE = 'Responsibilities'
+    ID_COLUMN = 'ResponsibilityID'
+    ID_ATTRIBUTE = 'responsibility_id'
+    COLUMNS = (('ResponsibilityName', 'responsibility_name'),)
+
     def __init__(self, responsibility_id: Optional[int] = None, responsibility_name: Optional[str] = None) -> None:
         self.responsibility_id = responsibility_id
         self.responsibility_name = responsibility_name
@@ -26,20 +33,12 @@ class Responsibilities:
 
         try:
             if self.responsibility_id is None:
-                cursor.execute("""
-                    INSERT INTO "Responsibilities" ("ResponsibilityName")
-                    VALUES (%s)
-                    RETURNING "ResponsibilityID"
-                """, (self.responsibility_name,))
+                execute_prepared(cursor, self.SQL.insert, self.insert_params())
                 self.responsibility_id = cursor.fetchone()[0]
                 connection.commit()
                 print(f"Responsibility '{self.responsibility_name}' added with ID {self.responsibility_id}.")
             else:
-                cursor.execute("""
-                    UPDATE "Responsibilities"
-                    SET "ResponsibilityName" = %s
-                    WHERE "ResponsibilityID" = %s
-                """, (self.responsibility_name, self.responsibility_id))
+                execute_prepared(cursor, self.SQL.update, self.update_params())
                 connection.commit()
                 print(f"Responsibility ID {self.responsibility_id} updated to '{self.responsibility_name}'.")
         except Exception as e:
@@ -60,8 +59,7 @@ class Responsibilities:
                 return
 
             try:
-                cursor.execute('DELETE FROM "Responsibilities" WHERE "ResponsibilityID" = %s',
-                               (self.responsibility_id,))
+                execute_prepared(cursor, self.SQL.delete_by_id, (self.responsibility_id,))
                 connection.commit()
                 print(f"Responsibility ID {self.responsibility_id} deleted.")
                 self.responsibility_id = None
@@ -85,9 +83,8 @@ class Responsibilities:
             return []
 
         try:
-            cursor.execute('SELECT "ResponsibilityID", "ResponsibilityName" FROM "Responsibilities"')
-            responsibilities = cursor.fetchall()
-            return [cls(responsibility_id=res[0], responsibility_name=res[1]) for res in responsibilities]
+            execute_prepared(cursor, cls.SQL.select)
+            return [cls.from_row(res) for res in cursor.fetchall()]
         except Exception as e:
             print(f"Error retrieving responsibilities: {e}")
             return []
@@ -1,10 +1,22 @@
-from typing import Optional
+from typing import ClassVar, Iterable, Iterator, List, Optional, Type
+from src.bulk import delete_by_ids, load_by_ids
+from src.cache import IdentityMap
 from src.db_engine import DBEngine
+from src.pagination import DEFAULT_BATCH_SIZE, iter_keyset, print_paged
+from src.person.payroll import display_salaries
 from src.person.person import Person
+from src.prepared import execute_prepared
+from src.tracking import INITIAL_VERSION, VersionConflictError
 
 class StoreManager(Person):
     """Represents a store manager in the system."""
 
+    TABLE = 'Store Manager'
+    ID_COLUMN = 'StoreManagerID'
+    COLUMNS = (('StoreID', 'store_id'), ('Name', 'name'), ('Country', 'country'), ('Email', 'email'),
+               ('PhoneNumber', 'phone'), ('MonthlySalary', 'monthly_salary'), ('PettyCash', 'petty_cash'))
+    cache: ClassVar[IdentityMap['StoreManager']] = IdentityMap()
+
     def __init__(self, name: str, phone: int, email: str, country: str, store_id: int,
                  monthly_salary: int, petty_cash: int, id: Optional[int] = None) -> None:
         """Initialize a new store manager with the given details.
@@ -24,16 +36,24 @@ class StoreManager(Person):
         self.monthly_salary = monthly_salary
         self.petty_cash = petty_cash
 
+    def __str__(self) -> str:
+        return (f"ID: {self.id}, StoreID: {self.store_id}, Name: {self.name}, Country: {self.country}, "
+                f"Email: {self.email}, Phone: {self.phone}, Salary: {self.monthly_salary}, Petty Cash: {self.petty_cash}")
+
     def display_salary(self) -> None:
         """Display the store manager's monthly salary."""
         print(f"{self.name}'s monthly salary is: {self.monthly_salary}")
 
     def save(self) -> None:
-        """Save a new store manager or update an existing store manager in the database."""
+        """Save a new store manager or write the columns changed since it was loaded."""
+        if not self.is_dirty:
+            return
+        self._invalidate_cached()
         if self.id is None:
             self._create_store_manager()
         else:
             self._update_store_manager()
+        self._invalidate_cached()
 
     def _create_store_manager(self) -> None:
         """Insert a new store manager into the database."""
@@ -44,13 +64,10 @@ class StoreManager(Person):
             print("Database connection not established.")
             return
         try:
-            cursor.execute("""
-                INSERT INTO "Store Manager" ("StoreID", "Name", "Country", "Email", "PhoneNumber", "MonthlySalary", "PettyCash")
-                VALUES (%s, %s, %s, %s, %s, %s, %s)
-                RETURNING "StoreManagerID"
-            """, (self.store_id, self.name, self.country, self.email, self.phone, self.monthly_salary, self.petty_cash))
+            execute_prepared(cursor, self.SQL.insert, self.insert_params())
             self.id = cursor.fetchone()[0]
             connection.commit()
+            self.mark_clean(INITIAL_VERSION)
             print("Store Manager created successfully.")
         except Exception as e:
             print(f"Error creating store manager: {e}")
@@ -69,14 +86,10 @@ class StoreManager(Person):
             print("Database connection not established.")
             return
         try:
-            cursor.execute("""
-                UPDATE "Store Manager"
-                SET "StoreID" = %s, "Name" = %s, "Country" = %s, "Email" = %s, "PhoneNumber" = %s, "MonthlySalary" = %s, "PettyCash" = %s
-                WHERE "StoreManagerID" = %s
-            """, (self.store_id, self.name, self.country, self.email, self.phone, self.monthly_salary, self.petty_cash,
-                  self.id))
-            connection.commit()
+            self._write_update(connection, cursor)
             print("Store Manager updated successfully.")
+        except VersionConflictError:
+            raise
         except Exception as e:
             print(f"Error updating store manager: {e}")
         finally:
@@ -88,6 +101,7 @@ class StoreManager(Person):
     def delete(self) -> None:
         """Delete a store manager from the database."""
         if self.id is not None:
+            self._invalidate_cached()
             db = DBEngine()
             connection = db.connection
             cursor = db.cursor
@@ -95,8 +109,9 @@ class StoreManager(Person):
                 print("Database connection not established.")
                 return
             try:
-                cursor.execute('DELETE FROM "Store Manager" WHERE "StoreManagerID" = %s', (self.id,))
+                execute_prepared(cursor, self.SQL.delete_by_id, (self.id,))
                 connection.commit()
+                self._invalidate_cached()
                 self.id = None
                 print("Store Manager deleted successfully.")
             except Exception as e:
@@ -119,10 +134,7 @@ class StoreManager(Person):
             print("Database connection not established.")
             return
         try:
-            cursor.execute("""
-                SELECT "StoreManagerID", "StoreID", "Name", "Country", "Email", "PhoneNumber", "MonthlySalary", "PettyCash"
-                FROM "Store Manager"
-            """)
+            cursor.execute(cls.SQL.select)
             store_managers = cursor.fetchall()
             if store_managers:
                 print("List of All Store Managers:")
@@ -140,34 +152,58 @@ class StoreManager(Person):
                 connection.close()
 
     @classmethod
-    def display_all_salaries(cls) -> None:
-        """Display all store managers' salaries."""
+    def find_by_id(cls, id: int) -> Optional['StoreManager']:
+        """Find a store manager by ID, answering repeated lookups from the identity map."""
+        cached = cls.cache.get(id)
+        if cached is not None:
+            return cached
         db = DBEngine()
         connection = db.connection
         cursor = db.cursor
         if cursor is None or connection is None:
             print("Database connection not established.")
-            return
+            return None
         try:
-            cursor.execute("""
-                SELECT "StoreManagerID", "Name", "MonthlySalary"
-                FROM "Store Manager"
-            """)
-            salaries = cursor.fetchall()
-            if salaries:
-                print("Salaries of All Store Managers:")
-                for salary in salaries:
-                    print(f"ID: {salary[0]}, Name: {salary[1]}, Salary: {salary[2]}")
-            else:
-                print("No store managers found.")
+            execute_prepared(cursor, cls.SQL.select_by_id, (id,))
+            sm = cursor.fetchone()
+            if sm is None:
+                return None
+            store_manager = cls.from_row(sm)
+            cls.cache.put(id, store_manager)
+            return store_manager
         except Exception as e:
-            print(f"Error retrieving salaries: {e}")
+            print(f"Error retrieving store manager: {e}")
+            return None
         finally:
             if cursor:
                 cursor.close()
             if connection:
                 connection.close()
 
+    @classmethod
+    def find_by_ids(cls: Type['StoreManager'], ids: Iterable[int]) -> List['StoreManager']:
+        """Find store managers by ID in one round trip, returned in the order the IDs were given.
+
+        IDs that do not exist are skipped and store managers already in the identity map are not read again.
+        """
+        return load_by_ids(DBEngine, cls.SQL.select, '"StoreManagerID"', ids, cls.from_row, cls.cache)
+
+    @classmethod
+    def delete_many(cls, ids: Iterable[int]) -> int:
+        """Delete store managers by ID in one transaction and return how many were deleted."""
+        return delete_by_ids(DBEngine, '"Store Manager"', '"StoreManagerID"', ids, cls.cache)
+
+    @classmethod
+    def iter_all(cls, batch_size: int = DEFAULT_BATCH_SIZE, after_id: Optional[int] = None) -> Iterator['StoreManager']:
+        """Iterate over all store managers in ID order, fetching them in keyset-paginated batches."""
+        for sm in iter_keyset(DBEngine, cls.SQL.select, '"StoreManagerID"', batch_size, after_id):
+            yield cls.from_row(sm)
+
+    @classmethod
+    def display_all_salaries(cls) -> None:
+        """Display all store managers' salaries one page at a time."""
+        display_salaries('Store Manager', "Salaries of All Store Managers:")
+
 def manage_store_manager_menu() -> None:
     """Store Manager management menu with all options."""
     while True:
@@ -217,43 +253,38 @@ def edit_store_manager() -> None:
     """Edit an existing store manager."""
     try:
         manager_id = int(input("Enter the ID of the store manager to edit: ").strip())
-        db = DBEngine()
-        connection = db.connection
-        cursor = db.cursor
-        if cursor is None or connection is None:
-            print("Database connection not established.")
-            return
-        try:
-            cursor.execute('SELECT * FROM "Store Manager" WHERE "StoreManagerID" = %s', (manager_id,))
-            sm_data = cursor.fetchone()
-            if sm_data:
-                name = input(f"Enter new name (current: {sm_data[2]}): ").strip() or sm_data[2]
+        current = StoreManager.find_by_id(manager_id)
+        if current:
+            name = input(f"Enter new name (current: {current.name}): ").strip() or current.name
 
-                # Correctly handle phone input
-                phone_input = input(f"Enter new phone number (current: {sm_data[5]}): ").strip()
-                phone = int(phone_input) if phone_input else sm_data[5]
+            # Correctly handle phone input
+            phone_input = input(f"Enter new phone number (current: {current.phone}): ").strip()
+            phone = int(phone_input) if phone_input else current.phone
 
-                email = input(f"Enter new email (current: {sm_data[4]}): ").strip() or sm_data[4]
-                country = input(f"Enter new country (current: {sm_data[3]}): ").strip() or sm_data[3]
-                store_id_input = input(f"Enter new store ID (current: {sm_data[1]}): ").strip()
-                store_id = int(store_id_input) if store_id_input else sm_data[1]
-                monthly_salary_input = input(f"Enter new monthly salary (current: {sm_data[6]}): ").strip()
-                monthly_salary = int(monthly_salary_input) if monthly_salary_input else sm_data[6]
-                petty_cash_input = input(f"Enter new petty cash (current: {sm_data[7]}): ").strip()
-                petty_cash = int(petty_cash_input) if petty_cash_input else sm_data[7]
+            email = input(f"Enter new email (current: {current.email}): ").strip() or current.email
+            country = input(f"Enter new country (current: {current.country}): ").strip() or current.country
+            store_id_input = input(f"Enter new store ID (current: {current.store_id}): ").strip()
+            store_id = int(store_id_input) if store_id_input else current.store_id
+            monthly_salary_input = input(f"Enter new monthly salary (current: {current.monthly_salary}): ").strip()
+            monthly_salary = int(monthly_salary_input) if monthly_salary_input else current.monthly_salary
+            petty_cash_input = input(f"Enter new petty cash (current: {current.petty_cash}): ").strip()
+            petty_cash = int(petty_cash_input) if petty_cash_input else current.petty_cash
 
-                store_manager = StoreManager(name, phone, email, country, store_id, monthly_salary, petty_cash, manager_id)
-                store_manager.save()
-                print("Store Manager updated successfully.")
-            else:
-                print("Store Manager not found.")
-        except Exception as e:
-            print(f"Error retrieving store manager: {e}")
-        finally:
-            if cursor:
-                cursor.close()
-            if connection:
-                connection.close()
+            current.name = name
+            current.phone = phone
+            current.email = email
+            current.country = country
+            current.store_id = store_id
+            current.monthly_salary = monthly_salary
+            current.petty_cash = petty_cash
+            try:
+                current.save()
+            except VersionConflictError:
+                print("Store Manager was changed by another user meanwhile. Please edit it again.")
+                return
+            print("Store Manager updated successfully.")
+        else:
+            print("Store Manager not found.")
     except ValueError:
         print("Invalid input. Please enter the correct data type.")
 
@@ -267,8 +298,9 @@ def delete_store_manager() -> None:
         print("Invalid input. Please enter the correct data type.")
 
 def view_all_store_managers() -> None:
-    """View all store managers."""
-    StoreManager.view_all()
+    """View all store managers one page at a time."""
+    if not print_paged(StoreManager.iter_all()):
+        print("No store managers found.")
 
 def display_all_salaries() -> None:
     """Display all store managers' salaries."""
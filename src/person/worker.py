@@ -1,9 +1,27 @@
-from typing import Optional
+import threading
+from typing import ClassVar, Iterable, Iterator, List, Optional, Type
+from src.bulk import delete_by_ids, load_by_ids
+from src.cache import IdentityMap
 from src.db_engine import DBEngine
+from src.person.hours_buffer import HoursBuffer
+from src.pagination import DEFAULT_BATCH_SIZE, iter_keyset, print_paged
+from src.person.payroll import display_salaries
 from src.person.person import Person
+from src.prepared import execute_prepared
+from src.tracking import INITIAL_VERSION, VersionConflictError
+
+_hours_buffer_lock = threading.Lock()
 
 class Worker(Person):
     """This is Worker class which is added through Person class."""
+
+    TABLE = 'Worker'
+    ID_COLUMN = 'WorkerID'
+    COLUMNS = (('Name', 'name'), ('PhoneNumber', 'phone'), ('Email', 'email'), ('Country', 'country'),
+               ('HourlyRate', 'hourly_rate'), ('AmountWorked', 'amount_worked'), ('StoreID', 'store_id'))
+    cache: ClassVar[IdentityMap['Worker']] = IdentityMap()
+    _hours_buffer: Optional[HoursBuffer] = None
+
     def __init__(self, name: str, phone: int, email: str, country: str,
                  hourly_rate: int, amount_worked: int, store_id: int, id: Optional[int] = None) -> None:
         super().__init__(name, phone, email, country, id)
@@ -11,6 +29,10 @@ class Worker(Person):
         self.amount_worked = amount_worked
         self.store_id = store_id
 
+    def __str__(self) -> str:
+        return (f"ID: {self.id}, Name: {self.name}, Phone: {self.phone}, Email: {self.email}, Country: {self.country}, "
+                f"Hourly Rate: {self.hourly_rate}, Amount Worked: {self.amount_worked}, Store ID: {self.store_id}")
+
     def display_salary(self) -> None:
         """Display the salary of the worker.
 
@@ -23,12 +45,16 @@ class Worker(Person):
         """Save or update the worker in the database.
 
         If the worker does not have an ID, create a new worker record. Otherwise,
-        update the existing worker record.
+        write the columns changed since the worker was loaded, if any.
         """
+        if not self.is_dirty:
+            return
+        self._invalidate_cached()
         if self.id is None:
             self._create_worker()
         else:
             self._update_worker()
+        self._invalidate_cached()
 
     def _create_worker(self) -> None:
         """Create a new worker record in the database.
@@ -42,13 +68,10 @@ class Worker(Person):
             return
 
         try:
-            db.cursor.execute("""
-                INSERT INTO "Worker" ("Name", "PhoneNumber", "Email", "Country", "HourlyRate", "AmountWorked", "StoreID")
-                VALUES (%s, %s, %s, %s, %s, %s, %s)
-                RETURNING "WorkerID"
-            """, (self.name, self.phone, self.email, self.country, self.hourly_rate, self.amount_worked, self.store_id))
+            execute_prepared(db.cursor, self.SQL.insert, self.insert_params())
             self.id = db.cursor.fetchone()[0]
             db.connection.commit()
+            self.mark_clean(INITIAL_VERSION)
             print("Worker created successfully.")
         except Exception as e:
             print(f"Error creating worker: {e}")
@@ -69,14 +92,10 @@ class Worker(Person):
             return
 
         try:
-            db.cursor.execute("""
-                UPDATE "Worker"
-                SET "Name" = %s, "PhoneNumber" = %s, "Email" = %s, "Country" = %s, "HourlyRate" = %s, "AmountWorked" = %s, "StoreID" = %s
-                WHERE "WorkerID" = %s
-            """, (self.name, self.phone, self.email, self.country, self.hourly_rate, self.amount_worked, self.store_id,
-                  self.id))
-            db.connection.commit()
+            self._write_update(db.connection, db.cursor)
             print("Worker updated successfully.")
+        except VersionConflictError:
+            raise
         except Exception as e:
             print(f"Error updating worker: {e}")
         finally:
@@ -91,14 +110,16 @@ class Worker(Person):
         Remove the worker record from the database based on the worker's ID.
         """
         if self.id is not None:
+            self._invalidate_cached()
             db = DBEngine()
             if db.cursor is None or db.connection is None:
                 print("Database connection not established.")
                 return
 
             try:
-                db.cursor.execute('DELETE FROM "Worker" WHERE "WorkerID" = %s', (self.id,))
+                execute_prepared(db.cursor, self.SQL.delete_by_id, (self.id,))
                 db.connection.commit()
+                self._invalidate_cached()
                 self.id = None
                 print("Worker deleted successfully.")
             except Exception as e:
@@ -124,10 +145,7 @@ class Worker(Person):
             return
 
         try:
-            db.cursor.execute("""
-                SELECT "WorkerID", "Name", "PhoneNumber", "Email", "Country", "HourlyRate", "AmountWorked", "StoreID"
-                FROM "Worker"
-            """)
+            db.cursor.execute(cls.SQL.select)
             workers = db.cursor.fetchall()
             if workers:
                 print("List of Workers:")
@@ -144,21 +162,84 @@ class Worker(Person):
             if db.connection:
                 db.connection.close()
 
+    @classmethod
+    def find_by_id(cls, id: int) -> Optional['Worker']:
+        """Find a worker by ID, answering repeated lookups from the identity map.
+
+        Return None if the worker does not exist or cannot be read.
+        """
+        cached = cls.cache.get(id)
+        if cached is not None:
+            return cached
+        db = DBEngine()
+        if db.cursor is None or db.connection is None:
+            print("Database connection not established.")
+            return None
+
+        try:
+            execute_prepared(db.cursor, cls.SQL.select_by_id, (id,))
+            row = db.cursor.fetchone()
+            if row is None:
+                return None
+            worker = cls.from_row(row)
+            cls.cache.put(id, worker)
+            return worker
+        except Exception as e:
+            print(f"Error retrieving worker: {e}")
+            return None
+        finally:
+            if db.cursor:
+                db.cursor.close()
+            if db.connection:
+                db.connection.close()
+
+    @classmethod
+    def find_by_ids(cls: Type['Worker'], ids: Iterable[int]) -> List['Worker']:
+        """Find workers by ID in one round trip, returned in the order the IDs were given.
+
+        IDs that do not exist are skipped and workers already in the identity map are not read again.
+        """
+        return load_by_ids(DBEngine, cls.SQL.select, '"WorkerID"', ids, cls.from_row, cls.cache)
+
+    @classmethod
+    def delete_many(cls, ids: Iterable[int]) -> int:
+        """Delete workers by ID in one transaction and return how many were deleted."""
+        return delete_by_ids(DBEngine, '"Worker"', '"WorkerID"', ids, cls.cache)
+
+    @classmethod
+    def iter_all(cls, batch_size: int = DEFAULT_BATCH_SIZE, after_id: Optional[int] = None) -> Iterator['Worker']:
+        """Iterate over all workers in ID order, fetching them in keyset-paginated batches."""
+        for row in iter_keyset(DBEngine, cls.SQL.select, '"WorkerID"', batch_size, after_id):
+            yield cls.from_row(row)
+
+    @classmethod
+    def hours_buffer(cls) -> HoursBuffer:
+        """Return the write-behind buffer for worker hours, creating it on first use."""
+        with _hours_buffer_lock:
+            if cls._hours_buffer is None:
+                cls._hours_buffer = HoursBuffer(cache=cls.cache)
+            return cls._hours_buffer
+
+    @classmethod
+    def record_hours(cls, worker_id: int, hours: int) -> None:
+        """Add hours worked to a worker through the write-behind buffer.
+
+        The increment is coalesced with others for the same worker and written with
+        the next batched flush, which is started on first use and runs again at exit.
+        """
+        buffer = cls.hours_buffer()
+        if not buffer.running:
+            buffer.start()
+        buffer.record(worker_id, hours)
+
     @classmethod
     def display_all_salaries(cls) -> None:
         """Display salaries of all workers.
 
-        Retrieve all workers and print their salaries based on hourly rate and amount
-        worked. This method assumes `view_all` prints workers as well.
+        Pay is computed by the database as hourly rate times amount worked and
+        printed one page at a time.
         """
-        workers = cls.view_all()
-        if workers:
-            print("Salaries of All Workers:")
-            for w in workers:
-                salary = w[5] * w[6]
-                print(f"ID: {w[0]}, Name: {w[1]}, Salary: {salary}")
-        else:
-            print("No workers found.")
+        display_salaries('Worker', "Salaries of All Workers:")
 
     @classmethod
     def manage_workers(cls) -> None:
@@ -175,9 +256,10 @@ class Worker(Person):
             print("3. Delete Worker")
             print("4. View All Workers")
             print("5. Display All Salaries")
-            print("6. Back")
+            print("6. Record Hours Worked")
+            print("7. Back")
 
-            choice = input("Enter your choice (1-6): ").strip()
+            choice = input("Enter your choice (1-7): ").strip()
 
             if choice == '1':
                 cls.add_worker()
@@ -190,9 +272,11 @@ class Worker(Person):
             elif choice == '5':
                 cls.display_all_salaries()
             elif choice == '6':
+                cls.record_worker_hours()
+            elif choice == '7':
                 break
             else:
-                print("Invalid choice, please select between 1 and 6.")
+                print("Invalid choice, please select between 1 and 7.")
 
     @classmethod
     def add_worker(cls) -> None:
@@ -225,40 +309,51 @@ class Worker(Person):
         """
         try:
             worker_id = int(input("Enter the ID of the worker to edit: ").strip())
-
-            db = DBEngine()
-            if db.cursor is None or db.connection is None:
-                print("Database connection not established.")
-                return
-
-            db.cursor.execute("""
-                SELECT "WorkerID", "Name", "PhoneNumber", "Email", "Country", "HourlyRate", "AmountWorked", "StoreID"
-                FROM "Worker"
-                WHERE "WorkerID" = %s
-            """, (worker_id,))
-            worker_data = db.cursor.fetchone()
-
-            if worker_data:
-                name = input(f"Enter new name (current: {worker_data[1]}): ").strip() or worker_data[1]
-                phone_input = input(f"Enter new phone number (current: {worker_data[2]}): ").strip()
-                phone = int(phone_input) if phone_input else worker_data[2]
-                email = input(f"Enter new email (current: {worker_data[3]}): ").strip() or worker_data[3]
-                country = input(f"Enter new country (current: {worker_data[4]}): ").strip() or worker_data[4]
-                hourly_rate_input = input(f"Enter new hourly rate (current: {worker_data[5]}): ").strip()
-                hourly_rate = int(hourly_rate_input) if hourly_rate_input else worker_data[5]
-                amount_worked_input = input(f"Enter new amount worked (current: {worker_data[6]}): ").strip()
-                amount_worked = int(amount_worked_input) if amount_worked_input else worker_data[6]
-                store_id_input = input(f"Enter new store ID (current: {worker_data[7]}): ").strip()
-                store_id = int(store_id_input) if store_id_input else worker_data[7]
-
-                worker = cls(name, phone, email, country, hourly_rate, amount_worked, store_id, worker_id)
-                worker.save()
+            current = cls.find_by_id(worker_id)
+
+            if current:
+                name = input(f"Enter new name (current: {current.name}): ").strip() or current.name
+                phone_input = input(f"Enter new phone number (current: {current.phone}): ").strip()
+                phone = int(phone_input) if phone_input else current.phone
+                email = input(f"Enter new email (current: {current.email}): ").strip() or current.email
+                country = input(f"Enter new country (current: {current.country}): ").strip() or current.country
+                hourly_rate_input = input(f"Enter new hourly rate (current: {current.hourly_rate}): ").strip()
+                hourly_rate = int(hourly_rate_input) if hourly_rate_input else current.hourly_rate
+                amount_worked_input = input(f"Enter new amount worked (current: {current.amount_worked}): ").strip()
+                amount_worked = int(amount_worked_input) if amount_worked_input else current.amount_worked
+                store_id_input = input(f"Enter new store ID (current: {current.store_id}): ").strip()
+                store_id = int(store_id_input) if store_id_input else current.store_id
+
+                current.name = name
+                current.phone = phone
+                current.email = email
+                current.country = country
+                current.hourly_rate = hourly_rate
+                current.amount_worked = amount_worked
+                current.store_id = store_id
+                try:
+                    current.save()
+                except VersionConflictError:
+                    print("Worker was changed by another user meanwhile. Please edit it again.")
+                    return
                 print("Worker updated successfully.")
             else:
                 print("Worker not found.")
         except ValueError:
             print("Invalid input. Please enter the correct data type.")
 
+    @classmethod
+    def record_worker_hours(cls) -> None:
+        """Prompt for a worker ID and hours worked and buffer the increment."""
+        try:
+            worker_id = int(input("Enter the ID of the worker: ").strip())
+            hours = int(input("Enter hours worked: ").strip())
+        except ValueError:
+            print("Invalid input. Please enter the correct data type.")
+            return
+        cls.record_hours(worker_id, hours)
+        print(f"Recorded {hours} hours for worker {worker_id}; {cls.hours_buffer().stats}.")
+
     @classmethod
     def delete_worker(cls) -> None:
         """Delete a worker based on user input.
@@ -276,8 +371,9 @@ class Worker(Person):
 
     @classmethod
     def view_all_workers(cls) -> None:
-        """View all workers by calling the `view_all` method.
+        """View all workers one page at a time.
 
-        Fetch and print all worker records by invoking the `view_all` method.
+        Workers are streamed with `iter_all`, so only the current page is held in memory.
         """
-        cls.view_all()
+        if not print_paged(cls.iter_all()):
+            print("No workers found.")
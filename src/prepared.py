@@ -0,0 +1,167 @@
+"""Server-side prepared statements for the hot CRUD queries.
+
+``execute_prepared(cursor, sql, params)`` runs a query through ``PREPARE``/``EXECUTE``
+on pooled connections: the first time a connection sees a query it is
+prepared under a generated name, and later calls on the same connection only
+send ``EXECUTE name (...)``, so PostgreSQL skips parsing and, once it settles
+on a generic plan, planning as well.
+
+Prepared statements live as long as the server session, so each pooled
+connection keeps its own registry. A connection that is replaced after a
+reconnect starts with an empty registry, and a registry that no longer matches
+the server (another backend PID, or statements dropped with ``DISCARD ALL``) is
+reset and refilled. Connections that are not pooled run the query as is.
+
+Set ``DB_PREPARED_STATEMENTS=0`` to turn preparing off.
+"""
+
+import os
+import re
+import threading
+from typing import Any, Dict, Optional, Sequence
+import psycopg2
+from psycopg2 import errors, extensions
+from src.db_engine import PooledConnection
+
+# Registries stop preparing new statements past this size; the hot set is a few dozen queries.
+MAX_STATEMENTS = 256
+
+_PLACEHOLDER = re.compile(r'%s')
+
+
+class PreparedStatementStats:
+    """Process-wide counters of prepared statement use.
+
+    Attributes:
+        prepares (int): PREPARE statements sent.
+        executions (int): Queries run through EXECUTE.
+        hits (int): Executions that reused a statement prepared earlier on the connection.
+        resets (int): Registries dropped because the server no longer had their statements.
+        unprepared (int): Queries run as plain statements.
+    """
+
+    def __init__(self) -> None:
+        self.prepares = 0
+        self.executions = 0
+        self.hits = 0
+        self.resets = 0
+        self.unprepared = 0
+        self._lock = threading.Lock()
+
+    def count(self, **increments: int) -> None:
+        """Add to the named counters."""
+        with self._lock:
+            for name, value in increments.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of executions that did not need a PREPARE first."""
+        return self.hits / self.executions if self.executions else 0.0
+
+    def reset(self) -> None:
+        """Set every counter back to zero."""
+        with self._lock:
+            self.prepares = self.executions = self.hits = self.resets = self.unprepared = 0
+
+    def __str__(self) -> str:
+        return (f"{self.executions} prepared executions, {self.prepares} prepares, "
+                f"hit rate {self.hit_rate:.1%}, {self.resets} resets, {self.unprepared} unprepared")
+
+
+stats = PreparedStatementStats()
+
+
+class StatementRegistry:
+    """Names of the statements prepared on one server session.
+
+    Attributes:
+        backend_pid (int): Server process the statements were prepared in.
+        names (Dict[str, str]): Query text -> prepared statement name.
+        queries (Dict[str, str]): Prepared statement name -> query text.
+    """
+
+    def __init__(self, backend_pid: int) -> None:
+        self.backend_pid = backend_pid
+        self.names: Dict[str, str] = {}
+        self.queries: Dict[str, str] = {}
+        self._counter = 0
+
+    def add(self, sql: str) -> str:
+        """Allocate a statement name for ``sql``."""
+        self._counter += 1
+        name = f'sms_stmt_{self._counter}'
+        self.names[sql] = name
+        self.queries[name] = sql
+        return name
+
+
+def enabled() -> bool:
+    """Whether queries are prepared, per the DB_PREPARED_STATEMENTS environment variable."""
+    return os.getenv('DB_PREPARED_STATEMENTS', '1').strip().lower() not in ('0', 'false', 'no', 'off')
+
+
+def to_server_placeholders(sql: str) -> str:
+    """Turn psycopg2's ``%s`` placeholders into PostgreSQL's ``$1, $2, ...``."""
+    counter = iter(range(1, sql.count('%s') + 1))
+    return _PLACEHOLDER.sub(lambda _: f'${next(counter)}', sql)
+
+
+def registry_for(connection: PooledConnection) -> StatementRegistry:
+    """Return the registry of a connection, starting a new one if the server session changed."""
+    backend_pid = connection.info.backend_pid
+    registry = connection.prepared
+    if registry is None or registry.backend_pid != backend_pid:
+        if registry is not None:
+            stats.count(resets=1)
+        registry = StatementRegistry(backend_pid)
+        connection.prepared = registry
+    return registry
+
+
+def execute_prepared(cursor: Any, sql: str, params: Sequence[Any] = ()) -> None:
+    """Execute ``sql`` with ``params`` on ``cursor``, as a prepared statement where possible.
+
+    Results are read from the cursor as usual. Only positional ``%s`` parameters are
+    supported; queries with named parameters or a literal ``%`` run unprepared.
+    """
+    connection = getattr(cursor, 'connection', None)
+    if (not isinstance(connection, PooledConnection) or not enabled()
+            or '%(' in sql or sql.count('%') != sql.count('%s')):
+        stats.count(unprepared=1)
+        cursor.execute(sql, params)
+        return
+
+    registry = registry_for(connection)
+    name = registry.names.get(sql)
+    if name is None and len(registry.names) >= MAX_STATEMENTS:
+        stats.count(unprepared=1)
+        cursor.execute(sql, params)
+        return
+
+    at_transaction_start = connection.info.transaction_status == extensions.TRANSACTION_STATUS_IDLE
+    try:
+        _execute(cursor, registry, name, sql, params)
+    except errors.InvalidSqlStatementName:
+        # The session lost its statements (e.g. DISCARD ALL); forget them and prepare again.
+        connection.prepared = None
+        stats.count(resets=1)
+        if not at_transaction_start:
+            raise
+        connection.rollback()
+        _execute(cursor, registry_for(connection), None, sql, params)
+
+
+def _execute(cursor: Any, registry: StatementRegistry, name: Optional[str], sql: str, params: Sequence[Any]) -> None:
+    hit = name is not None
+    if name is None:
+        name = registry.add(sql)
+        try:
+            cursor.execute(f'PREPARE {name} AS {to_server_placeholders(sql)}')
+        except psycopg2.Error:
+            del registry.names[sql], registry.queries[name]
+            raise
+        stats.count(prepares=1)
+    arguments = f" ({', '.join(['%s'] * len(params))})" if params else ''
+    cursor.execute(f'EXECUTE {name}{arguments}', tuple(params))
+    stats.count(executions=1, hits=int(hit))
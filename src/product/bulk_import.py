@@ -0,0 +1,257 @@
+"""Bulk CSV import for Dry Storage Item and Food Item.
+
+Rows are validated in a single streaming pass and fed straight into
+``COPY ... FROM STDIN``, so a supplier catalog is loaded in one statement
+without holding the file in memory. Rows that fail validation are skipped
+and reported with their line number and reason.
+"""
+
+import _csv
+import argparse
+import csv
+import datetime
+import io
+import sys
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, TextIO, Tuple
+from src.db_engine import DBEngine
+
+COPY_CHUNK_SIZE = 65536
+TRUE_VALUES = {'yes', 'y', 'true', 't', '1'}
+FALSE_VALUES = {'no', 'n', 'false', 'f', '0'}
+
+
+def _parse_text(value: str) -> Optional[str]:
+    return value.strip() or None
+
+
+def _parse_required_text(value: str) -> str:
+    value = value.strip()
+    if not value:
+        raise ValueError("value is required")
+    return value
+
+
+def _parse_amount(value: str) -> int:
+    number = int(value.strip())
+    if number < 0:
+        raise ValueError("must not be negative")
+    return number
+
+
+def _parse_bool(value: str) -> bool:
+    lowered = value.strip().lower()
+    if lowered in TRUE_VALUES:
+        return True
+    if lowered in FALSE_VALUES:
+        return False
+    raise ValueError("expected yes/no")
+
+
+def _parse_date(value: str) -> datetime.date:
+    return datetime.date.fromisoformat(value.strip())
+
+
+Field = Tuple[str, str, Callable[[str], Any]]
+
+DRY_STORAGE_FIELDS: Sequence[Field] = (
+    ("Name", "name", _parse_required_text),
+    ("Amount", "amount", _parse_amount),
+    ("Price", "price", _parse_amount),
+    ("RecipeItem", "recipe_item", _parse_bool),
+    ("Chemical", "chemical", _parse_bool),
+    ("PackageType", "package_type", _parse_text),
+)
+
+FOOD_FIELDS: Sequence[Field] = (
+    ("Name", "name", _parse_required_text),
+    ("Amount", "amount", _parse_amount),
+    ("Price", "price", _parse_amount),
+    ("StorageCondition", "storage_condition", _parse_text),
+    ("ExpiryDate", "expiry_date", _parse_date),
+)
+
+TABLES: Dict[str, Tuple[str, Sequence[Field]]] = {
+    'dry': ('"Dry Storage Item"', DRY_STORAGE_FIELDS),
+    'food': ('"Food Item"', FOOD_FIELDS),
+}
+
+
+class ImportReport:
+    """Outcome of a bulk import.
+
+    Attributes:
+        accepted (int): Number of rows loaded into the table.
+        rejected_count (int): Number of rows skipped because they failed validation.
+        rejected (List[Tuple[int, str]]): Line number and reason of the first ``max_kept`` rejected rows.
+        elapsed (float): Wall time of the import in seconds.
+    """
+
+    def __init__(self, max_kept: int = 1000) -> None:
+        self.accepted = 0
+        self.rejected_count = 0
+        self.rejected: List[Tuple[int, str]] = []
+        self.elapsed = 0.0
+        self.max_kept = max_kept
+
+    def reject(self, line_number: int, reason: str) -> None:
+        """Record a rejected row."""
+        self.rejected_count += 1
+        if len(self.rejected) < self.max_kept:
+            self.rejected.append((line_number, reason))
+
+    @property
+    def rows_per_second(self) -> float:
+        """Throughput of accepted rows."""
+        return self.accepted / self.elapsed if self.elapsed > 0 else 0.0
+
+    def __str__(self) -> str:
+        return (f"Imported {self.accepted} rows, rejected {self.rejected_count} rows "
+                f"in {self.elapsed:.2f}s ({self.rows_per_second:.0f} rows/s)")
+
+
+class _CopyStream(io.TextIOBase):
+    """Read-only text stream that renders validated rows as CSV on demand for COPY.
+
+    psycopg2 sends whatever ``read`` returns, so each call renders rows until
+    roughly ``size`` characters are buffered rather than slicing exact chunks.
+    """
+
+    def __init__(self, rows: Iterator[Sequence[Any]]) -> None:
+        self._rows = rows
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer, lineterminator='\n')
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: Optional[int] = -1) -> str:
+        limit = sys.maxsize if size is None or size < 0 else size
+        writerow = self._writer.writerow
+        for row in self._rows:
+            writerow(row)
+            if self._buffer.tell() >= limit:
+                break
+        chunk = self._buffer.getvalue()
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return chunk
+
+
+def _resolve_columns(header: Sequence[str], fields: Sequence[Field]) -> List[int]:
+    """Map every field to its column index in the CSV header.
+
+    Headers may use either the database column name ("RecipeItem") or the
+    attribute name ("recipe_item"), case-insensitively.
+    """
+    positions = {name.strip().lower(): index for index, name in enumerate(header)}
+    indexes = []
+    for column, attribute, _ in fields:
+        index = positions.get(column.lower(), positions.get(attribute))
+        if index is None:
+            raise ValueError(f"CSV header is missing the '{column}' column.")
+        indexes.append(index)
+    return indexes
+
+
+def validate_rows(reader: '_csv._reader', indexes: Sequence[int], fields: Sequence[Field],
+                  report: ImportReport, rejects: Optional[Any] = None) -> Iterator[Tuple[Any, ...]]:
+    """Yield parsed rows from a CSV reader, recording rows that fail validation.
+
+    Rejected rows are reported with the file line their record starts on, which
+    differs from the record count once a quoted field spans several lines.
+
+    :param reader: csv.reader positioned after the header row.
+    :param indexes: Column index of every field, as returned by _resolve_columns.
+    :param fields: Column definitions of the target table.
+    :param report: Report that receives accepted and rejected counts.
+    :param rejects: Optional csv.writer that receives every rejected row plus its reason.
+    """
+    checks = [(index, column, parser) for index, (column, _, parser) in zip(indexes, fields)]
+    width = max(indexes) + 1
+    last_line = reader.line_num
+    for row in reader:
+        line_number, last_line = last_line + 1, reader.line_num
+        if not row:
+            continue
+        try:
+            if len(row) < width:
+                raise ValueError(f"expected at least {width} columns, got {len(row)}")
+            values = []
+            for index, column, parser in checks:
+                try:
+                    values.append(parser(row[index]))
+                except ValueError as e:
+                    raise ValueError(f"{column}: {e}") from None
+        except ValueError as e:
+            report.reject(line_number, str(e))
+            if rejects is not None:
+                rejects.writerow(row + [str(e)])
+            continue
+        report.accepted += 1
+        yield tuple(values)
+
+
+def bulk_import_csv(kind: str, source: TextIO, rejects_file: Optional[TextIO] = None) -> ImportReport:
+    """Stream a CSV of products into the database with COPY FROM STDIN.
+
+    The whole file is loaded in one transaction; if COPY fails nothing is imported.
+
+    :param kind: 'dry' for Dry Storage Items or 'food' for Food Items.
+    :param source: Open CSV text stream whose first row is the header.
+    :param rejects_file: Optional text stream that receives rejected rows as CSV.
+    :return: ImportReport with accepted and rejected counts.
+    :raises ValueError: If the kind is unknown or the header lacks a required column.
+    """
+    if kind not in TABLES:
+        raise ValueError(f"Unknown item kind '{kind}', expected one of {sorted(TABLES)}.")
+    table, fields = TABLES[kind]
+    report = ImportReport()
+    reader = csv.reader(source)
+    header = next(reader, None)
+    if header is None:
+        return report
+    indexes = _resolve_columns(header, fields)
+    rejects = csv.writer(rejects_file) if rejects_file is not None else None
+    columns = ', '.join(f'"{column}"' for column, _, _ in fields)
+    started = time.perf_counter()
+
+    with DBEngine() as db:
+        if db.connection is None or db.cursor is None:
+            print("Database connection error.")
+            return report
+
+        stream = _CopyStream(validate_rows(reader, indexes, fields, report, rejects))
+        db.cursor.copy_expert(f'COPY {table} ({columns}) FROM STDIN WITH (FORMAT csv)', stream,
+                              size=COPY_CHUNK_SIZE)
+        db.connection.commit()
+
+    report.elapsed = time.perf_counter() - started
+    return report
+
+
+def import_csv_file(kind: str, path: str, rejects_path: Optional[str] = None) -> ImportReport:
+    """Import a CSV file from disk, optionally writing rejected rows to ``rejects_path``."""
+    with open(path, newline='', encoding='utf-8-sig') as source:
+        if rejects_path is None:
+            return bulk_import_csv(kind, source)
+        with open(rejects_path, 'w', newline='', encoding='utf-8') as rejects_file:
+            return bulk_import_csv(kind, source, rejects_file)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Command line entry point: ``python -m src.product.bulk_import {dry,food} FILE``."""
+    parser = argparse.ArgumentParser(description="Bulk import products from a CSV file.")
+    parser.add_argument('kind', choices=sorted(TABLES), help="Product table to load.")
+    parser.add_argument('path', help="CSV file with a header row.")
+    parser.add_argument('--rejects', help="Write rejected rows and their reasons to this CSV file.")
+    args = parser.parse_args(argv)
+
+    report = import_csv_file(args.kind, args.path, args.rejects)
+    print(report)
+    for line_number, reason in report.rejected[:20]:
+        print(f"  line {line_number}: {reason}")
+
+
+if __name__ == '__main__':
+    main()
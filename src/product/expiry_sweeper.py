@@ -0,0 +1,184 @@
+"""Background job that archives expired Food Items in small batches.
+
+Each batch is one short transaction that moves up to ``batch_size`` expired rows
+into "Food Item Archive" (remembering which stores carried them) and removes
+their "StoreFoodProduct" links, so locks are only held for a few milliseconds
+and the job can run while stores are trading. Every batch commits on its own:
+an interrupted sweep keeps what it archived and simply continues where it
+stopped the next time it runs.
+"""
+
+import argparse
+import datetime
+import threading
+import time
+from typing import Any, Callable, Optional, Sequence, Union
+from src.cache import IdentityMap
+from src.db_engine import DBEngine
+
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_PAUSE = 0.2
+
+# Rows locked by another transaction are skipped rather than waited on; the next sweep picks them up.
+SWEEP_BATCH_SQL = """
+    WITH batch AS (
+        SELECT "FoodItemID"
+        FROM "Food Item"
+        WHERE "ExpiryDate" < %s
+        ORDER BY "ExpiryDate", "FoodItemID"
+        LIMIT %s
+        FOR UPDATE SKIP LOCKED
+    ), links AS (
+        DELETE FROM "StoreFoodProduct" sfp
+        USING batch
+        WHERE sfp."FoodID" = batch."FoodItemID"
+        RETURNING sfp."FoodID", sfp."StoreID"
+    ), moved AS (
+        DELETE FROM "Food Item" fi
+        USING batch
+        WHERE fi."FoodItemID" = batch."FoodItemID"
+        RETURNING fi."FoodItemID", fi."Name", fi."Amount", fi."Price", fi."StorageCondition", fi."ExpiryDate"
+    )
+    INSERT INTO "Food Item Archive" ("FoodItemID", "Name", "Amount", "Price", "StorageCondition", "ExpiryDate", "StoreIDs")
+    SELECT m."FoodItemID", m."Name", m."Amount", m."Price", m."StorageCondition", m."ExpiryDate",
+           COALESCE((SELECT array_agg(l."StoreID" ORDER BY l."StoreID") FROM links l WHERE l."FoodID" = m."FoodItemID"), '{}')
+    FROM moved m
+    RETURNING "FoodItemID"
+"""
+
+
+class SweepReport:
+    """Progress of an expiry sweep.
+
+    Attributes:
+        archived (int): Number of food items moved to the archive so far.
+        batches (int): Number of committed batches.
+        elapsed (float): Wall time of the sweep in seconds, including pauses.
+        finished (bool): Whether the sweep ran out of expired items.
+    """
+
+    def __init__(self) -> None:
+        self.archived = 0
+        self.batches = 0
+        self.elapsed = 0.0
+        self.finished = False
+
+    @property
+    def rows_per_second(self) -> float:
+        """Throughput of archived rows."""
+        return self.archived / self.elapsed if self.elapsed > 0 else 0.0
+
+    def __str__(self) -> str:
+        state = "finished" if self.finished else "stopped"
+        return (f"Archived {self.archived} expired food items in {self.batches} batches, {state} "
+                f"after {self.elapsed:.2f}s ({self.rows_per_second:.0f} rows/s)")
+
+
+class ExpirySweeper:
+    """Moves food items that expired before ``cutoff`` to the archive, one throttled batch at a time.
+
+    Attributes:
+        cutoff (datetime.date): Items with an expiry date before this day are archived.
+        batch_size (int): Maximum number of items moved per transaction.
+        pause (float): Seconds to sleep between batches so other writers get the tables.
+        report (SweepReport): Progress of the current or last run.
+        cache (Optional[IdentityMap[Any]]): FoodItem identity map whose archived entries are dropped.
+    """
+
+    def __init__(self, cutoff: Optional[Union[datetime.date, str]] = None, batch_size: int = DEFAULT_BATCH_SIZE,
+                 pause: float = DEFAULT_PAUSE, engine: Callable[[], DBEngine] = DBEngine,
+                 cache: Optional[IdentityMap[Any]] = None) -> None:
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1.")
+        self.cutoff = cutoff or datetime.date.today()
+        self.batch_size = batch_size
+        self.pause = pause
+        self.engine = engine
+        self.cache = cache
+        self.report = SweepReport()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def sweep_batch(self) -> int:
+        """Archive one batch in its own transaction.
+
+        :return: Number of items archived; 0 once nothing expired is left.
+        """
+        with self.engine() as db:
+            if db.connection is None or db.cursor is None:
+                raise RuntimeError("Database connection or cursor is not initialized.")
+            db.cursor.execute(SWEEP_BATCH_SQL, (self.cutoff, self.batch_size))
+            archived_ids = [row[0] for row in db.cursor.fetchall()]
+            db.connection.commit()
+        if self.cache is not None:
+            for id in archived_ids:
+                self.cache.invalidate(id)
+        return len(archived_ids)
+
+    def run(self, max_batches: Optional[int] = None) -> SweepReport:
+        """Sweep until no expired items are left, ``max_batches`` is reached or stop() is called."""
+        self.report = SweepReport()
+        self._stop.clear()
+        started = time.perf_counter()
+        try:
+            while not self._stop.is_set():
+                if max_batches is not None and self.report.batches >= max_batches:
+                    break
+                archived = self.sweep_batch()
+                if archived:
+                    self.report.batches += 1
+                    self.report.archived += archived
+                if archived < self.batch_size:
+                    self.report.finished = True
+                    break
+                self._stop.wait(self.pause)
+        finally:
+            self.report.elapsed = time.perf_counter() - started
+        return self.report
+
+    def start(self, on_done: Optional[Callable[[SweepReport], None]] = None) -> threading.Thread:
+        """Run the sweep in a daemon thread and return it.
+
+        :param on_done: Called with the report when the sweep ends.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            raise RuntimeError("Sweep is already running.")
+
+        def target() -> None:
+            try:
+                report = self.run()
+            except Exception as e:
+                print(f"Error archiving expired food items: {e}")
+                return
+            if on_done is not None:
+                on_done(report)
+
+        self._thread = threading.Thread(target=target, name='expiry-sweeper', daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Ask a running sweep to stop after its current batch and wait for it."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Command line entry point: ``python -m src.product.expiry_sweeper [--before DATE]``."""
+    parser = argparse.ArgumentParser(description="Archive expired food items in small batches.")
+    parser.add_argument('--before', type=datetime.date.fromisoformat, default=None,
+                        help="Archive items expiring before this date (default: today).")
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help="Items moved per transaction.")
+    parser.add_argument('--pause', type=float, default=DEFAULT_PAUSE, help="Seconds to sleep between batches.")
+    args = parser.parse_args(argv)
+
+    sweeper = ExpirySweeper(args.before, args.batch_size, args.pause)
+    try:
+        print(sweeper.run())
+    except KeyboardInterrupt:
+        print(sweeper.report)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,10 +1,20 @@
-from typing import List, Optional, TypeVar, Type
+import datetime
+from typing import ClassVar, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple, TypeVar, Type, Union
+from psycopg2.extras import execute_values
+from src.bulk import delete_by_ids, load_by_ids
+from src.cache import IdentityMap
 from src.db_engine import DBEngine
+from src.mapping import column_list
+from src.pagination import DEFAULT_BATCH_SIZE, iter_keyset, print_paged
+from src.prepared import execute_prepared
+from src.product.bulk_import import import_csv_file
+from src.product.expiry_sweeper import ExpirySweeper
+from src.tracking import INITIAL_VERSION, ChangeTracking, VersionConflictError
 
 T = TypeVar('T', bound='Product')
 
 
-class Product:
+class Product(ChangeTracking):
     """Base class representing a product.
 
     Attributes:
@@ -12,8 +22,14 @@ class Product:
         amount (int): The amount of the product.
         price (int): The price of the product.
         id (Optional[int]): The ID of the product, if available.
+
+    Updates only write the columns changed since the item was loaded and fail with
+    VersionConflictError if the row was changed meanwhile; see src.tracking.
     """
 
+    ID_ATTRIBUTE = 'id'
+    VERSION_COLUMN = 'Version'
+
     def __init__(self, name: str, amount: int, price: int, id: Optional[int] = None) -> None:
         self.name = name
         self.amount = amount
@@ -33,11 +49,86 @@ class Product:
         """View all products in the table."""
         raise NotImplementedError("Subclass must implement abstract method")
 
+    @classmethod
+    def iter_all(cls: Type[T], batch_size: int = DEFAULT_BATCH_SIZE, after_id: Optional[int] = None) -> Iterator[T]:
+        """Iterate over all products in ID order, fetching them in batches."""
+        raise NotImplementedError("Subclass must implement abstract method")
+
     @classmethod
     def find_by_id(cls: Type[T], id: int) -> Optional[T]:
         """Find a product by ID."""
         raise NotImplementedError("Subclass must implement abstract method")
 
+    @classmethod
+    def find_by_ids(cls: Type[T], ids: Iterable[int]) -> List[T]:
+        """Find several products by ID, returned in the order the IDs were given."""
+        raise NotImplementedError("Subclass must implement abstract method")
+
+    @classmethod
+    def delete_many(cls: Type[T], ids: Iterable[int]) -> int:
+        """Delete several products by ID and return how many were deleted."""
+        raise NotImplementedError("Subclass must implement abstract method")
+
+    @classmethod
+    def adjust_stock(cls, item_id: int, delta: int) -> Optional[int]:
+        """Add ``delta`` (negative to remove) to an item's amount in a single atomic UPDATE.
+
+        The change is applied relative to the amount stored in the database, so
+        concurrent adjustments never overwrite each other.
+
+        :return: The new amount, or None if the item does not exist or the amount would go negative.
+        """
+        cls.cache.invalidate(item_id)
+        with DBEngine() as db:
+            if db.connection is None or db.cursor is None:
+                print("Database connection error.")
+                return None
+
+            db.cursor.execute(f"""
+                UPDATE "{cls.TABLE}"
+                SET "Amount" = "Amount" + %s, "Version" = "Version" + 1
+                WHERE "{cls.ID_COLUMN}" = %s AND "Amount" + %s >= 0
+                RETURNING "Amount"
+            """, (delta, item_id, delta))
+            row = db.cursor.fetchone()
+            db.connection.commit()
+            cls.cache.invalidate(item_id)
+            return row[0] if row else None
+
+    @classmethod
+    def adjust_stock_many(cls, deltas: Mapping[int, int], all_or_nothing: bool = False) -> Dict[int, int]:
+        """Apply several stock adjustments in one UPDATE ... FROM (VALUES ...) statement.
+
+        :param deltas: Item ID -> amount to add (negative to remove).
+        :param all_or_nothing: Roll back every adjustment if any item is missing or would go negative.
+        :return: Item ID -> new amount for the adjustments that were applied.
+        """
+        if not deltas:
+            return {}
+        for item_id in deltas:
+            cls.cache.invalidate(item_id)
+        with DBEngine() as db:
+            if db.connection is None or db.cursor is None:
+                print("Database connection error.")
+                return {}
+
+            # Sorted by ID so concurrent batches tend to lock rows in the same order.
+            rows = execute_values(db.cursor, f"""
+                UPDATE "{cls.TABLE}" AS item
+                SET "Amount" = item."Amount" + v.delta, "Version" = item."Version" + 1
+                FROM (VALUES %s) AS v(id, delta)
+                WHERE item."{cls.ID_COLUMN}" = v.id AND item."Amount" + v.delta >= 0
+                RETURNING item."{cls.ID_COLUMN}", item."Amount"
+            """, sorted(deltas.items()), page_size=len(deltas), fetch=True)
+            applied = {item_id: amount for item_id, amount in rows}
+            if all_or_nothing and len(applied) != len(deltas):
+                db.connection.rollback()
+                return {}
+            db.connection.commit()
+            for item_id in applied:
+                cls.cache.invalidate(item_id)
+            return applied
+
     def __str__(self) -> str:
         return f"ID: {self.id}, Name: {self.name}, Amount: {self.amount}, Price: {self.price}"
 
@@ -55,6 +146,12 @@ class DryStorageItem(Product):
         id (Optional[int]): The ID of the item, if available.
     """
 
+    TABLE = 'Dry Storage Item'
+    ID_COLUMN = 'DryStorageItemID'
+    COLUMNS = (('Name', 'name'), ('Amount', 'amount'), ('Price', 'price'), ('RecipeItem', 'recipe_item'),
+               ('Chemical', 'chemical'), ('PackageType', 'package_type'))
+    cache: ClassVar[IdentityMap['DryStorageItem']] = IdentityMap()
+
     def __init__(
             self,
             name: str,
@@ -71,37 +168,36 @@ class DryStorageItem(Product):
         self.package_type = package_type
 
     def save(self) -> None:
-        """Save a new dry storage item or update an existing item in the database."""
+        """Save a new dry storage item or write the columns changed since it was loaded."""
+        if not self.is_dirty:
+            return
+        self._invalidate_cached()
         with DBEngine() as db:
             if db.connection is None or db.cursor is None:
                 print("Database connection error.")
                 return
 
             if self.id is None:
-                db.cursor.execute("""
-                    INSERT INTO "Dry Storage Item" ("Name", "Amount", "Price", "RecipeItem", "Chemical", "PackageType")
-                    VALUES (%s, %s, %s, %s, %s, %s)
-                    RETURNING "DryStorageItemID"
-                """, (self.name, self.amount, self.price, self.recipe_item, self.chemical, self.package_type))
+                execute_prepared(db.cursor, self.SQL.insert, self.insert_params())
                 self.id = db.cursor.fetchone()[0]
+                db.connection.commit()
+                self.mark_clean(INITIAL_VERSION)
             else:
-                db.cursor.execute("""
-                    UPDATE "Dry Storage Item"
-                    SET "Name" = %s, "Amount" = %s, "Price" = %s, "RecipeItem" = %s, "Chemical" = %s, "PackageType" = %s
-                    WHERE "DryStorageItemID" = %s
-                """, (self.name, self.amount, self.price, self.recipe_item, self.chemical, self.package_type, self.id))
-            db.connection.commit()
+                self._write_update(db.connection, db.cursor)
+        self._invalidate_cached()
 
     def delete(self) -> None:
         """Delete a dry storage item from the database."""
         if self.id is not None:
+            self._invalidate_cached()
             with DBEngine() as db:
                 if db.connection is None or db.cursor is None:
                     print("Database connection error.")
                     return
 
-                db.cursor.execute('DELETE FROM "Dry Storage Item" WHERE "DryStorageItemID" = %s', (self.id,))
+                execute_prepared(db.cursor, self.SQL.delete_by_id, (self.id,))
                 db.connection.commit()
+                self._invalidate_cached()
                 self.id = None
         else:
             print("Dry Storage Item ID is not set.")
@@ -114,30 +210,50 @@ class DryStorageItem(Product):
                 print("Database connection error.")
                 return []
 
-            db.cursor.execute("""
-                SELECT "DryStorageItemID", "Name", "Amount", "Price", "RecipeItem", "Chemical", "PackageType"
-                FROM "Dry Storage Item"
-            """)
+            db.cursor.execute(cls.SQL.select)
             items = db.cursor.fetchall()
-            return [cls(name=item[1], amount=item[2], price=item[3], recipe_item=item[4], chemical=item[5], package_type=item[6], id=item[0]) for item in items]
+            return [cls.from_row(item) for item in items]
+
+    @classmethod
+    def iter_all(cls: Type['DryStorageItem'], batch_size: int = DEFAULT_BATCH_SIZE,
+                 after_id: Optional[int] = None) -> Iterator['DryStorageItem']:
+        """Iterate over all dry storage items in ID order, fetching them in keyset-paginated batches."""
+        for item in iter_keyset(DBEngine, cls.SQL.select, '"DryStorageItemID"', batch_size, after_id):
+            yield cls.from_row(item)
 
     @classmethod
     def find_by_id(cls: Type['DryStorageItem'], id: int) -> Optional['DryStorageItem']:
-        """Find a dry storage item by ID."""
+        """Find a dry storage item by ID, answering repeated lookups from the identity map."""
+        cached = cls.cache.get(id)
+        if cached is not None:
+            return cached
         with DBEngine() as db:
             if db.connection is None or db.cursor is None:
                 print("Database connection error.")
                 return None
 
-            db.cursor.execute(
-                'SELECT "DryStorageItemID", "Name", "Amount", "Price", "RecipeItem", "Chemical", "PackageType" FROM "Dry Storage Item" WHERE "DryStorageItemID" = %s',
-                (id,))
+            execute_prepared(db.cursor, cls.SQL.select_by_id, (id,))
             item = db.cursor.fetchone()
             if item:
-                return cls(name=item[1], amount=item[2], price=item[3], recipe_item=item[4], chemical=item[5], package_type=item[6], id=item[0])
+                found = cls.from_row(item)
+                cls.cache.put(id, found)
+                return found
             else:
                 return None
 
+    @classmethod
+    def find_by_ids(cls: Type['DryStorageItem'], ids: Iterable[int]) -> List['DryStorageItem']:
+        """Find dry storage items by ID in one round trip, returned in the order the IDs were given.
+
+        IDs that do not exist are skipped and items already in the identity map are not read again.
+        """
+        return load_by_ids(DBEngine, cls.SQL.select, '"DryStorageItemID"', ids, cls.from_row, cls.cache)
+
+    @classmethod
+    def delete_many(cls: Type['DryStorageItem'], ids: Iterable[int]) -> int:
+        """Delete dry storage items by ID in one transaction and return how many were deleted."""
+        return delete_by_ids(DBEngine, '"Dry Storage Item"', '"DryStorageItemID"', ids, cls.cache)
+
 
 class FoodItem(Product):
     """Class representing a food item.
@@ -151,6 +267,12 @@ class FoodItem(Product):
         id (Optional[int]): The ID of the item, if available.
     """
 
+    TABLE = 'Food Item'
+    ID_COLUMN = 'FoodItemID'
+    COLUMNS = (('Name', 'name'), ('Amount', 'amount'), ('Price', 'price'), ('StorageCondition', 'storage_condition'),
+               ('ExpiryDate', 'expiry_date'))
+    cache: ClassVar[IdentityMap['FoodItem']] = IdentityMap()
+
     def __init__(
             self,
             name: str,
@@ -165,37 +287,36 @@ class FoodItem(Product):
         self.expiry_date = expiry_date
 
     def save(self) -> None:
-        """Save a new food item or update an existing item in the database."""
+        """Save a new food item or write the columns changed since it was loaded."""
+        if not self.is_dirty:
+            return
+        self._invalidate_cached()
         with DBEngine() as db:
             if db.connection is None or db.cursor is None:
                 print("Database connection error.")
                 return
 
             if self.id is None:
-                db.cursor.execute("""
-                    INSERT INTO "Food Item" ("Name", "Amount", "Price", "StorageCondition", "ExpiryDate")
-                    VALUES (%s, %s, %s, %s, %s)
-                    RETURNING "FoodItemID"
-                """, (self.name, self.amount, self.price, self.storage_condition, self.expiry_date))
+                execute_prepared(db.cursor, self.SQL.insert, self.insert_params())
                 self.id = db.cursor.fetchone()[0]
+                db.connection.commit()
+                self.mark_clean(INITIAL_VERSION)
             else:
-                db.cursor.execute("""
-                    UPDATE "Food Item"
-                    SET "Name" = %s, "Amount" = %s, "Price" = %s, "StorageCondition" = %s, "ExpiryDate" = %s
-                    WHERE "FoodItemID" = %s
-                """, (self.name, self.amount, self.price, self.storage_condition, self.expiry_date, self.id))
-            db.connection.commit()
+                self._write_update(db.connection, db.cursor)
+        self._invalidate_cached()
 
     def delete(self) -> None:
         """Delete a food item from the database."""
         if self.id is not None:
+            self._invalidate_cached()
             with DBEngine() as db:
                 if db.connection is None or db.cursor is None:
                     print("Database connection error.")
                     return
 
-                db.cursor.execute('DELETE FROM "Food Item" WHERE "FoodItemID" = %s', (self.id,))
+                execute_prepared(db.cursor, self.SQL.delete_by_id, (self.id,))
                 db.connection.commit()
+                self._invalidate_cached()
                 self.id = None
         else:
             print("Food Item ID is not set.")
@@ -208,30 +329,84 @@ class FoodItem(Product):
                 print("Database connection error.")
                 return []
 
-            db.cursor.execute("""
-                SELECT "FoodItemID", "Name", "Amount", "Price", "StorageCondition", "ExpiryDate"
-                FROM "Food Item"
-            """)
+            db.cursor.execute(cls.SQL.select)
             items = db.cursor.fetchall()
-            return [cls(name=item[1], amount=item[2], price=item[3], storage_condition=item[4], expiry_date=item[5], id=item[0]) for item in items]
+            return [cls.from_row(item) for item in items]
+
+    @classmethod
+    def iter_all(cls: Type['FoodItem'], batch_size: int = DEFAULT_BATCH_SIZE,
+                 after_id: Optional[int] = None) -> Iterator['FoodItem']:
+        """Iterate over all food items in ID order, fetching them in keyset-paginated batches."""
+        for item in iter_keyset(DBEngine, cls.SQL.select, '"FoodItemID"', batch_size, after_id):
+            yield cls.from_row(item)
 
     @classmethod
     def find_by_id(cls: Type['FoodItem'], id: int) -> Optional['FoodItem']:
-        """Find a food item by ID."""
+        """Find a food item by ID, answering repeated lookups from the identity map."""
+        cached = cls.cache.get(id)
+        if cached is not None:
+            return cached
         with DBEngine() as db:
             if db.connection is None or db.cursor is None:
                 print("Database connection error.")
                 return None
 
-            db.cursor.execute(
-                'SELECT "FoodItemID", "Name", "Amount", "Price", "StorageCondition", "ExpiryDate" FROM "Food Item" WHERE "FoodItemID" = %s',
-                (id,))
+            execute_prepared(db.cursor, cls.SQL.select_by_id, (id,))
             item = db.cursor.fetchone()
             if item:
-                return cls(name=item[1], amount=item[2], price=item[3], storage_condition=item[4], expiry_date=item[5], id=item[0])
+                found = cls.from_row(item)
+                cls.cache.put(id, found)
+                return found
             else:
                 return None
 
+    @classmethod
+    def find_by_ids(cls: Type['FoodItem'], ids: Iterable[int]) -> List['FoodItem']:
+        """Find food items by ID in one round trip, returned in the order the IDs were given.
+
+        IDs that do not exist are skipped and items already in the identity map are not read again.
+        """
+        return load_by_ids(DBEngine, cls.SQL.select, '"FoodItemID"', ids, cls.from_row, cls.cache)
+
+    @classmethod
+    def delete_many(cls: Type['FoodItem'], ids: Iterable[int]) -> int:
+        """Delete food items by ID in one transaction and return how many were deleted."""
+        return delete_by_ids(DBEngine, '"Food Item"', '"FoodItemID"', ids, cls.cache)
+
+    @classmethod
+    def expiring_between(cls: Type['FoodItem'], start: Union[datetime.date, str], end: Union[datetime.date, str],
+                         store_id: Optional[int] = None) -> List['FoodItem']:
+        """Find food items whose expiry date falls between start and end (inclusive), soonest first.
+
+        Without a store the range is read from the "ExpiryDate" index; with a store the
+        items are reached through that store's "StoreFoodProduct" links.
+
+        :param start: First expiry date to include.
+        :param end: Last expiry date to include.
+        :param store_id: Only return items stocked by this store.
+        """
+        with DBEngine() as db:
+            if db.connection is None or db.cursor is None:
+                print("Database connection error.")
+                return []
+
+            if store_id is None:
+                db.cursor.execute(f"""
+                    {cls.SQL.select}
+                    WHERE "ExpiryDate" BETWEEN %s AND %s
+                    ORDER BY "ExpiryDate", "FoodItemID"
+                """, (start, end))
+            else:
+                db.cursor.execute(f"""
+                    SELECT {column_list(cls, 'fi')}
+                    FROM "StoreFoodProduct" sfp
+                    JOIN "Food Item" fi ON fi."FoodItemID" = sfp."FoodID"
+                    WHERE sfp."StoreID" = %s AND fi."ExpiryDate" BETWEEN %s AND %s
+                    ORDER BY fi."ExpiryDate", fi."FoodItemID"
+                """, (store_id, start, end))
+            items = db.cursor.fetchall()
+            return [cls.from_row(item) for item in items]
+
 
 def manage_items_menu() -> None:
     """Item management menu with options for Dry Storage and Food Items."""
@@ -261,9 +436,11 @@ def manage_dry_storage_items() -> None:
         print("2. Edit Dry Storage Item")
         print("3. Delete Dry Storage Item")
         print("4. View All Dry Storage Items")
-        print("5. Back")
+        print("5. Import Dry Storage Items from CSV")
+        print("6. Adjust Dry Storage Item Stock")
+        print("7. Back")
 
-        choice = input("Enter your choice (1-5): ")
+        choice = input("Enter your choice (1-7): ")
 
         if choice == '1':
             add_dry_storage_item()
@@ -274,9 +451,13 @@ def manage_dry_storage_items() -> None:
         elif choice == '4':
             view_all_dry_storage_items()
         elif choice == '5':
+            import_dry_storage_items()
+        elif choice == '6':
+            adjust_dry_storage_item_stock()
+        elif choice == '7':
             break
         else:
-            print("Invalid choice, please select between 1 and 5.")
+            print("Invalid choice, please select between 1 and 7.")
 
 
 def manage_food_items() -> None:
@@ -287,9 +468,13 @@ def manage_food_items() -> None:
         print("2. Edit Food Item")
         print("3. Delete Food Item")
         print("4. View All Food Items")
-        print("5. Back")
+        print("5. Import Food Items from CSV")
+        print("6. View Food Items Expiring Soon")
+        print("7. Archive Expired Food Items")
+        print("8. Adjust Food Item Stock")
+        print("9. Back")
 
-        choice = input("Enter your choice (1-5): ")
+        choice = input("Enter your choice (1-9): ")
 
         if choice == '1':
             add_food_item()
@@ -300,9 +485,17 @@ def manage_food_items() -> None:
         elif choice == '4':
             view_all_food_items()
         elif choice == '5':
+            import_food_items()
+        elif choice == '6':
+            view_expiring_food_items()
+        elif choice == '7':
+            archive_expired_food_items()
+        elif choice == '8':
+            adjust_food_item_stock()
+        elif choice == '9':
             break
         else:
-            print("Invalid choice, please select between 1 and 5.")
+            print("Invalid choice, please select between 1 and 9.")
 
 
 def add_dry_storage_item() -> None:
@@ -335,7 +528,11 @@ def edit_dry_storage_item() -> None:
         item.recipe_item = recipe_item
         item.chemical = chemical
         item.package_type = package_type
-        item.save()
+        try:
+            item.save()
+        except VersionConflictError:
+            print("Dry storage item was changed by another user meanwhile. Please edit it again.")
+            return
         print("Dry storage item updated successfully.")
     else:
         print("Item not found.")
@@ -353,10 +550,19 @@ def delete_dry_storage_item() -> None:
 
 
 def view_all_dry_storage_items() -> None:
-    """View all dry storage items."""
-    items = DryStorageItem.view_all()
-    for item in items:
-        print(item)
+    """View all dry storage items one page at a time."""
+    if not print_paged(DryStorageItem.iter_all()):
+        print("No dry storage items found.")
+
+
+def adjust_dry_storage_item_stock() -> None:
+    """Prompt for ID and a stock change, then apply it atomically."""
+    adjust_item_stock(DryStorageItem)
+
+
+def import_dry_storage_items() -> None:
+    """Prompt for a CSV file and bulk import dry storage items from it."""
+    import_items_from_csv('dry')
 
 
 def add_food_item() -> None:
@@ -386,7 +592,11 @@ def edit_food_item() -> None:
         item.price = price
         item.storage_condition = storage_condition
         item.expiry_date = expiry_date
-        item.save()
+        try:
+            item.save()
+        except VersionConflictError:
+            print("Food item was changed by another user meanwhile. Please edit it again.")
+            return
         print("Food item updated successfully.")
     else:
         print("Item not found.")
@@ -404,7 +614,59 @@ def delete_food_item() -> None:
 
 
 def view_all_food_items() -> None:
-    """View all food items."""
-    items = FoodItem.view_all()
-    for item in items:
-        print(item)
+    """View all food items one page at a time."""
+    if not print_paged(FoodItem.iter_all()):
+        print("No food items found.")
+
+
+def view_expiring_food_items() -> None:
+    """Prompt for a number of days and an optional store, then list the food items expiring in that window."""
+    days = int(input("Show items expiring within how many days? (default: 7): ") or 7)
+    store_input = input("Enter store ID (leave empty for all stores): ").strip()
+    store_id = int(store_input) if store_input else None
+    today = datetime.date.today()
+    items = FoodItem.expiring_between(today, today + datetime.timedelta(days=days), store_id)
+    if not print_paged(items, render=lambda item: f"{item}, Expiry Date: {item.expiry_date}"):
+        print("No food items expire in that period.")
+
+
+def archive_expired_food_items() -> None:
+    """Start archiving food items that expired before today in the background."""
+    sweeper = ExpirySweeper(cache=FoodItem.cache)
+    sweeper.start(on_done=lambda report: print(f"\n{report}"))
+    print("Archiving expired food items in the background.")
+
+
+def adjust_food_item_stock() -> None:
+    """Prompt for ID and a stock change, then apply it atomically."""
+    adjust_item_stock(FoodItem)
+
+
+def import_food_items() -> None:
+    """Prompt for a CSV file and bulk import food items from it."""
+    import_items_from_csv('food')
+
+
+def adjust_item_stock(item_class: Type[Product]) -> None:
+    """Prompt for an item ID and amount change and apply it without reading the item first."""
+    id = int(input("Enter the ID of the item: "))
+    delta = int(input("Enter stock change (e.g. 5 to add, -3 to remove): "))
+    amount = item_class.adjust_stock(id, delta)
+    if amount is None:
+        print("Item not found or not enough stock.")
+    else:
+        print(f"Stock updated, new amount: {amount}.")
+
+
+def import_items_from_csv(kind: str) -> None:
+    """Prompt for a CSV path and an optional rejects file, then run the bulk import."""
+    path = input("Enter CSV file path: ").strip()
+    rejects_path = input("Enter path for rejected rows (leave empty to skip): ").strip() or None
+    try:
+        report = import_csv_file(kind, path, rejects_path)
+    except Exception as e:
+        print(f"Error importing items: {e}")
+        return
+    print(report)
+    for line_number, reason in report.rejected[:20]:
+        print(f"Line {line_number}: {reason}")
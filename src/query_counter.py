@@ -0,0 +1,171 @@
+"""Count the database work done inside a block and flag N+1 query patterns.
+
+``count_queries()`` works as a context manager or a decorator::
+
+    with count_queries() as counter:
+        edit_store()
+    counter.assert_budget(connections=1, statements=2)
+
+While it is active, every DBEngine created on the same thread is counted as a
+connection and its cursor counts each statement, and each round trip to the
+server, by fingerprint (see src.query_log). A fingerprint executed
+``n_plus_one_threshold`` times or more is reported as a possible N+1 pattern:
+the same query issued once per row instead of once for all of them. Counters
+nest; an inner block is also counted by the outer ones. Each time a block is
+entered its counter starts again from zero.
+
+Outside of a counted block, DBEngine cursors are not wrapped, so this costs
+nothing in normal runs.
+"""
+
+import contextlib
+import logging
+import threading
+from collections import Counter
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+from src.query_log import statement_fingerprint
+
+logger = logging.getLogger(__name__)
+
+# Executions of one statement shape inside a block from which it is reported as N+1.
+N_PLUS_ONE_THRESHOLD = 3
+
+_local = threading.local()
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised by QueryCounter.assert_budget when a block did more database work than allowed."""
+
+
+def active_counters() -> List['QueryCounter']:
+    """Return the counters active on the current thread, outermost first."""
+    stack: Optional[List[QueryCounter]] = getattr(_local, 'counters', None)
+    return stack if stack is not None else []
+
+
+class QueryCounter(contextlib.ContextDecorator):
+    """Database work done while the counter is active on its thread.
+
+    Attributes:
+        connections (int): DBEngine instances created, i.e. connections borrowed from the pool.
+        statements (int): Statements executed, not counting the PREPARE behind prepared ones.
+        round_trips (int): Requests sent to the server; ``executemany`` sends one per parameter set.
+        shapes (Counter): Statement fingerprint -> number of executions.
+    """
+
+    def __init__(self, n_plus_one_threshold: int = N_PLUS_ONE_THRESHOLD, label: Optional[str] = None,
+                 warn: bool = True) -> None:
+        """Create an inactive counter.
+
+        :param n_plus_one_threshold: Executions of one shape from which it is reported as N+1.
+        :param label: Name of the counted action used in log messages.
+        :param warn: Log a warning for each N+1 pattern when the block exits.
+        """
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.label = label
+        self.warn = warn
+        self.reset()
+
+    def reset(self) -> None:
+        """Set every count back to zero."""
+        self.connections = 0
+        self.statements = 0
+        self.round_trips = 0
+        self.shapes: Counter[str] = Counter()
+
+    def __enter__(self) -> 'QueryCounter':
+        if not hasattr(_local, 'counters'):
+            _local.counters = []
+        if self not in _local.counters:
+            self.reset()
+        _local.counters.append(self)
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        _local.counters.remove(self)
+        if self.warn:
+            for shape, count in self.n_plus_one().items():
+                logger.warning("Possible N+1 in %s: %d executions of %s", self.label or "counted block", count, shape)
+
+    def n_plus_one(self) -> Dict[str, int]:
+        """Return the statement shapes executed at least ``n_plus_one_threshold`` times."""
+        return {shape: count for shape, count in self.shapes.items() if count >= self.n_plus_one_threshold}
+
+    def assert_budget(self, connections: Optional[int] = None, statements: Optional[int] = None,
+                      round_trips: Optional[int] = None, allow_n_plus_one: bool = False) -> None:
+        """Fail if the counted block exceeded any of the given limits.
+
+        :raises QueryBudgetExceeded: Listing every limit that was exceeded.
+        """
+        problems = [f"{name}: {actual} > {limit}"
+                    for name, actual, limit in (('connections', self.connections, connections),
+                                                ('statements', self.statements, statements),
+                                                ('round trips', self.round_trips, round_trips))
+                    if limit is not None and actual > limit]
+        if not allow_n_plus_one:
+            problems.extend(f"N+1: {count} x {shape}" for shape, count in self.n_plus_one().items())
+        if problems:
+            raise QueryBudgetExceeded(f"{self.label or 'Counted block'} exceeded its query budget: "
+                                      + "; ".join(problems))
+
+    def __str__(self) -> str:
+        return f"{self.connections} connections, {self.statements} statements, {self.round_trips} round trips"
+
+
+def count_queries(n_plus_one_threshold: int = N_PLUS_ONE_THRESHOLD, label: Optional[str] = None,
+                  warn: bool = True) -> QueryCounter:
+    """Create a QueryCounter to use as a context manager or a decorator.
+
+    Counting starts from zero each time a block is entered, so the counter of
+    ``@count_queries()`` holds the counts of the latest call of the decorated function.
+    """
+    return QueryCounter(n_plus_one_threshold, label, warn)
+
+
+def connection_borrowed() -> None:
+    """Count a connection borrowed by a DBEngine in every active counter."""
+    for counter in active_counters():
+        counter.connections += 1
+
+
+def _record(cursor: Any, query: Any, round_trips: int) -> None:
+    shape = statement_fingerprint(cursor, query)
+    prepare = shape.startswith('PREPARE ')
+    for counter in active_counters():
+        counter.round_trips += round_trips
+        if not prepare:
+            counter.statements += 1
+            counter.shapes[shape] += 1
+
+
+class CountingCursor:
+    """Cursor proxy counting the statements executed through it in the active counters.
+
+    Everything other than ``execute`` and ``executemany`` is passed on to the wrapped cursor.
+    """
+
+    def __init__(self, cursor: Any) -> None:
+        self._cursor = cursor
+
+    def execute(self, query: Any, vars: Optional[Any] = None) -> None:
+        """Count the statement, then execute it on the wrapped cursor."""
+        _record(self._cursor, query, 1)
+        self._cursor.execute(query, vars)
+
+    def executemany(self, query: Any, vars_list: Sequence[Any]) -> None:
+        """Count the statement once per parameter set, then execute it on the wrapped cursor."""
+        vars_list = list(vars_list)
+        _record(self._cursor, query, len(vars_list))
+        self._cursor.executemany(query, vars_list)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._cursor, name)
+
+    def __iter__(self) -> Iterator[Tuple[Any, ...]]:
+        return iter(self._cursor)
+
+    def __enter__(self) -> 'CountingCursor':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._cursor.close()
@@ -0,0 +1,234 @@
+"""Per-statement timing, in-process query statistics and the slow-query log.
+
+With ``DB_QUERY_STATS=1`` every DBEngine cursor is an InstrumentedCursor, which
+times each statement and records it under a fingerprint: the statement text with
+literals and parameters replaced by ``?``, lists and VALUES rows collapsed and
+whitespace normalized, so ``WHERE "WorkerID" = 7`` and ``= 8`` count as one
+statement. Statements run through ``src.prepared`` are recorded under the query
+they execute rather than ``EXECUTE sms_stmt_N``.
+
+For each fingerprint ``query_log`` keeps call, error and row counts, total and
+maximum time and a latency histogram. Statements slower than
+``DB_SLOW_QUERY_MS`` (default 200) are also written, as fingerprints without
+their parameters, to the ``src.query_log.slow`` logger and, if
+``DB_SLOW_QUERY_LOG`` names a file, to that file.
+
+When ``DB_QUERY_STATS`` is off, DBEngine hands out plain psycopg2 cursors and
+nothing here runs.
+"""
+
+import functools
+import logging
+import os
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from psycopg2 import extensions
+
+# Upper bounds in milliseconds of the latency histogram buckets; slower statements go in a last, open bucket.
+HISTOGRAM_BOUNDS_MS = (1, 5, 10, 50, 100, 500, 1000, 5000)
+
+slow_logger = logging.getLogger(f'{__name__}.slow')
+
+_COMMENTS = re.compile(r'--[^\n]*|/\*.*?\*/', re.S)
+_STRINGS = re.compile(r"'(?:[^']|'')*'")
+_PARAMETERS = re.compile(r'%\(\w+\)s|%s|\$\d+')
+_NUMBERS = re.compile(r'(?<![\w"$.])-?\d+(?:\.\d+)?(?![\w"])')
+_LISTS = re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)')
+_ROWS = re.compile(r'\(\?\)(?:\s*,\s*\(\?\))+')
+_ARRAYS = re.compile(r'ARRAY\[[^\]]*\]', re.I)
+_WHITESPACE = re.compile(r'\s+')
+_EXECUTE = re.compile(r'\s*EXECUTE\s+(\w+)', re.I)
+
+
+def enabled() -> bool:
+    """Whether DBEngine cursors are instrumented, per the DB_QUERY_STATS environment variable."""
+    return os.getenv('DB_QUERY_STATS', '0').strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+@functools.lru_cache(maxsize=1024)
+def fingerprint(sql: str) -> str:
+    """Return the normalized shape of a statement, identical for every parameter value."""
+    shape = _COMMENTS.sub(' ', sql)
+    shape = _STRINGS.sub('?', shape)
+    shape = _PARAMETERS.sub('?', shape)
+    shape = _NUMBERS.sub('?', shape)
+    shape = _ARRAYS.sub('ARRAY[?]', shape)
+    shape = _LISTS.sub('(?)', shape)
+    shape = _ROWS.sub('(?)', shape)
+    return _WHITESPACE.sub(' ', shape).strip()
+
+
+class QueryStats:
+    """Aggregated timings of the statements sharing one fingerprint.
+
+    Attributes:
+        calls (int): Statements executed, including failed ones.
+        errors (int): Statements that raised.
+        rows (int): Rows returned or affected in total.
+        total_seconds (float): Time spent in the database, including the round trip.
+        max_seconds (float): Slowest single execution.
+        histogram (List[int]): Executions per HISTOGRAM_BOUNDS_MS bucket, plus one for slower ones.
+    """
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.errors = 0
+        self.rows = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.histogram = [0] * (len(HISTOGRAM_BOUNDS_MS) + 1)
+
+    def add(self, seconds: float, rows: int, failed: bool) -> None:
+        """Count one execution."""
+        self.calls += 1
+        self.errors += int(failed)
+        self.rows += rows
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        milliseconds = seconds * 1000
+        bucket = next((i for i, bound in enumerate(HISTOGRAM_BOUNDS_MS) if milliseconds <= bound),
+                      len(HISTOGRAM_BOUNDS_MS))
+        self.histogram[bucket] += 1
+
+    @property
+    def mean_seconds(self) -> float:
+        """Average execution time."""
+        return self.total_seconds / self.calls if self.calls else 0.0
+
+    def percentile_ms(self, percentile: float) -> Optional[float]:
+        """Upper bound in milliseconds of the bucket holding the given percentile (0-100).
+
+        None means the percentile falls among the executions slower than the last bound.
+        """
+        wanted = self.calls * percentile / 100
+        seen = 0
+        for bound, count in zip(HISTOGRAM_BOUNDS_MS, self.histogram):
+            seen += count
+            if seen >= wanted:
+                return float(bound)
+        return None
+
+    def copy(self) -> 'QueryStats':
+        """Return an independent copy of the counters."""
+        copied = QueryStats()
+        copied.__dict__.update(self.__dict__, histogram=list(self.histogram))
+        return copied
+
+
+class QueryLog:
+    """Process-wide per-fingerprint statistics and slow-query reporting.
+
+    Attributes:
+        slow_threshold (float): Seconds from which a statement is logged as slow.
+    """
+
+    def __init__(self, slow_threshold: Optional[float] = None) -> None:
+        if slow_threshold is None:
+            slow_threshold = float(os.getenv('DB_SLOW_QUERY_MS', '200')) / 1000
+        self.slow_threshold = slow_threshold
+        self._stats: Dict[str, QueryStats] = {}
+        self._lock = threading.Lock()
+        self._file_handler: Optional[logging.Handler] = None
+        log_file = os.getenv('DB_SLOW_QUERY_LOG')
+        if log_file:
+            self.log_to_file(log_file)
+
+    def record(self, statement: str, seconds: float, rows: int = 0, failed: bool = False) -> None:
+        """Count an execution of a statement with the given fingerprint."""
+        with self._lock:
+            stats = self._stats.get(statement)
+            if stats is None:
+                stats = self._stats[statement] = QueryStats()
+            stats.add(seconds, rows, failed)
+        if seconds >= self.slow_threshold:
+            slow_logger.warning("Slow query (%.1f ms, %d rows%s): %s",
+                                seconds * 1000, rows, ', failed' if failed else '', statement)
+
+    def log_to_file(self, path: str) -> None:
+        """Also append slow queries to the given file, replacing a file set earlier."""
+        handler = logging.FileHandler(path, encoding='utf-8')
+        handler.setFormatter(logging.Formatter('%(asctime)s %(message)s'))
+        if self._file_handler is not None:
+            slow_logger.removeHandler(self._file_handler)
+            self._file_handler.close()
+        slow_logger.addHandler(handler)
+        self._file_handler = handler
+
+    def snapshot(self) -> Dict[str, QueryStats]:
+        """Return a copy of the statistics of every fingerprint seen so far."""
+        with self._lock:
+            return {statement: stats.copy() for statement, stats in self._stats.items()}
+
+    def top(self, limit: int = 10) -> List[Tuple[str, QueryStats]]:
+        """Return the fingerprints that took the most time in total, slowest first."""
+        return sorted(self.snapshot().items(), key=lambda item: item[1].total_seconds, reverse=True)[:limit]
+
+    def reset(self) -> None:
+        """Forget every statistic collected so far."""
+        with self._lock:
+            self._stats.clear()
+
+    def report(self, limit: int = 10) -> None:
+        """Print the statements that took the most time in total."""
+        top = self.top(limit)
+        if not top:
+            print("No queries recorded. Set DB_QUERY_STATS=1 to collect them.")
+            return
+        print(f"{'Calls':>7} {'Total ms':>10} {'Mean ms':>9} {'p95 ms':>8} {'Max ms':>9} {'Rows':>8}  Statement")
+        for statement, stats in top:
+            p95 = stats.percentile_ms(95)
+            p95_text = f"{p95:.0f}" if p95 is not None else f">{HISTOGRAM_BOUNDS_MS[-1]}"
+            print(f"{stats.calls:>7} {stats.total_seconds * 1000:>10.1f} {stats.mean_seconds * 1000:>9.2f} "
+                  f"{p95_text:>8} {stats.max_seconds * 1000:>9.1f} {stats.rows:>8}  {statement}")
+
+
+query_log = QueryLog()
+
+
+class InstrumentedCursor(extensions.cursor):  # type: ignore[misc]
+    """psycopg2 cursor recording the duration and row count of every statement in ``query_log``."""
+
+    def execute(self, query: Any, vars: Optional[Any] = None) -> None:
+        """Execute a statement and record its duration and row count."""
+        started = time.perf_counter()
+        try:
+            super().execute(query, vars)
+        except Exception:
+            query_log.record(self._fingerprint(query), time.perf_counter() - started, failed=True)
+            raise
+        query_log.record(self._fingerprint(query), time.perf_counter() - started, max(self.rowcount, 0))
+
+    def executemany(self, query: Any, vars_list: Sequence[Any]) -> None:
+        """Execute a statement once per parameter set and record the total as one entry."""
+        started = time.perf_counter()
+        try:
+            super().executemany(query, vars_list)
+        except Exception:
+            query_log.record(self._fingerprint(query), time.perf_counter() - started, failed=True)
+            raise
+        query_log.record(self._fingerprint(query), time.perf_counter() - started, max(self.rowcount, 0))
+
+    def _fingerprint(self, query: Any) -> str:
+        return statement_fingerprint(self, query)
+
+
+def statement_fingerprint(cursor: Any, query: Any) -> str:
+    """Fingerprint a statement as passed to ``cursor.execute``.
+
+    Accepts text, bytes (as sent by ``execute_values``) and ``psycopg2.sql``
+    compositions. ``EXECUTE`` of a statement prepared by src.prepared is reported
+    as the query behind the name.
+    """
+    if isinstance(query, bytes):
+        query = query.decode('utf-8', 'replace')
+    elif not isinstance(query, str):
+        query = query.as_string(cursor)
+    executed = _EXECUTE.match(query)
+    if executed:
+        registry = getattr(cursor.connection, 'prepared', None)
+        prepared = registry.queries.get(executed.group(1)) if registry is not None else None
+        if isinstance(prepared, str):
+            query = prepared
+    return fingerprint(query)
@@ -0,0 +1,314 @@
+"""Unit of work that batches inserts, updates and deletes into one transaction.
+
+Model instances are registered with ``add()`` and ``delete()`` and nothing is
+sent to the database until ``flush()`` (or the end of the ``with`` block). The
+flush then issues one batched statement per table and operation, ordered so the
+foreign keys in SMS_tables.sql are always satisfied::
+
+    with Session() as session:
+        store = Store("Vilnius")
+        session.add(store)
+        for item in items:
+            session.add(item)
+            session.add_link('StoreDryProduct', StoreID=store, DryStorageID=item)
+        session.add(worker, store_id=store)
+
+Foreign keys may be given as model instances that are still pending; they are
+resolved to the generated IDs once their parent rows are inserted, and set on
+the object once the flush has committed. Updates of versioned models are
+matched on the version each object was loaded with, as in ``save()``, so a row
+changed elsewhere fails the whole flush with VersionConflictError instead of
+being overwritten.
+"""
+
+import functools
+import json
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from psycopg2.extras import Json, execute_batch, execute_values
+from src.db_engine import DBEngine
+from src.mapping import quote
+from src.tracking import INITIAL_VERSION, VersionConflictError
+
+PAGE_SIZE = 1000
+
+# Parents before children, following the foreign keys in SMS_tables.sql.
+TABLE_ORDER = ('Responsibilities', 'Store', 'Dry Storage Item', 'Food Item', 'Store Manager', 'Manager', 'Worker')
+
+LINK_TABLES: Dict[str, Tuple[str, str]] = {
+    'SM Responsibilities': ('ResponsibilityID', 'StoreManagerID'),
+    'StoreDryProduct': ('StoreID', 'DryStorageID'),
+    'StoreFoodProduct': ('StoreID', 'FoodID'),
+}
+
+# Draws the keys of a page of inserts up front; see Session._insert.
+NEXT_IDS = 'SELECT nextval(pg_get_serial_sequence(%s, %s)) FROM generate_series(1, %s)'
+
+# Dates and other values json cannot encode are sent as text and parsed by json_populate_recordset.
+_json_dumps = functools.partial(json.dumps, default=str)
+
+
+def _identity(obj: Any) -> Optional[int]:
+    value: Optional[int] = getattr(obj, obj.ID_ATTRIBUTE)
+    return value
+
+
+def _resolve(value: Any) -> Any:
+    """Turn a model instance used as a foreign key into its primary key."""
+    if hasattr(value, 'ID_ATTRIBUTE'):
+        key = _identity(value)
+        if key is None:
+            raise ValueError(f"{type(value).__name__} referenced before it was added to the session.")
+        return key
+    return value
+
+
+def _invalidate(obj: Any) -> None:
+    cache = getattr(type(obj), 'cache', None)
+    key = _identity(obj)
+    if cache is not None and key is not None:
+        cache.invalidate(key)
+
+
+def _written(obj: Any, version: Optional[int]) -> None:
+    """Keep the row version of a versioned model in step with the flushed row."""
+    if getattr(type(obj), 'VERSION_COLUMN', None) is not None:
+        obj.version = version
+
+
+class Session:
+    """Collects pending changes across model classes and writes them in one transaction.
+
+    Attributes:
+        statements (int): Number of batched statements issued by the last flush.
+    """
+
+    def __init__(self, engine: Callable[[], DBEngine] = DBEngine, page_size: int = PAGE_SIZE) -> None:
+        """Initialize an empty session.
+
+        :param engine: DBEngine factory used for the flush.
+        :param page_size: Maximum rows sent per batched statement.
+        """
+        self.engine = engine
+        self.page_size = page_size
+        self.statements = 0
+        self._new: List[Tuple[Any, Dict[str, Any]]] = []
+        self._dirty: List[Tuple[Any, Dict[str, Any]]] = []
+        self._deleted: List[Any] = []
+        self._new_links: Dict[str, List[Tuple[Any, Any]]] = {}
+        self._deleted_links: Dict[str, List[Tuple[Any, Any]]] = {}
+
+    def add(self, obj: Any, **references: Any) -> None:
+        """Register an object to be inserted (no ID yet) or updated (ID set).
+
+        :param obj: Model instance declaring TABLE, ID_COLUMN, ID_ATTRIBUTE and COLUMNS.
+        :param references: Attribute values to resolve at flush time, typically a pending
+            parent instance such as ``store_id=store``.
+        """
+        if type(obj).TABLE not in TABLE_ORDER:
+            raise ValueError(f"{type(obj).__name__} is not a mapped model.")
+        pending = self._new if _identity(obj) is None else self._dirty
+        for existing, existing_refs in pending:
+            if existing is obj:
+                existing_refs.update(references)
+                return
+        pending.append((obj, dict(references)))
+
+    def delete(self, obj: Any) -> None:
+        """Register an object to be deleted; pending inserts of the same object are dropped."""
+        self._new = [(pending, refs) for pending, refs in self._new if pending is not obj]
+        if _identity(obj) is None:
+            return
+        self._dirty = [(pending, refs) for pending, refs in self._dirty if pending is not obj]
+        if not any(existing is obj for existing in self._deleted):
+            self._deleted.append(obj)
+
+    def add_link(self, table: str, **columns: Any) -> None:
+        """Register a link row to be inserted.
+
+        Both columns are given by name and may be pending instances, e.g.
+        ``add_link('StoreDryProduct', StoreID=store, DryStorageID=item)``.
+        """
+        self._new_links.setdefault(table, []).append(self._link_values(table, columns))
+
+    def delete_link(self, table: str, **columns: Any) -> None:
+        """Register a link row to be removed."""
+        self._deleted_links.setdefault(table, []).append(self._link_values(table, columns))
+
+    @staticmethod
+    def _link_values(table: str, columns: Dict[str, Any]) -> Tuple[Any, Any]:
+        if table not in LINK_TABLES:
+            raise ValueError(f"Unknown link table '{table}'.")
+        first, second = LINK_TABLES[table]
+        if set(columns) != {first, second}:
+            raise ValueError(f"'{table}' links need exactly {first} and {second}.")
+        return columns[first], columns[second]
+
+    @property
+    def pending(self) -> int:
+        """Number of rows waiting to be flushed."""
+        links = sum(len(rows) for rows in self._new_links.values())
+        links += sum(len(rows) for rows in self._deleted_links.values())
+        return len(self._new) + len(self._dirty) + len(self._deleted) + links
+
+    def flush(self) -> None:
+        """Write every pending change in a single transaction.
+
+        Inserts run parents first and assign generated IDs back to the objects, then
+        updates, link inserts, link deletes and finally deletes children first. If any
+        statement fails the transaction is rolled back, IDs assigned during the flush
+        are cleared again and the pending changes are kept.
+
+        :raises VersionConflictError: If a versioned row was changed by someone else
+            since it was loaded; nothing is written.
+        """
+        if not self.pending:
+            return
+        self.statements = 0
+        inserted: List[Any] = []
+        versions: Dict[int, int] = {}
+        with self.engine() as db:
+            cursor = db.cursor
+            if db.connection is None or cursor is None:
+                raise RuntimeError("Database connection or cursor is not initialized.")
+            try:
+                for table in TABLE_ORDER:
+                    self._insert(cursor, [entry for entry in self._new if type(entry[0]).TABLE == table], inserted)
+                for table in TABLE_ORDER:
+                    self._update(cursor, [entry for entry in self._dirty if type(entry[0]).TABLE == table], versions)
+                for table, rows in self._new_links.items():
+                    self._insert_links(cursor, table, rows)
+                for table, rows in self._deleted_links.items():
+                    self._delete_links(cursor, table, rows)
+                for table in reversed(TABLE_ORDER):
+                    self._delete(cursor, [obj for obj in self._deleted if type(obj).TABLE == table])
+                db.connection.commit()
+            except Exception:
+                db.connection.rollback()
+                for obj in inserted:
+                    setattr(obj, obj.ID_ATTRIBUTE, None)
+                raise
+
+        for obj, _ in self._new:
+            _written(obj, INITIAL_VERSION)
+        for obj, _ in self._dirty:
+            _written(obj, versions.get(id(obj)))
+        for obj, references in self._new + self._dirty:
+            for attribute, value in references.items():
+                setattr(obj, attribute, _resolve(value))
+            if hasattr(obj, 'mark_clean'):
+                obj.mark_clean()
+        for obj, _ in self._dirty:
+            _invalidate(obj)
+        for obj in self._deleted:
+            _invalidate(obj)
+            setattr(obj, obj.ID_ATTRIBUTE, None)
+        self.clear()
+
+    def clear(self) -> None:
+        """Discard every pending change."""
+        self._new = []
+        self._dirty = []
+        self._deleted = []
+        self._new_links = {}
+        self._deleted_links = {}
+
+    def _row(self, obj: Any, references: Dict[str, Any]) -> List[Any]:
+        return [_resolve(references[attribute]) if attribute in references else _resolve(getattr(obj, attribute))
+                for _, attribute in type(obj).COLUMNS]
+
+    def _insert(self, cursor: Any, entries: List[Tuple[Any, Dict[str, Any]]], inserted: List[Any]) -> None:
+        if not entries:
+            return
+        model = type(entries[0][0])
+        columns = ', '.join(quote(column) for column in (model.ID_COLUMN,) + tuple(c for c, _ in model.COLUMNS))
+        query = f'INSERT INTO {quote(model.TABLE)} ({columns}) VALUES %s'
+        for start in range(0, len(entries), self.page_size):
+            page = entries[start:start + self.page_size]
+            # RETURNING does not promise VALUES order, so the keys are drawn from the
+            # sequence first and inserted explicitly rather than matched up afterwards.
+            cursor.execute(NEXT_IDS, (quote(model.TABLE), model.ID_COLUMN, len(page)))
+            for (obj, _), (new_id,) in zip(page, cursor.fetchall()):
+                setattr(obj, model.ID_ATTRIBUTE, new_id)
+                inserted.append(obj)
+            execute_values(cursor, query, [[_identity(obj)] + self._row(obj, refs) for obj, refs in page],
+                           page_size=len(page))
+            self.statements += 2
+
+    def _update(self, cursor: Any, entries: List[Tuple[Any, Dict[str, Any]]], versions: Dict[int, int]) -> None:
+        if not entries:
+            return
+        model = type(entries[0][0])
+        version = getattr(model, 'VERSION_COLUMN', None)
+        if version is None:
+            assignments = ', '.join(f'{quote(column)} = %s' for column, _ in model.COLUMNS)
+            query = f'UPDATE {quote(model.TABLE)} SET {assignments} WHERE {quote(model.ID_COLUMN)} = %s'
+            rows = [self._row(obj, refs) + [_identity(obj)] for obj, refs in entries]
+            execute_batch(cursor, query, rows, page_size=self.page_size)
+            self.statements += (len(rows) + self.page_size - 1) // self.page_size
+            return
+        for start in range(0, len(entries), self.page_size):
+            self._update_versioned(cursor, model, version, entries[start:start + self.page_size], versions)
+            self.statements += 1
+
+    def _update_versioned(self, cursor: Any, model: Any, version: str, page: List[Tuple[Any, Dict[str, Any]]],
+                          versions: Dict[int, int]) -> None:
+        """Update a page of versioned rows in one statement, matching each on the version it was loaded with.
+
+        The rows travel as JSON and are typed by json_populate_recordset against the
+        table itself. Objects without a known version are written unconditionally.
+        """
+        table, key, checked = quote(model.TABLE), quote(model.ID_COLUMN), quote(version)
+        assignments = ', '.join(f'{quote(column)} = v.{quote(column)}' for column, _ in model.COLUMNS)
+        query = (f'UPDATE {table} AS t SET {assignments}, {checked} = t.{checked} + 1 '
+                 f'FROM json_populate_recordset(NULL::{table}, %s) AS v '
+                 f'WHERE t.{key} = v.{key} AND (v.{checked} IS NULL OR t.{checked} = v.{checked}) '
+                 f'RETURNING t.{key}, t.{checked}')
+        rows = [dict(zip([model.ID_COLUMN] + [column for column, _ in model.COLUMNS] + [version],
+                         [_identity(obj)] + self._row(obj, refs) + [getattr(obj, 'version', None)]))
+                for obj, refs in page]
+        cursor.execute(query, (Json(rows, dumps=_json_dumps),))
+        written = dict(cursor.fetchall())
+        for obj, _ in page:
+            key_value = _identity(obj)
+            if key_value not in written:
+                raise VersionConflictError(model.TABLE, key_value, getattr(obj, 'version', None) or 0)
+            versions[id(obj)] = written[key_value]
+
+    def _delete(self, cursor: Any, objects: List[Any]) -> None:
+        if not objects:
+            return
+        model = type(objects[0])
+        query = f'DELETE FROM {quote(model.TABLE)} WHERE {quote(model.ID_COLUMN)} = ANY(%s)'
+        ids = [_identity(obj) for obj in objects]
+        for start in range(0, len(ids), self.page_size):
+            cursor.execute(query, (ids[start:start + self.page_size],))
+            self.statements += 1
+
+    def _insert_links(self, cursor: Any, table: str, rows: List[Tuple[Any, Any]]) -> None:
+        first, second = LINK_TABLES[table]
+        query = f'INSERT INTO {quote(table)} ({quote(first)}, {quote(second)}) VALUES %s'
+        values = [(_resolve(a), _resolve(b)) for a, b in rows]
+        execute_values(cursor, query, values, page_size=self.page_size)
+        self.statements += (len(values) + self.page_size - 1) // self.page_size
+
+    def _delete_links(self, cursor: Any, table: str, rows: List[Tuple[Any, Any]]) -> None:
+        first, second = LINK_TABLES[table]
+        query = (f'DELETE FROM {quote(table)} AS t USING (VALUES %s) AS v(a, b) '
+                 f'WHERE t.{quote(first)} = v.a AND t.{quote(second)} = v.b')
+        values = [(_resolve(a), _resolve(b)) for a, b in rows]
+        execute_values(cursor, query, values, page_size=self.page_size)
+        self.statements += (len(values) + self.page_size - 1) // self.page_size
+
+    def __enter__(self) -> 'Session':
+        """Start collecting changes.
+
+        :return: The Session instance.
+        """
+        return self
+
+    def __exit__(self, exc_type: Optional[type], exc_val: Optional[BaseException], exc_tb: Optional[Any]) -> None:
+        """Flush pending changes, or discard them if the block raised."""
+        if exc_type is None:
+            self.flush()
+        else:
+            self.clear()
@@ -0,0 +1,120 @@
+"""Set-based assortment sync for the store product link tables.
+
+The desired products of every store are loaded into a temporary table with
+COPY, then one anti-join DELETE and one anti-join INSERT per link table bring
+"StoreDryProduct" or "StoreFoodProduct" in line with it. Links that are already
+right are not touched, and rolling an assortment out to hundreds of stores is a
+single transaction.
+"""
+
+import io
+from typing import Any, Dict, Iterable, Mapping, NamedTuple, Sequence, Tuple
+from src.db_engine import DBEngine
+
+# Kind -> (link table, product column).
+LINK_TABLES: Dict[str, Tuple[str, str]] = {
+    'dry': ('StoreDryProduct', 'DryStorageID'),
+    'food': ('StoreFoodProduct', 'FoodID'),
+}
+
+
+class AssortmentChanges(NamedTuple):
+    """Number of links inserted and deleted by a sync."""
+    added: int
+    removed: int
+
+
+def _copy_rows(cursor: Any, table: str, columns: Sequence[str], rows: Iterable[Tuple[int, ...]]) -> None:
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write('\t'.join(str(value) for value in row) + '\n')
+    buffer.seek(0)
+    cursor.copy_from(buffer, table, columns=columns)
+
+
+def sync_assortment(desired: Mapping[int, Iterable[int]], kind: str = 'dry', prune: bool = True) -> AssortmentChanges:
+    """Make the given stores carry exactly the given products.
+
+    Stores not in ``desired`` are left alone; a store mapped to an empty list loses
+    all its links of this kind when ``prune`` is set.
+
+    :param desired: Store ID -> product IDs that store should carry.
+    :param kind: 'dry' for StoreDryProduct or 'food' for StoreFoodProduct.
+    :param prune: Also delete links to products not in the store's desired set. When
+        False, only missing links are added.
+    :return: Counts of links added and removed.
+    :raises ValueError: If the kind is unknown.
+    """
+    if kind not in LINK_TABLES:
+        raise ValueError(f"Unknown item kind '{kind}', expected one of {sorted(LINK_TABLES)}.")
+    table, column = LINK_TABLES[kind]
+
+    with DBEngine() as db:
+        if db.connection is None or db.cursor is None:
+            print("Database connection error.")
+            return AssortmentChanges(0, 0)
+        cursor = db.cursor
+        try:
+            cursor.execute("""
+                CREATE TEMP TABLE assortment_stores (store_id INTEGER PRIMARY KEY) ON COMMIT DROP;
+                CREATE TEMP TABLE assortment_items (store_id INTEGER, item_id INTEGER, PRIMARY KEY (store_id, item_id)) ON COMMIT DROP;
+            """)
+            _copy_rows(cursor, 'assortment_stores', ('store_id',), ((store_id,) for store_id in desired))
+            _copy_rows(cursor, 'assortment_items', ('store_id', 'item_id'),
+                       ((store_id, item_id) for store_id, items in desired.items() for item_id in set(items)))
+            cursor.execute('ANALYZE assortment_stores; ANALYZE assortment_items')
+
+            removed = 0
+            if prune:
+                cursor.execute(f"""
+                    DELETE FROM "{table}" link
+                    USING assortment_stores s
+                    WHERE link."StoreID" = s.store_id
+                    AND NOT EXISTS (
+                        SELECT 1 FROM assortment_items d
+                        WHERE d.store_id = link."StoreID" AND d.item_id = link."{column}"
+                    )
+                """)
+                removed = cursor.rowcount
+
+            cursor.execute(f"""
+                INSERT INTO "{table}" ("StoreID", "{column}")
+                SELECT d.store_id, d.item_id
+                FROM assortment_items d
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM "{table}" link
+                    WHERE link."StoreID" = d.store_id AND link."{column}" = d.item_id
+                )
+                ON CONFLICT DO NOTHING
+            """)
+            added = cursor.rowcount
+            db.connection.commit()
+        except Exception:
+            db.connection.rollback()
+            raise
+    return AssortmentChanges(added, removed)
+
+
+def roll_out(store_ids: Iterable[int], item_ids: Iterable[int], kind: str = 'dry',
+             prune: bool = False) -> AssortmentChanges:
+    """Give every listed store the same products; see sync_assortment."""
+    items = list(dict.fromkeys(item_ids))
+    return sync_assortment({store_id: items for store_id in store_ids}, kind, prune)
+
+
+def roll_out_assortment() -> None:
+    """Prompt for stores and products and roll the assortment out to all of them."""
+    kind = input("Item kind (dry/food): ").strip().lower()
+    try:
+        store_ids = [int(part) for part in input("Enter store IDs separated by commas: ").split(',') if part.strip()]
+        item_ids = [int(part) for part in input("Enter item IDs separated by commas: ").split(',') if part.strip()]
+    except ValueError:
+        print("Invalid input. Please enter numeric IDs.")
+        return
+    prune = input("Remove items not in the list from these stores (yes/no)? ").strip().lower() == 'yes'
+    try:
+        changes = roll_out(store_ids, item_ids, kind, prune)
+    except Exception as e:
+        print(f"Error rolling out assortment: {e}")
+        return
+    print(f"Added {changes.added} and removed {changes.removed} store item links.")
@@ -0,0 +1,106 @@
+"""Reads and refreshes the "Store Inventory" materialized view.
+
+The view (created by migration 003) holds every store's dry and food stock
+pre-joined, so a store's whole inventory is one index range read instead of a
+join per link table. It is a snapshot: changes to items or links show up after
+the next ``refresh()``, and ``staleness()`` tells how old the snapshot is.
+"""
+
+import datetime
+import time
+from typing import Any, List, NamedTuple, Optional
+from src.db_engine import DBEngine
+
+VIEW_NAME = 'Store Inventory'
+
+
+class InventoryLine(NamedTuple):
+    """One product stocked by a store; dry-only and food-only fields are None for the other kind."""
+    store_id: int
+    kind: str
+    item_id: int
+    name: str
+    amount: int
+    price: int
+    value: int
+    recipe_item: Optional[bool]
+    chemical: Optional[bool]
+    package_type: Optional[str]
+    storage_condition: Optional[str]
+    expiry_date: Optional[datetime.date]
+
+
+def refresh(concurrently: bool = True) -> float:
+    """Rebuild the view from the link tables and record when it was refreshed.
+
+    :param concurrently: Refresh without blocking readers of the view. Slower than a
+        plain refresh, which locks the view until it completes.
+    :return: Seconds the refresh took.
+    """
+    started = time.perf_counter()
+    with DBEngine() as db:
+        if db.connection is None or db.cursor is None:
+            raise RuntimeError("Database connection or cursor is not initialized.")
+        mode = 'CONCURRENTLY ' if concurrently else ''
+        db.cursor.execute(f'REFRESH MATERIALIZED VIEW {mode}"{VIEW_NAME}"')
+        db.cursor.execute("""
+            INSERT INTO "Materialized View Refresh" ("ViewName", "RefreshedAt")
+            VALUES (%s, NOW())
+            ON CONFLICT ("ViewName") DO UPDATE SET "RefreshedAt" = EXCLUDED."RefreshedAt"
+        """, (VIEW_NAME,))
+        db.connection.commit()
+    return time.perf_counter() - started
+
+
+def staleness() -> Optional[datetime.timedelta]:
+    """Return how long ago the view was last refreshed, or None if that is unknown."""
+    with DBEngine() as db:
+        if db.connection is None or db.cursor is None:
+            print("Database connection error.")
+            return None
+        db.cursor.execute("""
+            SELECT NOW()::TIMESTAMP - "RefreshedAt"
+            FROM "Materialized View Refresh"
+            WHERE "ViewName" = %s
+        """, (VIEW_NAME,))
+        row = db.cursor.fetchone()
+        age: Optional[datetime.timedelta] = row[0] if row else None
+        return age
+
+
+def is_stale(max_age: datetime.timedelta) -> bool:
+    """Whether the view is older than ``max_age`` (or its age is unknown)."""
+    age = staleness()
+    return age is None or age > max_age
+
+
+def store_inventory(store_id: int, kind: Optional[str] = None) -> List[InventoryLine]:
+    """Return the stock of one store from the view, dry items first, then by item ID.
+
+    :param store_id: The store to list.
+    :param kind: Only 'dry' or only 'food' items.
+    """
+    query = """
+        SELECT "StoreID", "Kind", "ItemID", "Name", "Amount", "Price", "Value",
+               "RecipeItem", "Chemical", "PackageType", "StorageCondition", "ExpiryDate"
+        FROM "Store Inventory"
+        WHERE "StoreID" = %s
+    """
+    params: List[Any] = [store_id]
+    if kind is not None:
+        query += ' AND "Kind" = %s'
+        params.append(kind)
+    with DBEngine() as db:
+        if db.connection is None or db.cursor is None:
+            print("Database connection error.")
+            return []
+        db.cursor.execute(query + ' ORDER BY "Kind", "ItemID"', params)
+        return [InventoryLine(*row) for row in db.cursor.fetchall()]
+
+
+def format_line(line: InventoryLine) -> str:
+    """Render an inventory line the way the store product listings do."""
+    text = f"{line.kind.capitalize()} ID: {line.item_id}, Name: {line.name}, Amount: {line.amount}, Price: {line.price}, Value: {line.value}"
+    if line.kind == 'food':
+        return text + f", Storage Condition: {line.storage_condition}, Expiry Date: {line.expiry_date}"
+    return text + f", Recipe Item: {line.recipe_item}, Chemical: {line.chemical}, Package Type: {line.package_type}"
@@ -1,13 +1,55 @@
-from typing import Optional, Tuple, List, Union
+from typing import Any, Dict, Iterable, Iterator, Optional, Sequence, Tuple, List, Union
+from src.bulk import delete_by_ids, load_by_ids
 from src.db_engine import DBEngine
+from src.mapping import Mapped, quote
+from src.pagination import DEFAULT_BATCH_SIZE, iter_keyset, print_paged
+from src.person.manager import Manager
+from src.person.storemanager import StoreManager
+from src.person.worker import Worker
+from src.prepared import execute_prepared
+from src.store.valuation import display_valuation_report
 
-class Store:
+# Rows deleted or moved per statement when a store is deleted with cascade=True.
+CASCADE_BATCH_SIZE = 5000
+
+# Staff tables referencing "Store"; store managers go first so their responsibilities can follow them.
+STAFF_MODELS = (StoreManager, Manager, Worker)
+STAFF_TABLES = tuple(model.TABLE for model in STAFF_MODELS)
+
+
+def _in_batches(cursor: Any, statement: str, condition: str, params: Sequence[Any], batch_size: int,
+                table: str) -> int:
+    """Run a DELETE or UPDATE on the rows of ``table`` matching ``condition``, ``batch_size`` rows at a time.
+
+    The rows a batch touches must stop matching ``condition``, or the loop would not end.
+
+    :param statement: ``DELETE FROM <table>`` or ``UPDATE <table> SET ...``, without WHERE.
+    :param condition: Filter selecting the rows, its parameters last in ``params``.
+    :return: Number of rows affected.
+    """
+    query = f'{statement} WHERE ctid IN (SELECT ctid FROM {table} WHERE {condition} LIMIT %s)'
+    total = 0
+    while True:
+        cursor.execute(query, tuple(params) + (batch_size,))
+        total += cursor.rowcount
+        if cursor.rowcount < batch_size:
+            return total
+
+class Store(Mapped):
     """This is a general class for managing a store, including its creation, update, and deletion."""
 
+    TABLE = 'Store'
+    ID_COLUMN = 'StoreID'
+    ID_ATTRIBUTE = 'store_id'
+    COLUMNS = (('StoreName', 'store_name'),)
+
     def __init__(self, store_name: str, store_id: Optional[int] = None) -> None:
         self.store_id = store_id
         self.store_name = store_name
 
+    def __str__(self) -> str:
+        return f"ID: {self.store_id}, Name: {self.store_name}"
+
     def save(self) -> None:
         """Save a new store or update an existing store in the database."""
         if self.store_id is None:
@@ -24,11 +66,7 @@ class Store:
                 print("Database connection or cursor is not available.")
                 return
             try:
-                cursor.execute("""
-                    INSERT INTO "Store" ("StoreName")
-                    VALUES (%s)
-                    RETURNING "StoreID"
-                """, (self.store_name,))
+                execute_prepared(cursor, self.SQL.insert, self.insert_params())
                 self.store_id = cursor.fetchone()[0]
                 connection.commit()
                 print(f"Store '{self.store_name}' created with ID {self.store_id}.")
@@ -44,34 +82,87 @@ class Store:
                 print("Database connection or cursor is not available.")
                 return
             try:
-                cursor.execute("""
-                    UPDATE "Store"
-                    SET "StoreName" = %s
-                    WHERE "StoreID" = %s
-                """, (self.store_name, self.store_id))
+                execute_prepared(cursor, self.SQL.update, self.update_params())
                 connection.commit()
                 print(f"Store ID {self.store_id} updated to '{self.store_name}'.")
             except Exception as e:
                 print(f"Error updating store: {e}")
 
-    def delete(self) -> None:
-        """Delete a store from the database."""
-        if self.store_id is not None:
-            with DBEngine() as db:
-                connection = db.connection
-                cursor = db.cursor
-                if connection is None or cursor is None:
-                    print("Database connection or cursor is not available.")
-                    return
-                try:
-                    cursor.execute('DELETE FROM "Store" WHERE "StoreID" = %s', (self.store_id,))
-                    connection.commit()
-                    print(f"Store ID {self.store_id} deleted.")
-                    self.store_id = None
-                except Exception as e:
-                    print(f"Error deleting store: {e}")
-        else:
+    def delete(self, cascade: bool = False, reassign_to: Optional[int] = None,
+               batch_size: int = CASCADE_BATCH_SIZE) -> Dict[str, int]:
+        """Delete a store from the database.
+
+        A plain delete fails while staff or product links still reference the store.
+        With ``cascade`` the dependents are removed first, in the same transaction:
+        the store's dry and food links, and its workers, managers and store managers
+        (with their responsibilities), or, given ``reassign_to``, the staff are moved
+        to that store instead. Each table is processed ``batch_size`` rows per
+        statement, so a very large store never builds one huge statement. Nothing is
+        changed if any step fails. The "Store Inventory" view keeps showing the store
+        until its next refresh.
+
+        :param cascade: Remove or reassign everything that references the store.
+        :param reassign_to: Store that takes over the staff when cascading.
+        :param batch_size: Maximum number of rows deleted or moved per statement.
+        :return: Rows deleted or moved per table, including the "Store" row itself;
+            empty if nothing was deleted.
+        """
+        if self.store_id is None:
             print("Store ID is not set.")
+            return {}
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1.")
+        if reassign_to == self.store_id:
+            print("Staff cannot be reassigned to the store being deleted.")
+            return {}
+        counts: Dict[str, int] = {}
+        with DBEngine() as db:
+            connection = db.connection
+            cursor = db.cursor
+            if connection is None or cursor is None:
+                print("Database connection or cursor is not available.")
+                return {}
+            try:
+                if cascade:
+                    counts.update(self._delete_dependents(cursor, reassign_to, batch_size))
+                execute_prepared(cursor, self.SQL.delete_by_id, (self.store_id,))
+                counts[self.TABLE] = cursor.rowcount
+                connection.commit()
+            except Exception as e:
+                connection.rollback()
+                print(f"Error deleting store: {e}")
+                return {}
+        if cascade:
+            # Cached staff may have been deleted or moved; decommissioning is rare enough to start over.
+            for model in STAFF_MODELS:
+                model.cache.clear()
+            for table, count in counts.items():
+                print(f"  {table}: {count} {'moved' if reassign_to is not None and table in STAFF_TABLES else 'deleted'}")
+        print(f"Store ID {self.store_id} deleted.")
+        self.store_id = None
+        return counts
+
+    def _delete_dependents(self, cursor: Any, reassign_to: Optional[int], batch_size: int) -> Dict[str, int]:
+        """Delete or move every row referencing the store; the caller owns the transaction."""
+        counts: Dict[str, int] = {}
+        if reassign_to is None:
+            counts['SM Responsibilities'] = _in_batches(
+                cursor, 'DELETE FROM "SM Responsibilities"',
+                '"StoreManagerID" IN (SELECT "StoreManagerID" FROM "Store Manager" WHERE "StoreID" = %s)',
+                (self.store_id,), batch_size, table='"SM Responsibilities"')
+        for model in STAFF_MODELS:
+            table = quote(model.TABLE)
+            params: Tuple[Any, ...]
+            if reassign_to is None:
+                statement, params = f'DELETE FROM {table}', (self.store_id,)
+            else:
+                statement = f'UPDATE {table} SET "StoreID" = %s, "Version" = "Version" + 1'
+                params = (reassign_to, self.store_id)
+            counts[model.TABLE] = _in_batches(cursor, statement, '"StoreID" = %s', params, batch_size, table=table)
+        for table in ('StoreDryProduct', 'StoreFoodProduct'):
+            counts[table] = _in_batches(cursor, f'DELETE FROM "{table}"', '"StoreID" = %s',
+                                        (self.store_id,), batch_size, table=f'"{table}"')
+        return counts
 
     @classmethod
     def view_all(cls) -> Union[List[Tuple[int, str]], None]:
@@ -83,13 +174,95 @@ class Store:
                 print("Database connection or cursor is not available.")
                 return None
             try:
-                cursor.execute('SELECT "StoreID", "StoreName" FROM "Store"')
+                cursor.execute(cls.SQL.select)
                 result = cursor.fetchall()
                 return result if result else None
             except Exception as e:
                 print(f"Error retrieving stores: {e}")
                 return None
 
+    @classmethod
+    def iter_all(cls, batch_size: int = DEFAULT_BATCH_SIZE, after_id: Optional[int] = None) -> Iterator['Store']:
+        """Iterate over all stores in ID order, fetching them in keyset-paginated batches."""
+        for row in iter_keyset(DBEngine, cls.SQL.select, '"StoreID"', batch_size, after_id):
+            yield cls.from_row(row)
+
+    @classmethod
+    def clone_from(cls, source_store_id: int, new_name: str,
+                   store_manager_id: Optional[int] = None) -> Optional['Store']:
+        """Create a store carrying the same dry and food items as an existing one.
+
+        The store row and its product links are created in one transaction with
+        INSERT ... SELECT, so no link rows pass through Python.
+
+        :param source_store_id: The store whose assortment is copied.
+        :param new_name: Name of the new store.
+        :param store_manager_id: Optional store manager given every responsibility held by
+            the source store's managers, as a responsibilities template. The manager stays
+            assigned to their current store; move them separately if they are to run the new one.
+        :return: The new store, or None if the source store does not exist or cloning failed.
+        """
+        with DBEngine() as db:
+            connection = db.connection
+            cursor = db.cursor
+            if connection is None or cursor is None:
+                print("Database connection or cursor is not available.")
+                return None
+            try:
+                cursor.execute("""
+                    INSERT INTO "Store" ("StoreName")
+                    SELECT %s WHERE EXISTS (SELECT 1 FROM "Store" WHERE "StoreID" = %s)
+                    RETURNING "StoreID"
+                """, (new_name, source_store_id))
+                row = cursor.fetchone()
+                if row is None:
+                    print(f"Store ID {source_store_id} not found.")
+                    connection.rollback()
+                    return None
+                store = cls(new_name, row[0])
+
+                cursor.execute("""
+                    INSERT INTO "StoreDryProduct" ("StoreID", "DryStorageID")
+                    SELECT %s, "DryStorageID" FROM "StoreDryProduct" WHERE "StoreID" = %s
+                """, (store.store_id, source_store_id))
+                dry_items = cursor.rowcount
+                cursor.execute("""
+                    INSERT INTO "StoreFoodProduct" ("StoreID", "FoodID")
+                    SELECT %s, "FoodID" FROM "StoreFoodProduct" WHERE "StoreID" = %s
+                """, (store.store_id, source_store_id))
+                food_items = cursor.rowcount
+
+                if store_manager_id is not None:
+                    cursor.execute("""
+                        INSERT INTO "SM Responsibilities" ("ResponsibilityID", "StoreManagerID")
+                        SELECT DISTINCT smr."ResponsibilityID", %s
+                        FROM "SM Responsibilities" smr
+                        JOIN "Store Manager" sm ON sm."StoreManagerID" = smr."StoreManagerID"
+                        WHERE sm."StoreID" = %s
+                        ON CONFLICT DO NOTHING
+                    """, (store_manager_id, source_store_id))
+                connection.commit()
+                print(f"Store '{new_name}' created with ID {store.store_id}, "
+                      f"copying {dry_items} dry and {food_items} food items from store ID {source_store_id}.")
+                return store
+            except Exception as e:
+                connection.rollback()
+                print(f"Error cloning store: {e}")
+                return None
+
+    @classmethod
+    def find_by_ids(cls, ids: Iterable[int]) -> List['Store']:
+        """Find stores by ID in one round trip, returned in the order the IDs were given.
+
+        IDs that do not exist are skipped.
+        """
+        return load_by_ids(DBEngine, cls.SQL.select, '"StoreID"', ids, cls.from_row)
+
+    @classmethod
+    def delete_many(cls, ids: Iterable[int]) -> int:
+        """Delete stores by ID in one transaction and return how many were deleted."""
+        return delete_by_ids(DBEngine, '"Store"', '"StoreID"', ids)
+
 
 def manage_store_menu() -> None:
     """Store management menu with options to add, edit, delete, or view stores."""
@@ -99,9 +272,11 @@ def manage_store_menu() -> None:
         print("2. Edit Store")
         print("3. Delete Store")
         print("4. View All Stores")
-        print("5. Back")
+        print("5. Inventory Valuation Report")
+        print("6. Clone Store")
+        print("7. Back")
 
-        choice = input("Enter your choice (1-5): ")
+        choice = input("Enter your choice (1-7): ")
 
         if choice == '1':
             add_store()
@@ -112,9 +287,13 @@ def manage_store_menu() -> None:
         elif choice == '4':
             view_all_stores()
         elif choice == '5':
+            display_valuation_report()
+        elif choice == '6':
+            clone_store()
+        elif choice == '7':
             break
         else:
-            print("Invalid choice, please select between 1 and 5.")
+            print("Invalid choice, please select between 1 and 7.")
 
 
 def add_store() -> None:
@@ -148,18 +327,28 @@ def edit_store() -> None:
 
 
 def delete_store() -> None:
-    """Delete a store."""
+    """Delete a store, optionally with everything that references it."""
     store_id = int(input("Enter the ID of the store to delete: "))
     store = Store("", store_id)
-    store.delete()
+    cascade = input("Also remove its product links and staff? (y/n): ").strip().lower() == 'y'
+    reassign_to = None
+    if cascade:
+        reassign_input = input("Enter store ID to move the staff to (leave empty to delete them): ").strip()
+        reassign_to = int(reassign_input) if reassign_input else None
+    store.delete(cascade=cascade, reassign_to=reassign_to)
+
+
+def clone_store() -> None:
+    """Open a new store with the assortment of an existing one."""
+    source_store_id = int(input("Enter the ID of the store to copy: "))
+    new_name = input("Enter new store name: ")
+    manager_input = input("Enter store manager ID to receive the source store's responsibilities "
+                          "(leave empty to skip): ").strip()
+    Store.clone_from(source_store_id, new_name, int(manager_input) if manager_input else None)
 
 
 def view_all_stores() -> None:
-    """View all stores."""
-    stores = Store.view_all()
-    if stores:
-        print("\nStores:")
-        for store in stores:
-            print(f"ID: {store[0]}, Name: {store[1]}")
-    else:
+    """View all stores one page at a time."""
+    print("\nStores:")
+    if not print_paged(Store.iter_all()):
         print("No stores found.")
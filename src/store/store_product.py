@@ -1,5 +1,8 @@
-from typing import List, Tuple, Optional
+from typing import Dict, Iterable, List, Tuple, Optional
 from src.db_engine import DBEngine
+from src.pagination import print_paged
+from src.store import inventory_view
+from src.store.assortment import roll_out_assortment
 
 class StoreDryProduct:
     """Class to manage dry storage products in a store."""
@@ -62,6 +65,38 @@ class StoreDryProduct:
             print(f"Error viewing dry storage items in store: {e}")
             return []  # Ensure return type matches
 
+    @staticmethod
+    def stores_for(item_id: int) -> List[int]:
+        """Return the IDs of the stores that carry a dry storage item, in store order."""
+        return StoreDryProduct.stores_for_many([item_id]).get(item_id, [])
+
+    @staticmethod
+    def stores_for_many(item_ids: Iterable[int]) -> Dict[int, List[int]]:
+        """Return the store IDs carrying each of the given dry storage items in one query.
+
+        Items no store carries are left out of the result.
+        """
+        ids = list(dict.fromkeys(item_ids))
+        if not ids:
+            return {}
+        try:
+            with DBEngine() as db:
+                if db.cursor:
+                    db.cursor.execute("""
+                        SELECT "DryStorageID", "StoreID"
+                        FROM "StoreDryProduct"
+                        WHERE "DryStorageID" = ANY(%s)
+                        ORDER BY "DryStorageID", "StoreID"
+                    """, (ids,))
+                    stores: Dict[int, List[int]] = {}
+                    for item_id, store_id in db.cursor.fetchall():
+                        stores.setdefault(item_id, []).append(store_id)
+                    return stores
+                return {}
+        except Exception as e:
+            print(f"Error finding stores for dry storage items: {e}")
+            return {}
+
 class StoreFoodProduct:
     """Class to manage food products in a store."""
 
@@ -122,24 +157,65 @@ class StoreFoodProduct:
             print(f"Error viewing food items in store: {e}")
             return []  # Ensure return type matches
 
+    @staticmethod
+    def stores_for(item_id: int) -> List[int]:
+        """Return the IDs of the stores that carry a food item, in store order."""
+        return StoreFoodProduct.stores_for_many([item_id]).get(item_id, [])
+
+    @staticmethod
+    def stores_for_many(item_ids: Iterable[int]) -> Dict[int, List[int]]:
+        """Return the store IDs carrying each of the given food items in one query.
+
+        Items no store carries are left out of the result.
+        """
+        ids = list(dict.fromkeys(item_ids))
+        if not ids:
+            return {}
+        try:
+            with DBEngine() as db:
+                if db.cursor:
+                    db.cursor.execute("""
+                        SELECT "FoodID", "StoreID"
+                        FROM "StoreFoodProduct"
+                        WHERE "FoodID" = ANY(%s)
+                        ORDER BY "FoodID", "StoreID"
+                    """, (ids,))
+                    stores: Dict[int, List[int]] = {}
+                    for item_id, store_id in db.cursor.fetchall():
+                        stores.setdefault(item_id, []).append(store_id)
+                    return stores
+                return {}
+        except Exception as e:
+            print(f"Error finding stores for food items: {e}")
+            return {}
+
 def manage_store_items_menu() -> None:
     """Manage Store Items with operations to add, remove, and view items."""
     while True:
         print("\nStore Item Management")
         print("1. Manage Store Dry Products")
         print("2. Manage Store Food Products")
-        print("3. Back")
+        print("3. View Store Inventory")
+        print("4. Refresh Store Inventory")
+        print("5. Roll Out Assortment to Stores")
+        print("6. Back")
 
-        choice = input("Enter your choice (1-3): ").strip()
+        choice = input("Enter your choice (1-6): ").strip()
 
         if choice == '1':
             manage_store_dry_products()
         elif choice == '2':
             manage_store_food_products()
         elif choice == '3':
+            view_store_inventory()
+        elif choice == '4':
+            refresh_store_inventory()
+        elif choice == '5':
+            roll_out_assortment()
+        elif choice == '6':
             break
         else:
-            print("Invalid choice, please select between 1 and 3.")
+            print("Invalid choice, please select between 1 and 6.")
 
 def manage_store_dry_products() -> None:
     """Manage Store Dry Products with add, remove, and view operations."""
@@ -148,9 +224,10 @@ def manage_store_dry_products() -> None:
         print("1. Add Dry Storage Item to Store")
         print("2. Remove Dry Storage Item from Store")
         print("3. View Dry Storage Items in Store")
-        print("4. Back")
+        print("4. Find Stores Carrying Dry Storage Items")
+        print("5. Back")
 
-        choice = input("Enter your choice (1-4): ").strip()
+        choice = input("Enter your choice (1-5): ").strip()
 
         if choice == '1':
             add_dry_storage_item_to_store()
@@ -159,9 +236,11 @@ def manage_store_dry_products() -> None:
         elif choice == '3':
             view_dry_storage_items_in_store()
         elif choice == '4':
+            find_stores_for_dry_storage_items()
+        elif choice == '5':
             break
         else:
-            print("Invalid choice, please select between 1 and 4.")
+            print("Invalid choice, please select between 1 and 5.")
 
 def manage_store_food_products() -> None:
     """Manage Store Food Products with add, remove, and view operations."""
@@ -170,9 +249,10 @@ def manage_store_food_products() -> None:
         print("1. Add Food Item to Store")
         print("2. Remove Food Item from Store")
         print("3. View Food Items in Store")
-        print("4. Back")
+        print("4. Find Stores Carrying Food Items")
+        print("5. Back")
 
-        choice = input("Enter your choice (1-4): ").strip()
+        choice = input("Enter your choice (1-5): ").strip()
 
         if choice == '1':
             add_food_item_to_store()
@@ -181,9 +261,11 @@ def manage_store_food_products() -> None:
         elif choice == '3':
             view_food_items_in_store()
         elif choice == '4':
+            find_stores_for_food_items()
+        elif choice == '5':
             break
         else:
-            print("Invalid choice, please select between 1 and 4.")
+            print("Invalid choice, please select between 1 and 5.")
 
 def add_dry_storage_item_to_store() -> None:
     """Prompt user to add a dry storage item to a store."""
@@ -207,6 +289,17 @@ def view_dry_storage_items_in_store() -> None:
     else:
         print("No dry storage items found in this store.")
 
+def find_stores_for_dry_storage_items() -> None:
+    """Prompt user for dry storage item IDs and list the stores carrying each of them."""
+    item_ids = [int(part) for part in input("Enter dry storage item IDs separated by commas: ").split(',') if part.strip()]
+    stores = StoreDryProduct.stores_for_many(item_ids)
+    for item_id in item_ids:
+        store_ids = stores.get(item_id)
+        if store_ids:
+            print(f"ID: {item_id}, Stores: {', '.join(str(store_id) for store_id in store_ids)}")
+        else:
+            print(f"ID: {item_id} is not carried by any store.")
+
 def add_food_item_to_store() -> None:
     """Prompt user to add a food item to a store."""
     store_id = int(input("Enter store ID: ").strip())
@@ -229,5 +322,38 @@ def view_food_items_in_store() -> None:
     else:
         print("No food items found in this store.")
 
+def find_stores_for_food_items() -> None:
+    """Prompt user for food item IDs and list the stores carrying each of them."""
+    item_ids = [int(part) for part in input("Enter food item IDs separated by commas: ").split(',') if part.strip()]
+    stores = StoreFoodProduct.stores_for_many(item_ids)
+    for item_id in item_ids:
+        store_ids = stores.get(item_id)
+        if store_ids:
+            print(f"ID: {item_id}, Stores: {', '.join(str(store_id) for store_id in store_ids)}")
+        else:
+            print(f"ID: {item_id} is not carried by any store.")
+
+def view_store_inventory() -> None:
+    """Prompt user to view a store's dry and food items from the inventory snapshot."""
+    store_id = int(input("Enter store ID: ").strip())
+    try:
+        age = inventory_view.staleness()
+        lines = inventory_view.store_inventory(store_id)
+    except Exception as e:
+        print(f"Error viewing store inventory: {e}")
+        return
+    if age is not None:
+        print(f"Inventory as of {int(age.total_seconds() // 60)} minutes ago.")
+    if not print_paged(lines, render=inventory_view.format_line):
+        print("No items found in this store.")
+
+def refresh_store_inventory() -> None:
+    """Refresh the store inventory snapshot without blocking its readers."""
+    try:
+        elapsed = inventory_view.refresh()
+        print(f"Store inventory refreshed in {elapsed:.2f}s.")
+    except Exception as e:
+        print(f"Error refreshing store inventory: {e}")
+
 if __name__ == "__main__":
     manage_store_items_menu()
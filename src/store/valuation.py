@@ -0,0 +1,120 @@
+"""Inventory valuation per store.
+
+Stock value is aggregated by PostgreSQL in one statement over both link tables:
+every store gets its dry and food item counts, ``SUM(Amount * Price)`` and the
+category splits (chemical and recipe dry items, food value per storage
+condition) without any per-store queries or per-item rows reaching Python.
+"""
+
+import time
+from typing import Dict, List, NamedTuple
+from src.db_engine import DBEngine
+
+# Amount * Price is widened to BIGINT so large stock counts cannot overflow INTEGER.
+VALUATION_SQL = """
+    WITH dry AS (
+        SELECT sdp."StoreID",
+               COUNT(*) AS items,
+               SUM(d."Amount"::BIGINT * d."Price") AS value,
+               SUM(d."Amount"::BIGINT * d."Price") FILTER (WHERE d."Chemical") AS chemical_value,
+               SUM(d."Amount"::BIGINT * d."Price") FILTER (WHERE d."RecipeItem") AS recipe_value
+        FROM "StoreDryProduct" sdp
+        JOIN "Dry Storage Item" d ON d."DryStorageItemID" = sdp."DryStorageID"
+        GROUP BY sdp."StoreID"
+    ), food_by_condition AS (
+        SELECT sfp."StoreID",
+               COALESCE(f."StorageCondition", 'Unspecified') AS condition,
+               COUNT(*) AS items,
+               SUM(f."Amount"::BIGINT * f."Price") AS value
+        FROM "StoreFoodProduct" sfp
+        JOIN "Food Item" f ON f."FoodItemID" = sfp."FoodID"
+        GROUP BY sfp."StoreID", COALESCE(f."StorageCondition", 'Unspecified')
+    ), food AS (
+        SELECT "StoreID",
+               SUM(items) AS items,
+               SUM(value) AS value,
+               jsonb_object_agg(condition, COALESCE(value, 0)) AS by_condition
+        FROM food_by_condition
+        GROUP BY "StoreID"
+    )
+    SELECT s."StoreID", s."StoreName",
+           COALESCE(dry.items, 0), COALESCE(dry.value, 0)::BIGINT,
+           COALESCE(dry.chemical_value, 0)::BIGINT, COALESCE(dry.recipe_value, 0)::BIGINT,
+           COALESCE(food.items, 0)::BIGINT, COALESCE(food.value, 0)::BIGINT,
+           COALESCE(food.by_condition, '{}'::jsonb)
+    FROM "Store" s
+    LEFT JOIN dry ON dry."StoreID" = s."StoreID"
+    LEFT JOIN food ON food."StoreID" = s."StoreID"
+    ORDER BY s."StoreID"
+"""
+
+
+class StoreValuation(NamedTuple):
+    """Stock value of one store."""
+    store_id: int
+    store_name: str
+    dry_items: int
+    dry_value: int
+    chemical_value: int
+    recipe_value: int
+    food_items: int
+    food_value: int
+    food_by_condition: Dict[str, int]
+
+    @property
+    def total_value(self) -> int:
+        """Value of all dry and food stock in the store."""
+        return self.dry_value + self.food_value
+
+
+class ValuationReport:
+    """Valuation of every store plus the time it took to compute.
+
+    Attributes:
+        stores (List[StoreValuation]): One entry per store, including stores without stock.
+        elapsed (float): Wall time of the query in seconds.
+    """
+
+    def __init__(self, stores: List[StoreValuation], elapsed: float) -> None:
+        self.stores = stores
+        self.elapsed = elapsed
+
+    @property
+    def total_value(self) -> int:
+        """Value of all stock across stores."""
+        return sum(store.total_value for store in self.stores)
+
+    def __str__(self) -> str:
+        return f"Valued {len(self.stores)} stores, total {self.total_value}, in {self.elapsed:.3f}s"
+
+
+def valuation_report() -> ValuationReport:
+    """Compute the inventory valuation of every store in a single query."""
+    started = time.perf_counter()
+    with DBEngine() as db:
+        if db.connection is None or db.cursor is None:
+            print("Database connection error.")
+            return ValuationReport([], 0.0)
+        db.cursor.execute(VALUATION_SQL)
+        rows = db.cursor.fetchall()
+    stores = [StoreValuation(*row) for row in rows]
+    return ValuationReport(stores, time.perf_counter() - started)
+
+
+def display_valuation_report() -> None:
+    """Print the inventory valuation of every store."""
+    try:
+        report = valuation_report()
+    except Exception as e:
+        print(f"Error computing inventory valuation: {e}")
+        return
+    if not report.stores:
+        print("No stores found.")
+        return
+    for store in report.stores:
+        print(f"ID: {store.store_id}, Name: {store.store_name}, Total Value: {store.total_value}")
+        print(f"    Dry: {store.dry_items} items, Value: {store.dry_value} "
+              f"(Chemical: {store.chemical_value}, Recipe Items: {store.recipe_value})")
+        conditions = ", ".join(f"{condition}: {value}" for condition, value in sorted(store.food_by_condition.items()))
+        print(f"    Food: {store.food_items} items, Value: {store.food_value}" + (f" ({conditions})" if conditions else ""))
+    print(report)
@@ -0,0 +1,157 @@
+"""Dirty-field tracking and optimistic concurrency for mapped models.
+
+A model instance remembers the column values it had when it was read from or
+written to the database. ``save()`` then only sends the columns that changed
+since, and skips the UPDATE altogether when nothing did. Instances built directly
+(rather than loaded) have no snapshot, so every column counts as changed.
+
+Models with a ``VERSION_COLUMN`` also remember the row version they were loaded
+with. Their UPDATE only matches while the row still has that version and bumps
+it, so a concurrent edit is reported as a VersionConflictError instead of being
+overwritten, without holding row locks while a user is typing. Instances
+without a known version (built directly) are written unconditionally.
+"""
+
+import time
+from typing import Any, Callable, ClassVar, Dict, List, Optional, Sequence, Tuple, Type, TypeVar
+from src.cache import IdentityMap
+from src.mapping import Mapped, quote
+from src.prepared import execute_prepared
+
+M = TypeVar('M', bound='ChangeTracking')
+R = TypeVar('R')
+
+# Value of the "Version" column for newly inserted rows; see migration 005.
+INITIAL_VERSION = 1
+
+
+class VersionConflictError(Exception):
+    """Raised when a row was changed by someone else since it was loaded.
+
+    Reload the row and apply the change again, e.g. with retry_on_conflict.
+    """
+
+    def __init__(self, table: str, id: Any, version: int) -> None:
+        super().__init__(f'"{table}" row {id} was modified by another user since version {version} was loaded.')
+        self.table = table
+        self.id = id
+        self.version = version
+
+
+class ChangeTracking(Mapped):
+    """Mapped model base that tracks changed columns and, with a VERSION_COLUMN, row versions."""
+
+    cache: ClassVar[IdentityMap[Any]]
+    _snapshot: Optional[Dict[str, Any]] = None
+    _update_statements: ClassVar[Dict[Tuple[Tuple[str, ...], bool], str]]
+    version: Optional[int] = None
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._update_statements = {}
+
+    @classmethod
+    def from_row(cls: Type[M], row: Sequence[Any]) -> M:
+        """Build a clean instance from a row selected with ``SQL.columns``, including its version."""
+        instance = super().from_row(row)
+        version = row[len(cls.ROW_ATTRIBUTES)] if cls.VERSION_COLUMN is not None else None
+        return instance.mark_clean(version)
+
+    def mark_clean(self: M, version: Optional[int] = None) -> M:
+        """Record the current column values as the ones stored in the database.
+
+        :param version: Row version read or written along with the values.
+        :return: The instance itself, so loaders can write ``cls(*row).mark_clean()``.
+        """
+        self._snapshot = {attribute: getattr(self, attribute) for _, attribute in self.COLUMNS}
+        if version is not None:
+            self.version = version
+        return self
+
+    def dirty_columns(self) -> List[Tuple[str, str]]:
+        """Return the (column, attribute) pairs whose value differs from the snapshot."""
+        if self._snapshot is None:
+            return list(self.COLUMNS)
+        return [(column, attribute) for column, attribute in self.COLUMNS
+                if attribute not in self._snapshot or self._snapshot[attribute] != getattr(self, attribute)]
+
+    @property
+    def is_dirty(self) -> bool:
+        """Whether save() would write anything."""
+        return self.key is None or bool(self.dirty_columns())
+
+    def _invalidate_cached(self) -> None:
+        """Drop this row from its class's identity map.
+
+        Called before a write and again after it commits, so a lookup that cached the
+        old row in between does not keep serving it.
+        """
+        if self.key is not None:
+            type(self).cache.invalidate(self.key)
+
+    @property
+    def _checks_version(self) -> bool:
+        return self.VERSION_COLUMN is not None and self.version is not None
+
+    def _update_statement(self) -> Tuple[str, Tuple[Any, ...]]:
+        """Build the UPDATE for the changed columns; only valid while the instance is dirty.
+
+        Versioned rows are matched on their version and return the new one. The SQL
+        for each set of changed columns is generated once per class.
+        """
+        dirty = self.dirty_columns()
+        columns = tuple(column for column, _ in dirty)
+        checked = self._checks_version
+        query = self._update_statements.get((columns, checked))
+        if query is None:
+            query = self._compile_update(columns, checked)
+            self._update_statements[(columns, checked)] = query
+        params = tuple(getattr(self, attribute) for _, attribute in dirty) + (self.key,)
+        return query, params + ((self.version,) if checked else ())
+
+    @classmethod
+    def _compile_update(cls, columns: Tuple[str, ...], checked: bool) -> str:
+        assignments = ', '.join(f'{quote(column)} = %s' for column in columns)
+        where = f'WHERE {quote(cls.ID_COLUMN)} = %s'
+        if cls.VERSION_COLUMN is None:
+            return f'UPDATE {quote(cls.TABLE)} SET {assignments} {where}'
+        version = quote(cls.VERSION_COLUMN)
+        if checked:
+            where += f' AND {version} = %s'
+        return f'UPDATE {quote(cls.TABLE)} SET {assignments}, {version} = {version} + 1 {where} RETURNING {version}'
+
+    def _write_update(self, connection: Any, cursor: Any) -> None:
+        """Run the UPDATE for the changed columns and commit it.
+
+        :raises VersionConflictError: If the row's version no longer matched; the
+            transaction is rolled back and the instance keeps its changes.
+        """
+        execute_prepared(cursor, *self._update_statement())
+        version = None
+        if self.VERSION_COLUMN is not None:
+            row = cursor.fetchone()
+            if row is None and self._checks_version:
+                connection.rollback()
+                raise VersionConflictError(self.TABLE, self.key, self.version or 0)
+            version = row[0] if row else None
+        connection.commit()
+        self.mark_clean(version)
+
+
+def retry_on_conflict(operation: Callable[[], R], attempts: int = 3, delay: float = 0.05) -> R:
+    """Run ``operation`` until it finishes without a VersionConflictError.
+
+    ``operation`` should reload the row, apply its change and save, so every
+    attempt starts from the latest version.
+
+    :param attempts: Maximum number of tries; the last conflict is re-raised.
+    :param delay: Seconds to wait before the second try, doubled after each conflict.
+    """
+    for attempt in range(1, attempts + 1):
+        try:
+            return operation()
+        except VersionConflictError:
+            if attempt == attempts:
+                raise
+            time.sleep(delay * 2 ** (attempt - 1))
+    raise ValueError("attempts must be at least 1.")
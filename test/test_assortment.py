@@ -0,0 +1,57 @@
+import pytest
+from typing import Dict
+from unittest.mock import patch
+from src.store.assortment import AssortmentChanges, roll_out, sync_assortment
+
+
+def test_sync_assortment_applies_difference_in_one_transaction() -> None:
+    """Test that desired links are copied to temp tables and applied with one DELETE and one INSERT."""
+    with patch('src.store.assortment.DBEngine') as mock_db_engine:
+        mock_db = mock_db_engine.return_value.__enter__.return_value
+        copied: Dict[str, str] = {}
+        mock_db.cursor.copy_from.side_effect = lambda buffer, table, columns: copied.setdefault(table, buffer.read())
+        rowcounts = iter([2, 5])
+        mock_db.cursor.execute.side_effect = lambda *args: setattr(mock_db.cursor, 'rowcount', next(rowcounts)) \
+            if args[0].lstrip().startswith(('DELETE', 'INSERT')) else None
+
+        changes = sync_assortment({1: [10, 11, 10], 2: []}, kind='food')
+
+    assert changes == AssortmentChanges(added=5, removed=2)
+    assert copied['assortment_stores'] == '1\n2\n'
+    assert sorted(copied['assortment_items'].splitlines()) == ['1\t10', '1\t11']
+    statements = [call[0][0] for call in mock_db.cursor.execute.call_args_list]
+    assert sum('DELETE FROM "StoreFoodProduct"' in sql for sql in statements) == 1
+    assert sum('INSERT INTO "StoreFoodProduct" ("StoreID", "FoodID")' in sql for sql in statements) == 1
+    mock_db.connection.commit.assert_called_once()
+
+
+def test_roll_out_without_prune_only_inserts() -> None:
+    """Test that a roll-out that keeps existing links never deletes."""
+    with patch('src.store.assortment.DBEngine') as mock_db_engine:
+        mock_db = mock_db_engine.return_value.__enter__.return_value
+        mock_db.cursor.rowcount = 6
+
+        changes = roll_out([1, 2, 3], [7, 8], kind='dry')
+
+    statements = [call[0][0] for call in mock_db.cursor.execute.call_args_list]
+    assert not any('DELETE' in sql for sql in statements)
+    assert changes == AssortmentChanges(added=6, removed=0)
+
+
+def test_sync_assortment_rolls_back_on_error() -> None:
+    """Test that a failing statement leaves the links untouched."""
+    with patch('src.store.assortment.DBEngine') as mock_db_engine:
+        mock_db = mock_db_engine.return_value.__enter__.return_value
+        mock_db.cursor.copy_from.side_effect = RuntimeError("bad row")
+
+        with pytest.raises(RuntimeError):
+            sync_assortment({1: [10]})
+
+    mock_db.connection.rollback.assert_called_once()
+    mock_db.connection.commit.assert_not_called()
+
+
+def test_unknown_kind() -> None:
+    """Test that only dry and food link tables are accepted."""
+    with pytest.raises(ValueError):
+        sync_assortment({1: [1]}, kind='frozen')
@@ -0,0 +1,52 @@
+import json
+import os
+import pytest
+from pathlib import Path
+from typing import List
+from unittest.mock import MagicMock, patch
+from psycopg2 import errors
+from src.benchmark.provision import throwaway_database
+from src.benchmark.suite import Result, compare, load_baseline, measure, percentile, save_baseline
+
+
+def test_percentile_and_measure() -> None:
+    """Test nearest-rank percentiles and that measured operations run warmup plus timed calls."""
+    samples = [float(value) for value in range(1, 101)]
+    assert (percentile(samples, 50), percentile(samples, 99), percentile([], 50)) == (50.0, 99.0, 0.0)
+
+    calls: List[None] = []
+    result = measure('noop', lambda: calls.append(print("hidden")), iterations=10, warmup=2)
+    assert len(calls) == 12 and result.operations == 10 and result.ops_per_sec > 0
+
+
+def test_baseline_round_trip_and_regressions(tmp_path: Path) -> None:
+    """Test that a saved baseline flags cases that got slower than the tolerance."""
+    path = str(tmp_path / 'baseline.json')
+    save_baseline(path, [Result('Worker.find_by_id', 100, 0.1, 1.0, 2.0), Result('Store.save (insert)', 100, 0.2, 2.0, 3.0)])
+    baseline = load_baseline(path)
+    assert json.loads((tmp_path / 'baseline.json').read_text())['Worker.find_by_id']['ops_per_sec'] == 1000.0
+
+    current = [Result('Worker.find_by_id', 100, 0.11, 1.1, 2.5), Result('Store.save (insert)', 100, 0.4, 4.0, 5.0),
+               Result('New case', 10, 1.0, 100.0, 100.0)]
+    regressions = compare(current, baseline, tolerance=0.2)
+    assert len(regressions) == 2 and all(line.startswith('Store.save (insert)') for line in regressions)
+    assert load_baseline(str(tmp_path / 'missing.json')) == {}
+
+
+@patch('src.benchmark.provision.create_tables')
+@patch('src.benchmark.provision.configure_pool')
+@patch('src.benchmark.provision.close_pool')
+@patch('src.benchmark.provision.drop_database')
+@patch('src.benchmark.provision.create_database')
+def test_throwaway_database_only_drops_what_it_created(mock_create: MagicMock, mock_drop: MagicMock, *mocks: MagicMock) -> None:
+    """Test that the database is dropped after the run, while an existing one is refused and left alone."""
+    with throwaway_database('SMS_benchmark_test') as name:
+        assert os.environ['DB_NAME'] == name
+    mock_drop.assert_called_once_with('SMS_benchmark_test')
+
+    mock_drop.reset_mock()
+    mock_create.side_effect = errors.DuplicateDatabase('database "SMS" already exists')
+    with pytest.raises(errors.DuplicateDatabase):
+        with throwaway_database('SMS'):
+            pass
+    mock_drop.assert_not_called()
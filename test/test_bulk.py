@@ -0,0 +1,73 @@
+from unittest.mock import patch, MagicMock
+from src.bulk import delete_by_ids, load_by_ids
+from src.cache import IdentityMap
+from src.person.worker import Worker
+from src.store.store import Store
+
+
+def test_load_by_ids_keeps_requested_order_and_chunks() -> None:
+    """Test that rows come back in the requested order, with one ANY() query per chunk."""
+    mock_engine = MagicMock()
+    mock_cursor = mock_engine.return_value.__enter__.return_value.cursor
+    mock_cursor.fetchall.side_effect = [[(1, 'a'), (3, 'c')], [(2, 'b')]]
+
+    rows = load_by_ids(mock_engine, 'SELECT "ID", "Name" FROM "T"', '"ID"', [3, 9, 1, 3, 2], lambda row: row, chunk_size=3)
+
+    assert rows == [(3, 'c'), (1, 'a'), (2, 'b')]
+    first, second = mock_cursor.execute.call_args_list
+    assert first[0] == ('SELECT "ID", "Name" FROM "T" WHERE "ID" = ANY(%s)', ([3, 9, 1],))
+    assert second[0][1] == ([2],)
+    mock_engine.assert_called_once()
+
+
+def test_load_by_ids_reads_only_uncached_ids() -> None:
+    """Test that IDs in the identity map are not queried and loaded rows are cached."""
+    cache: IdentityMap[str] = IdentityMap()
+    cache.put(1, 'cached')
+    mock_engine = MagicMock()
+    mock_cursor = mock_engine.return_value.__enter__.return_value.cursor
+    mock_cursor.fetchall.return_value = [(2, 'b')]
+
+    assert load_by_ids(mock_engine, 'SELECT "ID" FROM "T"', '"ID"', [1, 2], lambda row: row[1], cache) == ['cached', 'b']
+    assert mock_cursor.execute.call_args[0][1] == ([2],)
+    assert cache.get(2) == 'b'
+
+
+def test_delete_by_ids_commits_once_and_invalidates() -> None:
+    """Test that chunked deletes run in one transaction and drop cached entries, also ones cached mid-delete."""
+    cache: IdentityMap[object] = IdentityMap()
+    cache.put(4, object())
+    mock_engine = MagicMock()
+    mock_db = mock_engine.return_value.__enter__.return_value
+    mock_db.cursor.rowcount = 2
+    mock_db.connection.commit.side_effect = lambda: cache.put(5, object())
+
+    assert delete_by_ids(mock_engine, '"T"', '"ID"', [4, 5, 6, 4], cache, chunk_size=2) == 4
+    assert mock_db.cursor.execute.call_count == 2
+    mock_db.connection.commit.assert_called_once()
+    assert 4 not in cache and 5 not in cache
+    assert delete_by_ids(mock_engine, '"T"', '"ID"', []) == 0
+
+
+def test_worker_find_by_ids() -> None:
+    """Test that Worker.find_by_ids hydrates workers in the requested order."""
+    Worker.cache.clear()
+    with patch('src.person.worker.DBEngine') as mock_db_engine:
+        mock_cursor = mock_db_engine.return_value.__enter__.return_value.cursor
+        mock_cursor.fetchall.return_value = [(7, 'Ona', 1, 'o@x.lt', 'LT', 10, 5, 1, 1), (3, 'Jonas', 2, 'j@x.lt', 'LT', 12, 8, 1, 4)]
+
+        workers = Worker.find_by_ids([3, 7])
+
+    assert [worker.id for worker in workers] == [3, 7]
+    assert (workers[0].name, workers[0].version) == ('Jonas', 4)
+    Worker.cache.clear()
+
+
+def test_store_delete_many() -> None:
+    """Test that Store.delete_many issues a single ANY() delete."""
+    with patch('src.store.store.DBEngine') as mock_db_engine:
+        mock_db = mock_db_engine.return_value.__enter__.return_value
+        mock_db.cursor.rowcount = 2
+
+        assert Store.delete_many([1, 2]) == 2
+        mock_db.cursor.execute.assert_called_once_with('DELETE FROM "Store" WHERE "StoreID" = ANY(%s)', ([1, 2],))
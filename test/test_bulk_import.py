@@ -0,0 +1,77 @@
+import io
+import pytest
+from typing import Any, Dict
+from unittest.mock import patch, MagicMock
+from src.product.bulk_import import bulk_import_csv
+
+
+def run_import(kind: str, csv_text: str, rejects: Any = None) -> Dict[str, Any]:
+    """Run a bulk import against a mocked DBEngine and capture what COPY received."""
+    captured: Dict[str, Any] = {}
+
+    def fake_copy(sql: str, stream: Any, size: int = 8192) -> None:
+        captured['sql'] = sql
+        chunks = []
+        while True:
+            chunk = stream.read(size)
+            if not chunk:
+                break
+            chunks.append(chunk)
+        captured['data'] = ''.join(chunks)
+
+    with patch('src.product.bulk_import.DBEngine') as mock_db_engine:
+        mock_instance = MagicMock()
+        mock_db_engine.return_value.__enter__.return_value = mock_instance
+        mock_instance.cursor.copy_expert.side_effect = fake_copy
+        captured['report'] = bulk_import_csv(kind, io.StringIO(csv_text), rejects)
+        captured['connection'] = mock_instance.connection
+    return captured
+
+
+def test_import_dry_storage_items() -> None:
+    """Test that valid dry storage rows are streamed to COPY and committed."""
+    result = run_import('dry', "name,amount,price,recipe_item,chemical,package_type\n"
+                               "Flour,10,5,yes,no,Bag\n"
+                               "Bleach,3,7,no,yes,\n")
+
+    assert result['sql'] == ('COPY "Dry Storage Item" ("Name", "Amount", "Price", "RecipeItem", "Chemical", '
+                             '"PackageType") FROM STDIN WITH (FORMAT csv)')
+    assert result['data'] == "Flour,10,5,True,False,Bag\nBleach,3,7,False,True,\n"
+    assert result['report'].accepted == 2
+    assert result['report'].rejected_count == 0
+    result['connection'].commit.assert_called_once()
+
+
+def test_import_food_items_rejects_invalid_rows() -> None:
+    """Test that invalid rows are skipped and reported with their line number."""
+    rejects = io.StringIO()
+    result = run_import('food', "Name,Amount,Price,StorageCondition,ExpiryDate\n"
+                                "Milk,4,2,Cold,2025-01-31\n"
+                                "Cheese,-1,9,Cold,2025-02-01\n"
+                                "Bread,2,1,Dry,tomorrow\n", rejects)
+
+    report = result['report']
+    assert result['data'] == "Milk,4,2,Cold,2025-01-31\n"
+    assert report.accepted == 1
+    assert report.rejected_count == 2
+    assert report.rejected[0] == (3, "Amount: must not be negative")
+    assert report.rejected[1][0] == 4
+    assert rejects.getvalue().startswith("Cheese,-1,9,Cold,2025-02-01,Amount: must not be negative")
+
+
+def test_rejected_line_numbers_follow_multiline_fields() -> None:
+    """Test that a rejected row is reported at its file line when an earlier quoted field spans lines."""
+    result = run_import('food', "Name,Amount,Price,StorageCondition,ExpiryDate\n"
+                                '"Milk\n2.5%",4,2,Cold,2025-01-31\n'
+                                "Cheese,-1,9,Cold,2025-02-01\n")
+
+    assert result['report'].accepted == 1
+    assert result['report'].rejected == [(4, "Amount: must not be negative")]
+
+
+def test_import_missing_column() -> None:
+    """Test that a header without a required column is rejected before COPY starts."""
+    with patch('src.product.bulk_import.DBEngine') as mock_db_engine:
+        with pytest.raises(ValueError):
+            bulk_import_csv('food', io.StringIO("Name,Amount,Price\nMilk,1,2\n"))
+        mock_db_engine.assert_not_called()
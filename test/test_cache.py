@@ -0,0 +1,67 @@
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch, MagicMock
+from src.cache import IdentityMap
+
+
+class TestIdentityMap(unittest.TestCase):
+    """Test suite for the IdentityMap read-through cache."""
+
+    def test_hit_and_miss_counters(self) -> None:
+        """Test that lookups are counted as hits or misses."""
+        cache: IdentityMap[str] = IdentityMap()
+        self.assertIsNone(cache.get(1))
+        cache.put(1, 'item')
+
+        self.assertEqual(cache.get(1), 'item')
+        self.assertEqual(cache.stats()['hits'], 1)
+        self.assertEqual(cache.stats()['misses'], 1)
+        self.assertEqual(cache.hit_rate, 0.5)
+
+    def test_least_recently_used_evicted(self) -> None:
+        """Test that the least recently used entry is evicted when the map is full."""
+        cache: IdentityMap[str] = IdentityMap(max_size=2)
+        cache.put(1, 'a')
+        cache.put(2, 'b')
+        cache.get(1)
+        cache.put(3, 'c')
+
+        self.assertIn(1, cache)
+        self.assertNotIn(2, cache)
+        self.assertEqual(cache.evictions, 1)
+
+    @patch('src.cache.time.monotonic')
+    def test_entry_expires_after_ttl(self, mock_monotonic: MagicMock) -> None:
+        """Test that entries older than the TTL are treated as misses."""
+        mock_monotonic.return_value = 100.0
+        cache: IdentityMap[str] = IdentityMap(ttl=10)
+        cache.put(1, 'a')
+
+        mock_monotonic.return_value = 111.0
+        self.assertIsNone(cache.get(1))
+        self.assertEqual(len(cache), 0)
+
+    def test_invalidate(self) -> None:
+        """Test that invalidated keys are no longer returned."""
+        cache: IdentityMap[str] = IdentityMap()
+        cache.put(1, 'a')
+        cache.invalidate(1)
+        cache.invalidate(2)
+
+        self.assertIsNone(cache.get(1))
+
+    def test_instances_copied_in_and_out(self) -> None:
+        """Test that callers editing a stored or returned instance do not change the cached entry."""
+        cache: IdentityMap[SimpleNamespace] = IdentityMap()
+        stored = SimpleNamespace(amount=1)
+        cache.put(1, stored)
+        stored.amount = 2
+        first = cache.get(1)
+        assert first is not None
+        first.amount = 3
+
+        self.assertEqual(cache.get(1), SimpleNamespace(amount=1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,18 @@
+import threading
 import unittest
+from typing import List
 from unittest.mock import patch, MagicMock
-from src.db_engine import DBEngine
+from psycopg2 import extensions
+from src.db_engine import DBEngine, ConnectionPool, PoolTimeoutError
+
+
+def make_connection() -> MagicMock:
+    """Create a mock connection that looks open and idle to the pool."""
+    conn = MagicMock()
+    conn.closed = 0
+    conn.autocommit = False
+    conn.info.transaction_status = extensions.TRANSACTION_STATUS_IDLE
+    return conn
 
 class TestDBEngine(unittest.TestCase):
     """Test suite for the DBEngine class."""
@@ -33,7 +45,7 @@ class TestDBEngine(unittest.TestCase):
             - The connection close method is called once.
             - The cursor close method is called once.
         """
-        mock_conn = MagicMock()
+        mock_conn = make_connection()
         mock_cursor = MagicMock()
         mock_connect.return_value = mock_conn
         mock_conn.cursor.return_value = mock_cursor
@@ -47,5 +59,118 @@ class TestDBEngine(unittest.TestCase):
             db.cursor.close()
             mock_cursor.close.assert_called_once()
 
+
+class TestConnectionPool(unittest.TestCase):
+    """Test suite for the ConnectionPool used behind DBEngine."""
+
+    @patch('src.db_engine.psycopg2.connect')
+    def test_connection_reused(self, mock_connect: MagicMock) -> None:
+        """Test that a returned connection is handed out again instead of reconnecting."""
+        mock_connect.side_effect = lambda **kwargs: make_connection()
+        pool = ConnectionPool(min_size=1, max_size=2)
+
+        with DBEngine(pool=pool) as db:
+            first = db.connection
+        with DBEngine(pool=pool) as db:
+            second = db.connection
+
+        self.assertIs(first, second)
+        self.assertEqual(mock_connect.call_count, 1)
+        self.assertEqual(pool.checkouts, 2)
+
+    @patch('src.db_engine.psycopg2.connect')
+    def test_open_transaction_rolled_back_on_return(self, mock_connect: MagicMock) -> None:
+        """Test that a connection returned mid-transaction is rolled back before reuse."""
+        conn = make_connection()
+        conn.info.transaction_status = extensions.TRANSACTION_STATUS_INTRANS
+        mock_connect.return_value = conn
+        pool = ConnectionPool()
+
+        with DBEngine(pool=pool):
+            pass
+
+        conn.rollback.assert_called_once()
+
+    @patch('src.db_engine.psycopg2.connect')
+    def test_idle_connection_evicted(self, mock_connect: MagicMock) -> None:
+        """Test that surplus connections idle past the timeout are closed."""
+        mock_connect.side_effect = lambda **kwargs: make_connection()
+        pool = ConnectionPool(min_size=0, max_size=2, idle_timeout=0)
+
+        first = pool.getconn()
+        pool.putconn(first)
+        second = pool.getconn()
+
+        self.assertIsNot(first, second)
+        first.close.assert_called_once()
+
+    @patch('src.db_engine.psycopg2.connect')
+    def test_unhealthy_connection_replaced(self, mock_connect: MagicMock) -> None:
+        """Test that a connection failing the health check is replaced on checkout."""
+        mock_connect.side_effect = lambda **kwargs: make_connection()
+        pool = ConnectionPool(ping_after=0)
+
+        first = pool.getconn()
+        pool.putconn(first)
+        first.cursor.return_value.__enter__.return_value.execute.side_effect = Exception("server closed")
+        second = pool.getconn()
+
+        self.assertIsNot(first, second)
+        self.assertEqual(mock_connect.call_count, 2)
+
+    @patch('src.db_engine.psycopg2.connect')
+    def test_min_size_opened_up_front(self, mock_connect: MagicMock) -> None:
+        """Test that the pool opens min_size connections when it is created."""
+        mock_connect.side_effect = lambda **kwargs: make_connection()
+        pool = ConnectionPool(min_size=2, max_size=3)
+
+        self.assertEqual(mock_connect.call_count, 2)
+        self.assertEqual(pool.size, 2)
+        pool.getconn()
+        pool.getconn()
+        self.assertEqual(mock_connect.call_count, 2)
+
+    @patch('src.db_engine.psycopg2.connect')
+    def test_health_check_runs_without_pool_lock(self, mock_connect: MagicMock) -> None:
+        """Test that the SELECT 1 ping does not hold the lock other checkouts and returns need."""
+        mock_connect.side_effect = lambda **kwargs: make_connection()
+        pool = ConnectionPool(min_size=1, ping_after=0)
+        lock_free_during_ping: List[bool] = []
+
+        def probe_lock(query: str) -> None:
+            # Try the lock from another thread, as a concurrent checkout would.
+            def try_acquire() -> None:
+                acquired = pool._condition.acquire(blocking=False)
+                if acquired:
+                    pool._condition.release()
+                lock_free_during_ping.append(acquired)
+
+            thread = threading.Thread(target=try_acquire)
+            thread.start()
+            thread.join()
+
+        conn = pool._idle[0][0]
+        conn.cursor.return_value.__enter__.return_value.execute.side_effect = probe_lock
+
+        self.assertIs(pool.getconn(), conn)
+        self.assertEqual(lock_free_during_ping, [True])
+        self.assertEqual(pool.size, 1)
+
+    @patch('src.db_engine.psycopg2.connect')
+    def test_pool_exhausted(self, mock_connect: MagicMock) -> None:
+        """Test that checkout times out when every connection is in use."""
+        mock_connect.side_effect = lambda **kwargs: make_connection()
+        pool = ConnectionPool(min_size=0, max_size=1, checkout_timeout=0.01)
+
+        pool.getconn()
+        with self.assertRaises(PoolTimeoutError):
+            pool.getconn()
+
+    def test_invalid_sizes(self) -> None:
+        """Test that inconsistent pool sizes are rejected."""
+        with self.assertRaises(ValueError):
+            ConnectionPool(min_size=5, max_size=2)
+
+
 if __name__ == '__main__':
     unittest.main()
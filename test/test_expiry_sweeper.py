@@ -0,0 +1,53 @@
+import pytest
+from typing import List, Tuple
+from unittest.mock import MagicMock
+from src.cache import IdentityMap
+from src.product.expiry_sweeper import ExpirySweeper, SweepReport
+
+
+def make_engine(*batches: List[Tuple[int]]) -> MagicMock:
+    """Create a DBEngine factory mock whose sweep statement returns the given batches of IDs."""
+    engine = MagicMock()
+    engine.return_value.__enter__.return_value.cursor.fetchall.side_effect = list(batches)
+    return engine
+
+
+def test_sweep_runs_until_short_batch() -> None:
+    """Test that full batches continue the sweep and a short batch finishes it."""
+    engine = make_engine([(1,), (2,)], [(3,), (4,)], [(5,)])
+    cache: IdentityMap[object] = IdentityMap()
+    cache.put(3, object())
+
+    report = ExpirySweeper('2024-05-01', batch_size=2, pause=0, engine=engine, cache=cache).run()
+
+    assert (report.archived, report.batches, report.finished) == (5, 3, True)
+    db = engine.return_value.__enter__.return_value
+    assert db.connection.commit.call_count == 3
+    assert db.cursor.execute.call_args[0][1] == ('2024-05-01', 2)
+    assert 3 not in cache
+
+
+def test_sweep_stops_after_max_batches() -> None:
+    """Test that max_batches leaves the remaining rows for the next run."""
+    engine = make_engine([(1,), (2,)], [(3,), (4,)])
+
+    report = ExpirySweeper('2024-05-01', batch_size=2, pause=0, engine=engine).run(max_batches=1)
+
+    assert (report.archived, report.finished) == (2, False)
+    assert engine.call_count == 1
+
+
+def test_sweep_in_background_thread() -> None:
+    """Test that start() runs the sweep off the calling thread and reports when done."""
+    engine = make_engine([])
+    done: List[SweepReport] = []
+
+    ExpirySweeper(batch_size=10, pause=0, engine=engine).start(on_done=done.append).join(5)
+
+    assert len(done) == 1 and done[0].finished
+
+
+def test_invalid_batch_size() -> None:
+    """Test that a non-positive batch size is rejected."""
+    with pytest.raises(ValueError):
+        ExpirySweeper(batch_size=0)
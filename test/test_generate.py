@@ -0,0 +1,48 @@
+from collections import Counter
+from src.benchmark.generate import PHASES, TABLES, RowStream, Volumes, make_plan, rows
+
+VOLUMES = Volumes(responsibilities=5, stores=20, dry_items=300, food_items=300, store_managers=20, managers=30,
+                  workers=500, dry_links=2000, food_links=2000, responsibilities_per_store_manager=2)
+
+
+def test_rows_are_deterministic_and_reference_valid_keys() -> None:
+    """Test that a seed always yields the same rows and every foreign key points at an existing or new row."""
+    plan = make_plan(VOLUMES, 7, 1.1, {'Store': 3, 'Responsibilities': 2}, [3, 1, 2], [1, 2])
+    generated = {table: list(rows(plan, table)) for phase in PHASES for table in phase}
+    assert generated == {table: list(rows(plan, table)) for table in TABLES}
+    assert generated['Worker'] != list(rows(plan._replace(seed=8), 'Worker'))
+
+    assert [row[0] for row in generated['Store']] == list(range(4, 24))
+    stores = {1, 2, 3} | {row[0] for row in generated['Store']}
+    responsibilities = {1, 2} | {row[0] for row in generated['Responsibilities']}
+    dry_items = {row[0] for row in generated['Dry Storage Item']}
+    store_managers = {row[0] for row in generated['Store Manager']}
+    assert all(row[-1] in stores for row in generated['Worker'])
+    assert all(row[6] in responsibilities and row[7] in stores for row in generated['Manager'])
+    assert all(row[0] in responsibilities and row[1] in store_managers for row in generated['SM Responsibilities'])
+    assert all(store in stores and item in dry_items for store, item in generated['StoreDryProduct'])
+    assert len(set(generated['StoreDryProduct'])) == len(generated['StoreDryProduct'])
+    assert len(set(generated['SM Responsibilities'])) == len(generated['SM Responsibilities'])
+
+
+def test_store_sizes_are_skewed() -> None:
+    """Test that the first stores get far more staff and products than the median store."""
+    plan = make_plan(VOLUMES, 42, 1.1, {}, [], [])
+    workers = Counter(row[-1] for row in rows(plan, 'Worker'))
+    products = Counter(store for store, _ in rows(plan, 'StoreFoodProduct'))
+    assert workers[1] > 5 * sorted(workers.values())[len(workers) // 2]
+    assert products[1] > 5 * products[10]
+
+
+def test_row_stream_writes_copy_text_format() -> None:
+    """Test that rows are streamed as tab-separated COPY lines in chunks of the requested size."""
+    stream = RowStream([(1, 'Dry item 1', True, None), (2, 'Dry item 2', False, 3)])
+    data = b''
+    while True:
+        chunk = stream.read(7)
+        if not chunk:
+            break
+        assert len(chunk) <= 7
+        data += chunk
+    assert data == b'1\tDry item 1\tt\t\\N\n2\tDry item 2\tf\t3\n'
+    assert stream.count == 2
@@ -0,0 +1,109 @@
+import threading
+import pytest
+from typing import Any, List, Tuple
+from unittest.mock import MagicMock, patch
+from src.cache import IdentityMap
+from src.person.hours_buffer import HoursBuffer
+
+
+def make_engine() -> MagicMock:
+    """Create a DBEngine factory mock."""
+    engine = MagicMock()
+    engine.return_value.__enter__.return_value.connection = MagicMock()
+    return engine
+
+
+def test_increments_are_coalesced_into_one_update() -> None:
+    """Test that repeated increments per worker become one row of a single batched UPDATE."""
+    engine = make_engine()
+    cache: IdentityMap[object] = IdentityMap()
+    cache.put(7, object())
+    buffer = HoursBuffer(engine=engine, cache=cache)
+    for worker_id, hours in [(7, 1), (3, 2), (7, 4), (3, 1), (7, 2)]:
+        buffer.record(worker_id, hours)
+
+    with patch('src.person.hours_buffer.execute_values', return_value=[(3,), (7,)]) as mock_execute_values:
+        assert buffer.flush() == 2
+
+    query, values = mock_execute_values.call_args[0][1:3]
+    assert 'UPDATE "Worker"' in query and '"AmountWorked" = w."AmountWorked" + v.hours' in query
+    assert values == [(3, 3), (7, 7)]
+    assert engine.call_count == 1
+    assert buffer.pending == {}
+    assert buffer.stats.coalescing_ratio == 2.5
+    assert 7 not in cache
+
+
+def test_full_buffer_flushes_immediately() -> None:
+    """Test that reaching max_pending workers triggers a flush from record()."""
+    buffer = HoursBuffer(max_pending=2, engine=make_engine())
+
+    with patch('src.person.hours_buffer.execute_values', return_value=[(1,), (2,)]) as mock_execute_values:
+        buffer.record(1, 1)
+        buffer.record(1, 1)
+        mock_execute_values.assert_not_called()
+        buffer.record(2, 1)
+
+    mock_execute_values.assert_called_once()
+    assert buffer.stats.flushes == 1
+
+
+def test_failed_flush_keeps_hours_buffered() -> None:
+    """Test that hours survive a failed flush and are merged with later increments."""
+    engine = make_engine()
+    buffer = HoursBuffer(engine=engine)
+    buffer.record(5, 3)
+
+    with patch('src.person.hours_buffer.execute_values', side_effect=Exception("connection lost")):
+        with pytest.raises(Exception):
+            buffer.flush()
+    buffer.record(5, 1)
+
+    engine.return_value.__enter__.return_value.connection.rollback.assert_called_once()
+    assert buffer.pending == {5: 4}
+    assert buffer.stats.failures == 1
+
+
+def test_stop_flushes_remaining_hours() -> None:
+    """Test that stopping the background flusher writes what is still buffered."""
+    buffer = HoursBuffer(interval=60, engine=make_engine())
+    buffer.start()
+    buffer.record(9, 8)
+
+    with patch('src.person.hours_buffer.execute_values', return_value=[(9,)]) as mock_execute_values:
+        buffer.stop(5)
+
+    assert not buffer.running
+    assert mock_execute_values.call_args[0][2] == [(9, 8)]
+
+
+def test_full_buffer_wakes_background_flusher() -> None:
+    """Test that a full buffer is flushed by the running flusher rather than in the recording thread."""
+    buffer = HoursBuffer(interval=60, max_pending=1, engine=make_engine())
+    flushed = threading.Event()
+    threads = []
+
+    def fake_execute_values(*args: Any, **kwargs: Any) -> List[Tuple[int]]:
+        threads.append(threading.current_thread())
+        flushed.set()
+        return [(4,)]
+
+    with patch('src.person.hours_buffer.execute_values', side_effect=fake_execute_values):
+        buffer.start()
+        buffer.record(4, 2)
+        assert flushed.wait(5)
+        buffer.stop(5)
+
+    assert threads[0] is not threading.current_thread()
+    assert buffer.stats.rows_written == 1
+
+
+def test_full_buffer_without_flusher_keeps_hours_on_error(capsys: pytest.CaptureFixture[str]) -> None:
+    """Test that record() does not raise database errors into the caller and keeps the hours."""
+    buffer = HoursBuffer(max_pending=1, engine=make_engine())
+
+    with patch('src.person.hours_buffer.execute_values', side_effect=Exception("connection lost")):
+        buffer.record(5, 3)
+
+    assert buffer.pending == {5: 3}
+    assert "connection lost" in capsys.readouterr().out
@@ -0,0 +1,56 @@
+import datetime
+from unittest.mock import patch
+from src.store import inventory_view
+
+
+def test_refresh_concurrently_records_time() -> None:
+    """Test that a refresh rebuilds the view and stamps the refresh table in one transaction."""
+    with patch('src.store.inventory_view.DBEngine') as mock_db_engine:
+        mock_db = mock_db_engine.return_value.__enter__.return_value
+
+        inventory_view.refresh()
+
+    first, second = mock_db.cursor.execute.call_args_list
+    assert first[0][0] == 'REFRESH MATERIALIZED VIEW CONCURRENTLY "Store Inventory"'
+    assert '"Materialized View Refresh"' in second[0][0]
+    mock_db.connection.commit.assert_called_once()
+
+
+def test_refresh_blocking() -> None:
+    """Test that concurrently=False issues a plain refresh."""
+    with patch('src.store.inventory_view.DBEngine') as mock_db_engine:
+        mock_db = mock_db_engine.return_value.__enter__.return_value
+
+        inventory_view.refresh(concurrently=False)
+
+    assert mock_db.cursor.execute.call_args_list[0][0][0] == 'REFRESH MATERIALIZED VIEW "Store Inventory"'
+
+
+def test_is_stale() -> None:
+    """Test that staleness compares the snapshot age with the allowed age."""
+    with patch('src.store.inventory_view.DBEngine') as mock_db_engine:
+        mock_cursor = mock_db_engine.return_value.__enter__.return_value.cursor
+        mock_cursor.fetchone.return_value = (datetime.timedelta(minutes=20),)
+
+        assert inventory_view.is_stale(datetime.timedelta(minutes=15))
+        assert not inventory_view.is_stale(datetime.timedelta(hours=1))
+
+        mock_cursor.fetchone.return_value = None
+        assert inventory_view.is_stale(datetime.timedelta(hours=1))
+
+
+def test_store_inventory_reads_view() -> None:
+    """Test that a store's stock is read from the view, optionally by kind."""
+    row = (1, 'food', 7, 'Milk', 10, 2, 20, None, None, None, 'Cold', datetime.date(2024, 5, 1))
+    with patch('src.store.inventory_view.DBEngine') as mock_db_engine:
+        mock_cursor = mock_db_engine.return_value.__enter__.return_value.cursor
+        mock_cursor.fetchall.return_value = [row]
+
+        lines = inventory_view.store_inventory(1, kind='food')
+
+    query, params = mock_cursor.execute.call_args[0]
+    assert 'FROM "Store Inventory"' in query
+    assert params == [1, 'food']
+    assert lines[0].value == 20
+    assert inventory_view.format_line(lines[0]) == (
+        "Food ID: 7, Name: Milk, Amount: 10, Price: 2, Value: 20, Storage Condition: Cold, Expiry Date: 2024-05-01")
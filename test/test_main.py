@@ -1,6 +1,7 @@
 import unittest
 from unittest.mock import patch, MagicMock
 from src.main import main_menu, product_menu, store_menu, structure_menu, people_menu
+from src.SMS_DB.migrate import PendingMigrationsError
 
 class TestMainMenu(unittest.TestCase):
     """Unit tests for menu functions in the src.main module."""
@@ -20,11 +21,12 @@ class TestMainMenu(unittest.TestCase):
         mock_manage_store_menu.assert_called_once()
         mock_manage_store_items_menu.assert_called_once()
 
+    @patch('src.main.payroll_menu')
     @patch('src.main.Manager.manage_managers')
     @patch('src.main.Worker.manage_workers')
     @patch('src.main.manage_store_manager_menu')
-    @patch('builtins.input', side_effect=['1', '2', '3', '4'])
-    def test_people_menu(self, mock_input: MagicMock, mock_manage_managers: MagicMock, mock_manage_workers: MagicMock, mock_manage_store_manager_menu: MagicMock) -> None:
+    @patch('builtins.input', side_effect=['1', '2', '3', '4', '5'])
+    def test_people_menu(self, mock_input: MagicMock, mock_manage_managers: MagicMock, mock_manage_workers: MagicMock, mock_manage_store_manager_menu: MagicMock, mock_payroll_menu: MagicMock) -> None:
         """Test the people_menu function.
 
         Args:
@@ -32,11 +34,13 @@ class TestMainMenu(unittest.TestCase):
             mock_manage_managers (MagicMock): Mocked manage_managers function.
             mock_manage_workers (MagicMock): Mocked manage_workers function.
             mock_manage_store_manager_menu (MagicMock): Mocked manage_store_manager_menu function.
+            mock_payroll_menu (MagicMock): Mocked payroll_menu function.
         """
         people_menu()
         mock_manage_managers.assert_called_once()
         mock_manage_workers.assert_called_once()
         mock_manage_store_manager_menu.assert_called_once()
+        mock_payroll_menu.assert_called_once()
 
     @patch('src.main.manage_dry_storage_items')
     @patch('src.main.manage_food_items')
@@ -65,5 +69,20 @@ class TestMainMenu(unittest.TestCase):
         structure_menu()
         mock_list_tables.assert_called_once()
 
+    @patch('src.main.check_migrations', side_effect=PendingMigrationsError(['005_row_versions']))
+    @patch('src.main.store_menu')
+    @patch('builtins.input', side_effect=['1', '7'])
+    def test_main_menu_requires_migrations(self, mock_input: MagicMock, mock_store_menu: MagicMock, mock_check_migrations: MagicMock) -> None:
+        """Test that the data menus are not opened while migrations are pending.
+
+        Args:
+            mock_input (MagicMock): Mocked built-in input function to simulate user choices.
+            mock_store_menu (MagicMock): Mocked store_menu function.
+            mock_check_migrations (MagicMock): Mocked check_migrations reporting a pending migration.
+        """
+        with self.assertRaises(SystemExit):
+            main_menu()
+        mock_store_menu.assert_not_called()
+
 if __name__ == "__main__":
     unittest.main()
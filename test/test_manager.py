@@ -55,8 +55,8 @@ def test_update_manager() -> None:
         expected_sql = " ".join((
             "UPDATE \"Manager\"",
             "SET \"Name\" = %s, \"PhoneNumber\" = %s, \"Email\" = %s, \"Country\" = %s,",
-            "\"MonthlySalary\" = %s, \"StoreID\" = %s",
-            "WHERE \"ManagerID\" = %s"
+            "\"MonthlySalary\" = %s, \"StoreID\" = %s, \"Version\" = \"Version\" + 1",
+            "WHERE \"ManagerID\" = %s RETURNING \"Version\""
         )).strip()
 
         actual_sql = " ".join(mock_db_instance.cursor.execute.call_args[0][0].split()).strip()
@@ -110,15 +110,14 @@ def test_view_all_managers(capsys: pytest.CaptureFixture[str]) -> None:
 
 def test_display_all_salaries(capsys: pytest.CaptureFixture[str]) -> None:
     """Test displaying all managers' salaries."""
-    with patch('src.person.manager.DBEngine') as mock_db_engine:
+    with patch('src.person.payroll.DBEngine') as mock_db_engine:
         mock_db_instance = MagicMock()
         mock_db_engine.return_value.__enter__.return_value = mock_db_instance
-        mock_db_instance.cursor.fetchall.return_value = [
-            (49, 'Petras', 37064999999, 'petras@example.com', 'Latvia', 1800, 5)
-        ]
+        mock_db_instance.cursor.fetchall.return_value = [(49, 'Petras', 1800)]
 
         Manager.display_all_salaries()
 
         captured = capsys.readouterr()
-        assert "List of All Managers:" in captured.out
-        assert "ID: 49, Name: Petras, Phone: 37064999999, Email: petras@example.com, Country: Latvia, Salary: 1800, Store ID: 5" in captured.out
+        assert "Salaries of All Managers:" in captured.out
+        assert "ID: 49, Name: Petras, Salary: 1800" in captured.out
+        assert '"MonthlySalary"::BIGINT FROM "Manager"' in mock_db_instance.cursor.execute.call_args[0][0]
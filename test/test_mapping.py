@@ -0,0 +1,31 @@
+from src.person.responsibilities import Responsibilities
+from src.person.worker import Worker
+from src.product.product import FoodItem
+from src.store.store import Store
+
+
+def test_statements_are_compiled_per_class() -> None:
+    """Test that each mapped class gets its CRUD statements from the declared columns."""
+    assert Store.SQL.select_by_id == 'SELECT "StoreID", "StoreName" FROM "Store" WHERE "StoreID" = %s'
+    assert Store.SQL.update == 'UPDATE "Store" SET "StoreName" = %s WHERE "StoreID" = %s'
+    assert Responsibilities.SQL.insert == \
+        'INSERT INTO "Responsibilities" ("ResponsibilityName") VALUES (%s) RETURNING "ResponsibilityID"'
+    assert FoodItem.SQL.columns == \
+        '"FoodItemID", "Name", "Amount", "Price", "StorageCondition", "ExpiryDate", "Version"'
+
+
+def test_from_row_hydrates_clean_instances() -> None:
+    """Test that rows map onto constructor arguments and versioned models remember the version."""
+    worker = Worker.from_row((7, "Ona", 1, "ona@example.lt", "Lithuania", 10, 5, 2, 3))
+
+    assert (worker.id, worker.name, worker.hourly_rate, worker.store_id) == (7, "Ona", 10, 2)
+    assert worker.version == 3 and not worker.is_dirty
+    assert Store.from_row((4, "Vilnius")).store_id == 4
+
+    worker.amount_worked = 6
+    worker.name = "Ona K."
+    assert worker._update_statement() == (
+        'UPDATE "Worker" SET "Name" = %s, "AmountWorked" = %s, "Version" = "Version" + 1 '
+        'WHERE "WorkerID" = %s AND "Version" = %s RETURNING "Version"',
+        ("Ona K.", 6, 7, 3))
+    assert Worker._update_statements[(('Name', 'AmountWorked'), True)] == worker._update_statement()[0]
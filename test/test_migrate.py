@@ -0,0 +1,90 @@
+import os
+import pytest
+from typing import Any
+from unittest.mock import patch, MagicMock
+from src.SMS_DB.migrate import (PendingMigrationsError, apply_migrations, available_migrations, check_migrations,
+                                split_statements)
+
+
+def write(directory: Any, name: str, content: str) -> None:
+    """Create a migration file in the given directory."""
+    with open(os.path.join(directory, name), 'w') as file:
+        file.write(content)
+
+
+def test_available_migrations_sorted_by_number(tmp_path: Any) -> None:
+    """Test that migrations are ordered numerically and other files are ignored."""
+    write(tmp_path, '010_later.sql', '')
+    write(tmp_path, '002_earlier.sql', '')
+    write(tmp_path, 'notes.txt', '')
+
+    assert [version for version, _ in available_migrations(str(tmp_path))] == ['002_earlier', '010_later']
+
+
+def test_split_statements_skips_comments() -> None:
+    """Test that no-transaction migrations are split into single statements."""
+    sql = "-- migrate: no-transaction\nCREATE INDEX CONCURRENTLY a ON t (x);\nCREATE INDEX CONCURRENTLY b\n    ON t (y);\n"
+
+    assert split_statements(sql) == ['CREATE INDEX CONCURRENTLY a ON t (x)', 'CREATE INDEX CONCURRENTLY b\n    ON t (y)']
+
+
+def test_apply_migrations_runs_pending_only(tmp_path: Any) -> None:
+    """Test that applied versions are skipped and no-transaction files run in autocommit."""
+    write(tmp_path, '001_tables.sql', 'ALTER TABLE t ADD COLUMN x INTEGER;')
+    write(tmp_path, '002_index.sql', '-- migrate: no-transaction\nCREATE INDEX CONCURRENTLY i ON t (x);\n')
+    write(tmp_path, '003_other.sql', 'SELECT 1;')
+
+    with patch('src.SMS_DB.migrate.DBEngine') as mock_db_engine:
+        mock_db = mock_db_engine.return_value.__enter__.return_value
+        mock_db.cursor.fetchall.return_value = [('001_tables',)]
+        autocommit_modes = []
+        mock_db.cursor.execute.side_effect = lambda *args: autocommit_modes.append((args[0], mock_db.connection.autocommit))
+
+        applied = apply_migrations(directory=str(tmp_path))
+
+    assert applied == ['002_index', '003_other']
+    assert ('CREATE INDEX CONCURRENTLY i ON t (x)', True) in autocommit_modes
+    assert ('SELECT 1;', False) in autocommit_modes
+    assert not any('ALTER TABLE' in sql for sql, _ in autocommit_modes)
+
+
+def test_apply_migrations_stops_on_failure(tmp_path: Any) -> None:
+    """Test that a failing migration is rolled back and not recorded."""
+    write(tmp_path, '001_broken.sql', 'BROKEN;')
+    write(tmp_path, '002_next.sql', 'SELECT 1;')
+
+    with patch('src.SMS_DB.migrate.DBEngine') as mock_db_engine:
+        mock_db = mock_db_engine.return_value.__enter__.return_value
+        mock_db.cursor.fetchall.return_value = []
+
+        def execute(sql: str, *args: Any) -> None:
+            if sql == 'BROKEN;':
+                raise RuntimeError("syntax error")
+
+        mock_db.cursor.execute.side_effect = execute
+        with pytest.raises(RuntimeError):
+            apply_migrations(directory=str(tmp_path))
+
+    mock_db.connection.rollback.assert_called_once()
+    assert not any('SELECT 1;' == call[0][0] for call in mock_db.cursor.execute.call_args_list)
+
+
+def test_check_migrations_reports_pending_once_until_applied(tmp_path: Any, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that pending migrations raise a clear error and a passing check is not repeated."""
+    write(tmp_path, '001_tables.sql', '')
+    write(tmp_path, '002_versions.sql', '')
+    monkeypatch.setattr('src.SMS_DB.migrate._schema_checked', False)
+
+    with patch('src.SMS_DB.migrate.DBEngine') as mock_db_engine:
+        mock_db = mock_db_engine.return_value.__enter__.return_value
+        mock_db.cursor.fetchone.return_value = ('"Schema Migrations"',)
+        mock_db.cursor.fetchall.return_value = [('001_tables',)]
+        with pytest.raises(PendingMigrationsError, match='002_versions.*Apply Database Migrations'):
+            check_migrations(str(tmp_path))
+
+        mock_db.cursor.fetchall.return_value = [('001_tables',), ('002_versions',)]
+        check_migrations(str(tmp_path))
+        check_migrations(str(tmp_path))
+
+    assert mock_db_engine.call_count == 2
+    assert not any('CREATE TABLE' in call[0][0] for call in mock_db.cursor.execute.call_args_list)
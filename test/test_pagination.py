@@ -0,0 +1,56 @@
+import pytest
+from unittest.mock import patch, MagicMock
+from src.pagination import iter_keyset, print_paged
+from src.product.product import DryStorageItem
+
+
+def test_iter_keyset_fetches_batches_after_last_key() -> None:
+    """Test that each batch continues after the last key of the previous one."""
+    mock_engine = MagicMock()
+    mock_cursor = mock_engine.return_value.__enter__.return_value.cursor
+    mock_cursor.fetchall.side_effect = [[(1, 'a'), (2, 'b')], [(5, 'c')]]
+
+    rows = list(iter_keyset(mock_engine, 'SELECT "ID", "Name" FROM "T"', '"ID"', batch_size=2))
+
+    assert rows == [(1, 'a'), (2, 'b'), (5, 'c')]
+    first, second = mock_cursor.execute.call_args_list
+    assert first[0] == ('SELECT "ID", "Name" FROM "T" ORDER BY "ID" LIMIT %s', (2,))
+    assert second[0] == ('SELECT "ID", "Name" FROM "T" WHERE "ID" > %s ORDER BY "ID" LIMIT %s', (2, 2))
+
+
+def test_iter_keyset_starts_after_id() -> None:
+    """Test that after_id resumes iteration and a short batch ends it."""
+    mock_engine = MagicMock()
+    mock_cursor = mock_engine.return_value.__enter__.return_value.cursor
+    mock_cursor.fetchall.return_value = []
+
+    assert list(iter_keyset(mock_engine, 'SELECT "ID" FROM "T"', '"ID"', batch_size=10, after_id=7)) == []
+    assert mock_cursor.execute.call_args[0][1] == (7, 10)
+
+
+def test_iter_keyset_rejects_invalid_batch_size() -> None:
+    """Test that a non-positive batch size is rejected."""
+    with pytest.raises(ValueError):
+        list(iter_keyset(MagicMock(), 'SELECT "ID" FROM "T"', '"ID"', batch_size=0))
+
+
+def test_iter_all_dry_storage_items() -> None:
+    """Test that DryStorageItem.iter_all hydrates objects from keyset batches."""
+    with patch('src.product.product.DBEngine') as mock_db_engine:
+        mock_cursor = mock_db_engine.return_value.__enter__.return_value.cursor
+        mock_cursor.fetchall.return_value = [(3, "Item 3", 10, 100, True, False, "Box", 1)]
+
+        items = list(DryStorageItem.iter_all(batch_size=5))
+
+        assert [item.id for item in items] == [3]
+        assert items[0].package_type == "Box"
+
+
+def test_print_paged_stops_on_quit(capsys: pytest.CaptureFixture[str]) -> None:
+    """Test that paging stops when the user answers 'q'."""
+    with patch('builtins.input', return_value='q') as mock_input:
+        printed = print_paged(iter(range(5)), page_size=2)
+
+    assert printed == 2
+    assert capsys.readouterr().out == "0\n1\n"
+    mock_input.assert_called_once()
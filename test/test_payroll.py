@@ -0,0 +1,85 @@
+import io
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+from src.person.payroll import PayrollTotal, display_totals, export_csv, export_csv_file, totals
+from src.person.worker import Worker
+
+
+def test_totals_per_store_in_one_query() -> None:
+    """Test that per-store totals come from one grouped query over all staff tables."""
+    with patch('src.person.payroll.DBEngine') as mock_db_engine:
+        mock_cursor = mock_db_engine.return_value.__enter__.return_value.cursor
+        mock_cursor.fetchall.return_value = [(1, 'Manager', 1, 2000), (1, 'Worker', 2, 900), (1, None, 3, 2900)]
+
+        rows = totals('store')
+
+    query = mock_cursor.execute.call_args[0][0]
+    assert mock_cursor.execute.call_count == 1
+    assert 'GROUPING SETS (("StoreID", "Role"), ("StoreID"))' in query
+    assert all(table in query for table in ('FROM "Worker"', 'FROM "Manager"', 'FROM "Store Manager"'))
+    assert rows[-1] == PayrollTotal(1, None, 3, 2900)
+
+
+def test_totals_rejects_unknown_grouping() -> None:
+    """Test that only the supported groupings are accepted."""
+    with pytest.raises(ValueError):
+        totals('city')
+
+
+def test_display_totals_per_country(capsys: pytest.CaptureFixture[str]) -> None:
+    """Test that group totals are labelled across roles."""
+    with patch('src.person.payroll.DBEngine') as mock_db_engine:
+        mock_cursor = mock_db_engine.return_value.__enter__.return_value.cursor
+        mock_cursor.fetchall.return_value = [('Lithuania', 'Worker', 2, 900), ('Lithuania', None, 2, 900)]
+
+        display_totals('country')
+
+    out = capsys.readouterr().out
+    assert "Country: Lithuania, Worker: Headcount: 2, Total: 900" in out
+    assert "Country: Lithuania, All roles: Headcount: 2, Total: 900" in out
+
+
+def test_export_csv_streams_with_copy() -> None:
+    """Test that the export writes a header and lets COPY stream the rows."""
+    destination = io.StringIO()
+    with patch('src.person.payroll.DBEngine') as mock_db_engine:
+        mock_cursor = mock_db_engine.return_value.__enter__.return_value.cursor
+        mock_cursor.rowcount = 3
+
+        assert export_csv(destination) == 3
+
+    sql, stream = mock_cursor.copy_expert.call_args[0]
+    assert sql.startswith('COPY (SELECT "Role", "ID", "Name", "Country", "StoreID", "Pay"')
+    assert sql.endswith('TO STDOUT WITH (FORMAT csv)')
+    assert stream is destination
+    assert destination.getvalue() == 'Role,ID,Name,Country,StoreID,Pay\n'
+
+
+def test_export_role_totals_has_one_column_per_key(tmp_path: Path) -> None:
+    """Test that role totals export without an empty role column and bad groupings create no file."""
+    destination = io.StringIO()
+    with patch('src.person.payroll.DBEngine') as mock_db_engine:
+        mock_cursor = mock_db_engine.return_value.__enter__.return_value.cursor
+        mock_cursor.rowcount = 3
+
+        export_csv(destination, by='role')
+
+        with pytest.raises(ValueError):
+            export_csv_file(str(tmp_path / 'payroll.csv'), by='city')
+
+    assert destination.getvalue() == 'Role,Headcount,Total\n'
+    assert mock_cursor.copy_expert.call_args[0][0].startswith('COPY (SELECT "Role", COUNT(*)')
+    assert not (tmp_path / 'payroll.csv').exists()
+
+
+def test_worker_display_all_salaries(capsys: pytest.CaptureFixture[str]) -> None:
+    """Test that worker salaries are computed in SQL and printed."""
+    with patch('src.person.payroll.DBEngine') as mock_db_engine:
+        mock_cursor = mock_db_engine.return_value.__enter__.return_value.cursor
+        mock_cursor.fetchall.return_value = [(3, 'Ona', 450)]
+
+        Worker.display_all_salaries()
+
+    assert '"HourlyRate"::BIGINT * "AmountWorked"' in mock_cursor.execute.call_args[0][0]
+    assert "ID: 3, Name: Ona, Salary: 450" in capsys.readouterr().out
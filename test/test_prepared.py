@@ -0,0 +1,72 @@
+import pytest
+from unittest.mock import MagicMock
+from psycopg2 import errors, extensions
+from src.db_engine import PooledConnection
+from src.prepared import execute_prepared, stats, to_server_placeholders
+
+FIND_SQL = 'SELECT "Name" FROM "Worker" WHERE "WorkerID" = %s AND "StoreID" = %s'
+
+
+def make_cursor(backend_pid: int = 42) -> MagicMock:
+    """Create a cursor mock on a pooled connection with no prepared statements yet."""
+    connection = MagicMock(spec=PooledConnection)
+    connection.prepared = None
+    connection.info.backend_pid = backend_pid
+    connection.info.transaction_status = extensions.TRANSACTION_STATUS_IDLE
+    cursor = MagicMock()
+    cursor.connection = connection
+    return cursor
+
+
+@pytest.fixture(autouse=True)
+def reset_stats() -> None:
+    stats.reset()
+
+
+def test_statement_is_prepared_once_per_connection() -> None:
+    """Test that the first call prepares the query and later calls only execute it."""
+    cursor = make_cursor()
+
+    execute_prepared(cursor, FIND_SQL, (7, 2))
+    execute_prepared(cursor, FIND_SQL, (8, 2))
+
+    assert [call[0] for call in cursor.execute.call_args_list] == [
+        ('PREPARE sms_stmt_1 AS SELECT "Name" FROM "Worker" WHERE "WorkerID" = $1 AND "StoreID" = $2',),
+        ('EXECUTE sms_stmt_1 (%s, %s)', (7, 2)),
+        ('EXECUTE sms_stmt_1 (%s, %s)', (8, 2)),
+    ]
+    assert (stats.prepares, stats.executions, stats.hit_rate) == (1, 2, 0.5)
+
+
+def test_new_server_session_prepares_again() -> None:
+    """Test that a registry from another backend is dropped and unpooled cursors run plain SQL."""
+    cursor = make_cursor()
+    execute_prepared(cursor, FIND_SQL, (7, 2))
+    cursor.connection.info.backend_pid = 43
+
+    execute_prepared(cursor, FIND_SQL, (7, 2))
+
+    assert stats.prepares == 2 and stats.resets == 1
+
+    plain = MagicMock()
+    execute_prepared(plain, FIND_SQL, (7, 2))
+    plain.execute.assert_called_once_with(FIND_SQL, (7, 2))
+
+
+def test_lost_statement_is_prepared_again_at_transaction_start() -> None:
+    """Test that statements dropped on the server are re-prepared when nothing else is lost."""
+    cursor = make_cursor()
+    execute_prepared(cursor, FIND_SQL, (7, 2))
+    cursor.execute.side_effect = [errors.InvalidSqlStatementName("prepared statement does not exist"), None, None]
+
+    execute_prepared(cursor, FIND_SQL, (7, 2))
+
+    cursor.connection.rollback.assert_called_once()
+    assert cursor.execute.call_args_list[-2][0][0].startswith('PREPARE sms_stmt_1 AS')
+    assert stats.resets == 1
+
+
+def test_to_server_placeholders() -> None:
+    """Test that psycopg2 placeholders are numbered in order."""
+    assert to_server_placeholders('UPDATE "Store" SET "StoreName" = %s WHERE "StoreID" = %s') == \
+        'UPDATE "Store" SET "StoreName" = $1 WHERE "StoreID" = $2'
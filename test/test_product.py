@@ -42,8 +42,10 @@ def test_update_dry_storage_item() -> None:
 
         expected_sql = """
             UPDATE "Dry Storage Item"
-            SET "Name" = %s, "Amount" = %s, "Price" = %s, "RecipeItem" = %s, "Chemical" = %s, "PackageType" = %s
+            SET "Name" = %s, "Amount" = %s, "Price" = %s, "RecipeItem" = %s, "Chemical" = %s, "PackageType" = %s,
+                "Version" = "Version" + 1
             WHERE "DryStorageItemID" = %s
+            RETURNING "Version"
         """
         actual_sql = mock_cursor.execute.call_args[0][0]  # Get the SQL query string from the mock call
         assert normalize_sql(expected_sql) == normalize_sql(actual_sql)
@@ -57,8 +59,8 @@ def test_view_all_dry_storage_items() -> None:
         mock_db_engine.return_value.__enter__.return_value = mock_instance
         mock_cursor = mock_instance.cursor
         mock_cursor.fetchall.return_value = [
-            (1, "Item 1", 10, 100, True, False, "Box"),
-            (2, "Item 2", 20, 200, False, True, "Bag")
+            (1, "Item 1", 10, 100, True, False, "Box", 1),
+            (2, "Item 2", 20, 200, False, True, "Bag", 1)
         ]
 
         items = DryStorageItem.view_all()
@@ -74,7 +76,7 @@ def test_find_by_id_dry_storage_item() -> None:
         mock_instance = MagicMock()
         mock_db_engine.return_value.__enter__.return_value = mock_instance
         mock_cursor = mock_instance.cursor
-        mock_cursor.fetchone.return_value = (1, "Item 1", 10, 100, True, False, "Box")
+        mock_cursor.fetchone.return_value = (1, "Item 1", 10, 100, True, False, "Box", 1)
 
         item = DryStorageItem.find_by_id(1)
 
@@ -133,8 +135,10 @@ def test_update_food_item() -> None:
 
         expected_sql = """
             UPDATE "Food Item"
-            SET "Name" = %s, "Amount" = %s, "Price" = %s, "StorageCondition" = %s, "ExpiryDate" = %s
+            SET "Name" = %s, "Amount" = %s, "Price" = %s, "StorageCondition" = %s, "ExpiryDate" = %s,
+                "Version" = "Version" + 1
             WHERE "FoodItemID" = %s
+            RETURNING "Version"
         """
         actual_sql = mock_cursor.execute.call_args[0][0]  # Get the SQL query string from the mock call
         assert normalize_sql(expected_sql) == normalize_sql(actual_sql)
@@ -148,8 +152,8 @@ def test_view_all_food_items() -> None:
         mock_db_engine.return_value.__enter__.return_value = mock_instance
         mock_cursor = mock_instance.cursor
         mock_cursor.fetchall.return_value = [
-            (1, "Food 1", 10, 200, "Cool", "2025-01-01"),
-            (2, "Food 2", 20, 300, "Warm", "2024-12-31")
+            (1, "Food 1", 10, 200, "Cool", "2025-01-01", 1),
+            (2, "Food 2", 20, 300, "Warm", "2024-12-31", 1)
         ]
 
         items = FoodItem.view_all()
@@ -165,7 +169,7 @@ def test_find_by_id_food_item() -> None:
         mock_instance = MagicMock()
         mock_db_engine.return_value.__enter__.return_value = mock_instance
         mock_cursor = mock_instance.cursor
-        mock_cursor.fetchone.return_value = (1, "Food 1", 10, 200, "Cool", "2025-01-01")
+        mock_cursor.fetchone.return_value = (1, "Food 1", 10, 200, "Cool", "2025-01-01", 1)
 
         item = FoodItem.find_by_id(1)
 
@@ -188,3 +192,119 @@ def test_delete_food_item() -> None:
             (3,)
         )
         assert item.id is None
+
+def test_find_by_id_uses_identity_map() -> None:
+    """Test that repeated lookups are served from the cache until the item is saved."""
+    DryStorageItem.cache.clear()
+    with patch('src.product.product.DBEngine') as mock_db_engine:
+        mock_instance = MagicMock()
+        mock_db_engine.return_value.__enter__.return_value = mock_instance
+        mock_cursor = mock_instance.cursor
+        mock_cursor.fetchone.return_value = (7, "Item 7", 10, 100, True, False, "Box", 3)
+
+        first = DryStorageItem.find_by_id(7)
+        second = DryStorageItem.find_by_id(7)
+        assert first is not None and second is not None
+        assert mock_cursor.execute.call_count == 1
+        assert DryStorageItem.cache.hits == 1
+
+        first.amount = 11
+        assert second.amount == 10
+        first.save()
+        DryStorageItem.find_by_id(7)
+        assert mock_cursor.execute.call_count == 3
+    DryStorageItem.cache.clear()
+
+
+def test_save_drops_row_cached_during_write() -> None:
+    """Test that a lookup caching the old row while a save is in flight does not outlive the commit."""
+    DryStorageItem.cache.clear()
+    with patch('src.product.product.DBEngine') as mock_db_engine:
+        mock_instance = mock_db_engine.return_value.__enter__.return_value
+        mock_instance.cursor.fetchone.return_value = (7, "Item 7", 10, 100, True, False, "Box", 3)
+        item = DryStorageItem.find_by_id(7)
+        assert item is not None
+        stale = DryStorageItem.from_row((7, "Item 7", 10, 100, True, False, "Box", 3))
+        mock_instance.connection.commit.side_effect = lambda: DryStorageItem.cache.put(7, stale)
+
+        item.amount = 11
+        item.save()
+
+        assert 7 not in DryStorageItem.cache
+    DryStorageItem.cache.clear()
+
+def test_save_writes_only_changed_columns() -> None:
+    """Test that a loaded item only updates the columns changed since it was read."""
+    DryStorageItem.cache.clear()
+    with patch('src.product.product.DBEngine') as mock_db_engine:
+        mock_cursor = mock_db_engine.return_value.__enter__.return_value.cursor
+        mock_cursor.fetchone.return_value = (7, "Item 7", 10, 100, True, False, "Box", 3)
+
+        item = DryStorageItem.find_by_id(7)
+        assert item is not None
+        item.price = 120
+        item.package_type = "Bag"
+        item.save()
+
+        sql, params = mock_cursor.execute.call_args[0]
+        assert normalize_sql(sql) == normalize_sql('''
+            UPDATE "Dry Storage Item" SET "Price" = %s, "PackageType" = %s, "Version" = "Version" + 1
+            WHERE "DryStorageItemID" = %s AND "Version" = %s RETURNING "Version"
+        ''')
+        assert params == (120, "Bag", 7, 3)
+        assert not item.is_dirty
+    DryStorageItem.cache.clear()
+
+def test_save_without_changes_skips_database() -> None:
+    """Test that saving an unchanged item does not open a connection."""
+    with patch('src.product.product.DBEngine') as mock_db_engine:
+        item = FoodItem("Milk", 10, 2, "Cold", "2024-05-02", id=4).mark_clean()
+        item.save()
+
+        mock_db_engine.assert_not_called()
+
+def test_food_items_expiring_between_for_store() -> None:
+    """Test that a store filter joins through StoreFoodProduct and keeps the date range."""
+    with patch('src.product.product.DBEngine') as mock_db_engine:
+        mock_cursor = mock_db_engine.return_value.__enter__.return_value.cursor
+        mock_cursor.fetchall.return_value = [(4, "Milk", 10, 2, "Cold", "2024-05-02", 1)]
+
+        items = FoodItem.expiring_between("2024-05-01", "2024-05-07", store_id=3)
+
+        sql, params = mock_cursor.execute.call_args[0]
+        assert 'JOIN "Food Item" fi ON fi."FoodItemID" = sfp."FoodID"' in normalize_sql(sql)
+        assert params == (3, "2024-05-01", "2024-05-07")
+        assert [(item.id, item.name) for item in items] == [(4, "Milk")]
+
+def test_adjust_stock_is_relative_and_guarded() -> None:
+    """Test that a stock adjustment is a single guarded relative UPDATE."""
+    with patch('src.product.product.DBEngine') as mock_db_engine:
+        mock_cursor = mock_db_engine.return_value.__enter__.return_value.cursor
+        mock_cursor.fetchone.return_value = (7,)
+
+        assert DryStorageItem.adjust_stock(3, -2) == 7
+
+        sql, params = mock_cursor.execute.call_args[0]
+        assert normalize_sql(sql) == normalize_sql("""
+            UPDATE "Dry Storage Item" SET "Amount" = "Amount" + %s, "Version" = "Version" + 1
+            WHERE "DryStorageItemID" = %s AND "Amount" + %s >= 0 RETURNING "Amount"
+        """)
+        assert params == (-2, 3, -2)
+
+        mock_cursor.fetchone.return_value = None
+        assert DryStorageItem.adjust_stock(3, -100) is None
+
+def test_adjust_stock_many_all_or_nothing() -> None:
+    """Test that batched adjustments are rolled back when one of them is rejected."""
+    with patch('src.product.product.DBEngine') as mock_db_engine, \
+            patch('src.product.product.execute_values') as mock_execute_values:
+        mock_db = mock_db_engine.return_value.__enter__.return_value
+        mock_execute_values.return_value = [(1, 4)]
+
+        assert FoodItem.adjust_stock_many({2: -9, 1: 3}) == {1: 4}
+        assert mock_execute_values.call_args[0][2] == [(1, 3), (2, -9)]
+        assert 'FROM (VALUES %s) AS v(id, delta)' in mock_execute_values.call_args[0][1]
+        mock_db.connection.commit.assert_called_once()
+
+        assert FoodItem.adjust_stock_many({2: -9, 1: 3}, all_or_nothing=True) == {}
+        mock_db.connection.rollback.assert_called_once()
@@ -0,0 +1,96 @@
+import logging
+import pytest
+from typing import Iterator, List
+from unittest.mock import MagicMock, patch
+from src.db_engine import ConnectionPool
+from src.person.manager import Manager
+from src.person.worker import Worker
+from src.query_counter import QueryBudgetExceeded, count_queries
+from src.store.store import edit_store
+from src.store.store_product import view_dry_storage_items_in_store
+
+WORKER_ROW = (7, "Ona", 1, "ona@example.lt", "Lithuania", 10, 5, 2, 1)
+
+
+@pytest.fixture
+def cursor() -> Iterator[MagicMock]:
+    """Run real DBEngines on a mocked pool and yield the cursor every connection hands out."""
+    pool = MagicMock(spec=ConnectionPool)
+    with patch('src.db_engine.get_pool', return_value=pool):
+        yield pool.getconn.return_value.cursor.return_value
+
+
+@pytest.fixture(autouse=True)
+def empty_caches() -> None:
+    Worker.cache.clear()
+    Manager.cache.clear()
+
+
+def test_menu_actions_stay_within_budget(cursor: MagicMock) -> None:
+    """Test the connections and statements used by editing a store and a manager and listing store items."""
+    cursor.fetchone.return_value = ("Old Town",)
+    with patch('builtins.input', side_effect=["3", "New Town"]), count_queries(label="edit_store") as counter:
+        edit_store()
+    counter.assert_budget(connections=2, statements=2)
+
+    cursor.fetchone.return_value = (4, "Jonas", 1, "jonas@example.lt", "Lithuania", 3000, 2, 1)
+    with patch('builtins.input', side_effect=["4", "", "", "", "", "3500", ""]), \
+            count_queries(label="edit_manager") as counter:
+        Manager.edit_manager()
+    counter.assert_budget(connections=2, statements=2, round_trips=2)
+
+    cursor.fetchall.return_value = [(1, "Flour", 3, 2, True, False, "Bag")] * 50
+    with patch('builtins.input', return_value="3"), count_queries(label="view_dry_storage_items_in_store") as counter:
+        view_dry_storage_items_in_store()
+    counter.assert_budget(connections=1, statements=1)
+
+
+def test_repeated_lookups_are_flagged_as_n_plus_one(cursor: MagicMock, caplog: pytest.LogCaptureFixture) -> None:
+    """Test that one query per row is reported while the batched lookup passes."""
+    cursor.fetchone.side_effect = [WORKER_ROW[:1] + (f"Worker {i}",) + WORKER_ROW[2:] for i in range(3)]
+    with caplog.at_level(logging.WARNING, logger='src.query_counter'), count_queries(label="per-row") as counter:
+        for id in (7, 8, 9):
+            Worker.cache.clear()
+            Worker.find_by_id(id)
+
+    assert counter.n_plus_one() == {'SELECT "WorkerID", "Name", "PhoneNumber", "Email", "Country", "HourlyRate", '
+                                    '"AmountWorked", "StoreID", "Version" FROM "Worker" WHERE "WorkerID" = ?': 3}
+    assert "Possible N+1 in per-row: 3 executions" in caplog.text
+    with pytest.raises(QueryBudgetExceeded, match="connections: 3 > 1"):
+        counter.assert_budget(connections=1)
+
+    cursor.fetchall.return_value = [WORKER_ROW]
+    with count_queries() as batched:
+        Worker.find_by_ids([7, 8, 9])
+    batched.assert_budget(connections=1, statements=1)
+
+
+def test_nothing_is_counted_outside_a_block(cursor: MagicMock) -> None:
+    """Test that counters nest and DBEngine cursors are only wrapped while one is active."""
+    with count_queries() as outer:
+        with count_queries() as inner:
+            cursor.fetchall.return_value = []
+            Worker.find_by_ids([1])
+        Worker.find_by_ids([2])
+
+    assert (inner.statements, outer.statements) == (1, 2)
+    cursor.fetchall.return_value = [WORKER_ROW]
+    Worker.find_by_ids([3])
+    assert outer.statements == 2
+
+
+def test_decorator_counts_each_call_from_zero(cursor: MagicMock) -> None:
+    """Test that a decorated function's counter holds the counts of its latest call only."""
+    counter = count_queries(warn=False)
+
+    @counter
+    def load(ids: List[int]) -> None:
+        for id in ids:
+            Worker.cache.clear()
+            Worker.find_by_id(id)
+
+    cursor.fetchone.return_value = WORKER_ROW
+    load([7, 8])
+    load([7])
+
+    assert (counter.connections, counter.statements) == (1, 1)
@@ -0,0 +1,53 @@
+import logging
+import pytest
+from unittest.mock import MagicMock, patch
+from src.db_engine import ConnectionPool, DBEngine
+from src.prepared import StatementRegistry
+from src.query_log import InstrumentedCursor, QueryLog, fingerprint, query_log, statement_fingerprint
+
+
+def test_fingerprint_ignores_values() -> None:
+    """Test that statements differing only in values share a fingerprint."""
+    assert fingerprint('SELECT "Name" FROM "Worker"\n  WHERE "WorkerID" = %s') == \
+        'SELECT "Name" FROM "Worker" WHERE "WorkerID" = ?'
+    assert fingerprint("UPDATE \"Worker\" SET \"Name\" = 'Ona' WHERE \"WorkerID\" IN (1, 2, 3) -- edit") == \
+        'UPDATE "Worker" SET "Name" = ? WHERE "WorkerID" IN (?)'
+    assert fingerprint('INSERT INTO "StoreDryProduct" VALUES (1, 2), (1, 3), (1, 4)') == \
+        fingerprint('INSERT INTO "StoreDryProduct" VALUES (5, 6)')
+
+
+def test_histogram_and_slow_log(caplog: pytest.LogCaptureFixture) -> None:
+    """Test that executions are aggregated per fingerprint and slow ones are logged."""
+    log = QueryLog(slow_threshold=0.2)
+    log.record('SELECT ?', 0.0005, rows=1)
+    log.record('SELECT ?', 0.03, rows=1)
+    with caplog.at_level(logging.WARNING, logger='src.query_log.slow'):
+        log.record('DELETE FROM "Store" WHERE "StoreID" = ?', 0.25, rows=1, failed=True)
+
+    stats = log.snapshot()['SELECT ?']
+    assert (stats.calls, stats.rows, stats.histogram[:4]) == (2, 2, [1, 0, 0, 1])
+    assert stats.percentile_ms(50) == 1.0 and stats.percentile_ms(95) == 50.0
+    assert [statement for statement, _ in log.top(1)] == ['DELETE FROM "Store" WHERE "StoreID" = ?']
+    assert 'Slow query (250.0 ms, 1 rows, failed): DELETE FROM "Store"' in caplog.text
+
+
+def test_instrumented_cursor_reports_prepared_query() -> None:
+    """Test that EXECUTE of a prepared statement is recorded under the query it runs."""
+    registry = StatementRegistry(backend_pid=1)
+    name = registry.add('SELECT "Name" FROM "Worker" WHERE "WorkerID" = %s')
+    cursor = MagicMock()
+    cursor.connection.prepared = registry
+    query_log.reset()
+
+    query_log.record(statement_fingerprint(cursor, f'EXECUTE {name} (%s)'), 0.001, 1)
+
+    assert list(query_log.snapshot()) == ['SELECT "Name" FROM "Worker" WHERE "WorkerID" = ?']
+    query_log.reset()
+
+
+@patch.dict('os.environ', {'DB_QUERY_STATS': '1'})
+def test_engine_hands_out_instrumented_cursor() -> None:
+    """Test that DBEngine asks for an instrumented cursor only when statistics are enabled."""
+    pool = MagicMock(spec=ConnectionPool)
+    DBEngine(pool=pool)
+    pool.getconn.return_value.cursor.assert_called_once_with(cursor_factory=InstrumentedCursor)
@@ -0,0 +1,133 @@
+import pytest
+from typing import Any
+from unittest.mock import patch, MagicMock
+from src.session import Session
+from src.tracking import VersionConflictError
+from src.store.store import Store
+from src.product.product import DryStorageItem
+from src.person.worker import Worker
+
+
+def make_engine() -> MagicMock:
+    """Create a DBEngine factory mock whose context yields a mock connection and cursor."""
+    engine = MagicMock()
+    engine.return_value.__enter__.return_value = MagicMock()
+    return engine
+
+
+def test_flush_inserts_parents_first_and_resolves_references() -> None:
+    """Test that a store, its products and workers are written in one transaction in FK order."""
+    engine = make_engine()
+    db = engine.return_value.__enter__.return_value
+    db.cursor.fetchall.side_effect = [[(10,)], [(21,), (22,)], [(31,)]]
+
+    with patch('src.session.execute_values') as mock_values:
+        store = Store("Kaunas")
+        items = [DryStorageItem("Flour", 1, 2, True, False, "Bag"), DryStorageItem("Salt", 3, 4, True, False, "Box")]
+        worker = Worker("Ona", 1, "ona@example.lt", "Lithuania", 10, 0, 0)
+        with Session(engine=engine) as session:
+            session.add(worker, store_id=store)
+            for item in items:
+                session.add(item)
+                session.add_link('StoreDryProduct', StoreID=store, DryStorageID=item)
+            session.add(store)
+
+    tables = [call.args[1].split('(')[0].strip() for call in mock_values.call_args_list]
+    assert tables == ['INSERT INTO "Store"', 'INSERT INTO "Dry Storage Item"', 'INSERT INTO "Worker"',
+                      'INSERT INTO "StoreDryProduct"']
+    assert [call.args[1] for call in db.cursor.execute.call_args_list] == [
+        ('"Store"', 'StoreID', 1), ('"Dry Storage Item"', 'DryStorageItemID', 2), ('"Worker"', 'WorkerID', 1)]
+    assert store.store_id == 10
+    assert [item.id for item in items] == [21, 22]
+    assert worker.id == 31 and worker.version == 1
+    assert worker.store_id == 10 and not worker.is_dirty
+    assert mock_values.call_args_list[1].args[2] == [[21, "Flour", 1, 2, True, False, "Bag"],
+                                                     [22, "Salt", 3, 4, True, False, "Box"]]
+    assert mock_values.call_args_list[2].args[2] == [[31, "Ona", 1, "ona@example.lt", "Lithuania", 10, 0, 10]]
+    assert mock_values.call_args_list[3].args[2] == [(10, 21), (10, 22)]
+    assert session.statements == 7
+    db.connection.commit.assert_called_once()
+    engine.assert_called_once()
+
+
+def test_flush_batches_updates_and_deletes() -> None:
+    """Test that versioned updates use one checked statement and deletes a single ANY() statement per table."""
+    engine = make_engine()
+    db = engine.return_value.__enter__.return_value
+    db.cursor.fetchall.return_value = [(5, 4), (6, 1)]
+    DryStorageItem.cache.put(5, MagicMock())
+
+    session = Session(engine=engine)
+    flour = DryStorageItem("Flour", 1, 2, True, False, "Bag", id=5)
+    flour.version = 3
+    salt = DryStorageItem("Salt", 3, 4, True, False, "Box", id=6)
+    session.add(flour)
+    session.add(salt)
+    gone = [Store("Old", store_id=1), Store("Older", store_id=2)]
+    for store in gone:
+        session.delete(store)
+    session.flush()
+
+    (update, (rows,)), delete = [call.args for call in db.cursor.execute.call_args_list]
+    assert update.startswith('UPDATE "Dry Storage Item" AS t SET "Name" = v."Name"')
+    assert 't."Version" = v."Version"' in update and update.endswith('RETURNING t."DryStorageItemID", t."Version"')
+    assert [(row['DryStorageItemID'], row['Version']) for row in rows.adapted] == [(5, 3), (6, None)]
+    assert delete == ('DELETE FROM "Store" WHERE "StoreID" = ANY(%s)', ([1, 2],))
+    assert (flour.version, salt.version) == (4, 1)
+    assert all(store.store_id is None for store in gone)
+    assert 5 not in DryStorageItem.cache
+    assert session.pending == 0
+
+
+def test_stale_version_fails_the_flush() -> None:
+    """Test that a batched update of a row changed elsewhere rolls back instead of overwriting it."""
+    engine = make_engine()
+    db = engine.return_value.__enter__.return_value
+    db.cursor.fetchall.return_value = [(6, 2)]
+    stale = DryStorageItem("Flour", 1, 2, True, False, "Bag", id=5)
+    stale.version = 3
+
+    session = Session(engine=engine)
+    session.add(stale)
+    session.add(DryStorageItem("Salt", 3, 4, True, False, "Box", id=6))
+    with pytest.raises(VersionConflictError):
+        session.flush()
+
+    db.connection.rollback.assert_called_once()
+    db.connection.commit.assert_not_called()
+    assert stale.version == 3
+    assert session.pending == 2
+
+
+def test_failed_flush_rolls_back_and_clears_assigned_ids() -> None:
+    """Test that a failing statement rolls back and leaves new objects without IDs."""
+    engine = make_engine()
+    db = engine.return_value.__enter__.return_value
+
+    def fail_on_worker(cursor: Any, query: str, rows: Any, **kwargs: Any) -> None:
+        if '"Worker"' in query:
+            raise RuntimeError("insert failed")
+
+    db.cursor.fetchall.side_effect = [[(1,)], [(2,)]]
+
+    store = Store("Klaipeda")
+    worker = Worker("Jonas", 1, "j@example.lt", "Lithuania", 10, 0, 0)
+    session = Session(engine=engine)
+    session.add(store)
+    session.add(worker, store_id=store)
+    with patch('src.session.execute_values', side_effect=fail_on_worker):
+        with pytest.raises(RuntimeError):
+            session.flush()
+
+    db.connection.rollback.assert_called_once()
+    assert store.store_id is None and worker.store_id == 0
+    assert session.pending == 2
+
+
+def test_unknown_link_table_rejected() -> None:
+    """Test that link rows must name a known link table and both of its columns."""
+    session = Session(engine=make_engine())
+    with pytest.raises(ValueError):
+        session.add_link('StoreDryProduct', StoreID=1)
+    with pytest.raises(ValueError):
+        session.add_link('Nope', A=1, B=2)
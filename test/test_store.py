@@ -66,6 +66,42 @@ class TestStore(unittest.TestCase):
         self.assertIn("StoreID", self.normalize_sql(query))
         self.assertEqual(params, (1,))
 
+    @patch('src.store.store.DBEngine')
+    def test_cascade_delete_in_batches(self, mock_db_engine: MagicMock) -> None:
+        """Test that a cascading delete clears dependents batch by batch in one transaction."""
+        mock_db = mock_db_engine.return_value.__enter__.return_value
+        rowcounts = iter([0, 1, 0, 2, 2, 1, 2, 0, 1, 1])
+        mock_db.cursor.execute.side_effect = lambda *args: setattr(mock_db.cursor, 'rowcount', next(rowcounts))
+
+        counts = Store(store_name="Old Town", store_id=5).delete(cascade=True, batch_size=2)
+
+        self.assertEqual(counts, {'SM Responsibilities': 0, 'Store Manager': 1, 'Manager': 0, 'Worker': 5,
+                                  'StoreDryProduct': 2, 'StoreFoodProduct': 1, 'Store': 1})
+        queries = [self.normalize_sql(call[0][0]) for call in mock_db.cursor.execute.call_args_list]
+        self.assertEqual(queries[3], 'DELETE FROM "Worker" WHERE ctid IN '
+                                     '(SELECT ctid FROM "Worker" WHERE "StoreID" = %s LIMIT %s)')
+        self.assertEqual(mock_db.cursor.execute.call_args_list[3][0][1], (5, 2))
+        self.assertEqual(queries[-1], 'DELETE FROM "Store" WHERE "StoreID" = %s')
+        mock_db.connection.commit.assert_called_once()
+
+    @patch('src.store.store.DBEngine')
+    def test_cascade_delete_reassigns_staff(self, mock_db_engine: MagicMock) -> None:
+        """Test that staff are moved instead of deleted and a failure rolls everything back."""
+        mock_db = mock_db_engine.return_value.__enter__.return_value
+        mock_db.cursor.rowcount = 0
+        mock_db.cursor.execute.side_effect = [None, None, None, None, Exception("boom")]
+
+        store = Store(store_name="Old Town", store_id=5)
+        self.assertEqual(store.delete(cascade=True, reassign_to=2), {})
+
+        query, params = mock_db.cursor.execute.call_args_list[0][0]
+        self.assertTrue(self.normalize_sql(query).startswith(
+            'UPDATE "Store Manager" SET "StoreID" = %s, "Version" = "Version" + 1 WHERE ctid IN'))
+        self.assertEqual(params, (2, 5, 5000))
+        mock_db.connection.rollback.assert_called_once()
+        mock_db.connection.commit.assert_not_called()
+        self.assertEqual(store.store_id, 5)
+
     @patch('src.store.store.DBEngine')
     def test_view_all_stores(self, mock_db_engine: MagicMock) -> None:
         """Test retrieving all stores from the database."""
@@ -93,6 +129,34 @@ class TestStore(unittest.TestCase):
         self.assertIn('"StoreID"', self.normalize_sql(query))
         self.assertIn('"StoreName"', self.normalize_sql(query))
 
+    @patch('src.store.store.DBEngine')
+    def test_clone_from_copies_links_server_side(self, mock_db_engine: MagicMock) -> None:
+        """Test that cloning copies links and responsibilities with INSERT ... SELECT without moving the manager."""
+        mock_db = mock_db_engine.return_value.__enter__.return_value
+        mock_db.cursor.fetchone.return_value = (9,)
+
+        store = Store.clone_from(3, "Kaunas 2", store_manager_id=4)
+
+        assert store is not None
+        self.assertEqual((store.store_id, store.store_name), (9, "Kaunas 2"))
+        queries = [self.normalize_sql(call[0][0]) for call in mock_db.cursor.execute.call_args_list]
+        self.assertIn('INSERT INTO "StoreDryProduct" ("StoreID", "DryStorageID") SELECT %s, "DryStorageID"', queries[1])
+        self.assertIn('INSERT INTO "StoreFoodProduct" ("StoreID", "FoodID") SELECT %s, "FoodID"', queries[2])
+        self.assertIn('INSERT INTO "SM Responsibilities"', queries[3])
+        self.assertEqual(mock_db.cursor.execute.call_args_list[3][0][1], (4, 3))
+        self.assertEqual(len(queries), 4)
+        mock_db.connection.commit.assert_called_once()
+
+    @patch('src.store.store.DBEngine')
+    def test_clone_from_missing_source(self, mock_db_engine: MagicMock) -> None:
+        """Test that cloning an unknown store creates nothing."""
+        mock_db = mock_db_engine.return_value.__enter__.return_value
+        mock_db.cursor.fetchone.return_value = None
+
+        self.assertIsNone(Store.clone_from(404, "Nowhere"))
+        mock_db.cursor.execute.assert_called_once()
+        mock_db.connection.commit.assert_not_called()
+
 
 if __name__ == '__main__':
     unittest.main()
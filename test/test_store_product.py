@@ -45,6 +45,21 @@ class TestStoreDryProduct(unittest.TestCase):
         self.assertEqual(normalize_query(expected_query), normalize_query(actual_query))
         self.assertEqual(actual_params, (1, 2))
 
+    @patch('src.store.store_product.DBEngine')
+    def test_stores_for_many_dry_storage_items(self, mock_db_engine: MagicMock) -> None:
+        """Test finding the stores that carry several dry storage items in one query."""
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.return_value = [(2, 1), (2, 4), (5, 3)]
+        mock_db_engine.return_value.__enter__.return_value = MagicMock(cursor=mock_cursor)
+
+        stores = StoreDryProduct.stores_for_many([5, 2, 9, 2])
+
+        actual_query, actual_params = mock_cursor.execute.call_args[0]
+        self.assertIn('WHERE "DryStorageID" = ANY(%s)', normalize_query(actual_query))
+        self.assertEqual(actual_params, ([5, 2, 9],))
+        self.assertEqual(stores, {2: [1, 4], 5: [3]})
+        mock_cursor.execute.assert_called_once()
+
 class TestStoreFoodProduct(unittest.TestCase):
     """Test suite for the `StoreFoodProduct` class."""
 
@@ -84,5 +99,15 @@ class TestStoreFoodProduct(unittest.TestCase):
         self.assertEqual(normalize_query(expected_query), normalize_query(actual_query))
         self.assertEqual(actual_params, (1, 2))
 
+    @patch('src.store.store_product.DBEngine')
+    def test_stores_for_food_item(self, mock_db_engine: MagicMock) -> None:
+        """Test finding the stores that carry one food item."""
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.return_value = [(7, 1), (7, 2)]
+        mock_db_engine.return_value.__enter__.return_value = MagicMock(cursor=mock_cursor)
+
+        self.assertEqual(StoreFoodProduct.stores_for(7), [1, 2])
+        self.assertIn('WHERE "FoodID" = ANY(%s)', normalize_query(mock_cursor.execute.call_args[0][0]))
+
 if __name__ == '__main__':
     unittest.main()
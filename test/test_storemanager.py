@@ -18,11 +18,8 @@ class TestStoreManager(unittest.TestCase):
         store_manager.save()
 
         mock_cursor.execute.assert_called_once_with(
-            """
-                INSERT INTO "Store Manager" ("StoreID", "Name", "Country", "Email", "PhoneNumber", "MonthlySalary", "PettyCash")
-                VALUES (%s, %s, %s, %s, %s, %s, %s)
-                RETURNING "StoreManagerID"
-            """,
+            'INSERT INTO "Store Manager" ("StoreID", "Name", "Country", "Email", "PhoneNumber", "MonthlySalary", "PettyCash") '
+            'VALUES (%s, %s, %s, %s, %s, %s, %s) RETURNING "StoreManagerID"',
             (15, "Dainius Petrauskas", "Lithuania", "dainius.petrauskas@example.lt", 861234567, 4500, 200)
         )
         self.assertEqual(store_manager.id, 99)
@@ -38,14 +35,15 @@ class TestStoreManager(unittest.TestCase):
                                      country="Lithuania", store_id=23, monthly_salary=5200, petty_cash=350, id=42)
         store_manager.save()
 
-        mock_cursor.execute.assert_called_once_with(
-            """
-                UPDATE "Store Manager"
-                SET "StoreID" = %s, "Name" = %s, "Country" = %s, "Email" = %s, "PhoneNumber" = %s, "MonthlySalary" = %s, "PettyCash" = %s
-                WHERE "StoreManagerID" = %s
-            """,
-            (23, "Gintaras Vaitkus", "Lithuania", "gintaras.vaitkus@example.lt", 862345678, 5200, 350, 42)
+        mock_cursor.execute.assert_called_once()
+        sql, params = mock_cursor.execute.call_args[0]
+        self.assertEqual(
+            " ".join(sql.split()),
+            'UPDATE "Store Manager" SET "StoreID" = %s, "Name" = %s, "Country" = %s, "Email" = %s, '
+            '"PhoneNumber" = %s, "MonthlySalary" = %s, "PettyCash" = %s, "Version" = "Version" + 1 '
+            'WHERE "StoreManagerID" = %s RETURNING "Version"'
         )
+        self.assertEqual(params, (23, "Gintaras Vaitkus", "Lithuania", "gintaras.vaitkus@example.lt", 862345678, 5200, 350, 42))
 
     @patch('src.person.storemanager.DBEngine')
     def test_delete_store_manager(self, mock_db_engine: MagicMock) -> None:
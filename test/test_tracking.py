@@ -0,0 +1,36 @@
+import pytest
+from unittest.mock import MagicMock, patch
+from src.person.worker import Worker
+from src.tracking import VersionConflictError, retry_on_conflict
+
+
+def test_stale_version_raises_conflict() -> None:
+    """Test that an UPDATE matching no row at the loaded version rolls back and raises."""
+    with patch('src.person.worker.DBEngine') as mock_db_engine:
+        mock_db = mock_db_engine.return_value
+        mock_db.cursor.fetchone.return_value = None
+
+        worker = Worker("Ona", 1, "ona@example.lt", "Lithuania", 10, 5, 2, id=7).mark_clean(3)
+        worker.hourly_rate = 12
+        with pytest.raises(VersionConflictError):
+            worker.save()
+
+        sql, params = mock_db.cursor.execute.call_args[0]
+        assert sql == ('UPDATE "Worker" SET "HourlyRate" = %s, "Version" = "Version" + 1 '
+                       'WHERE "WorkerID" = %s AND "Version" = %s RETURNING "Version"')
+        assert params == (12, 7, 3)
+        mock_db.connection.rollback.assert_called_once()
+        mock_db.connection.commit.assert_not_called()
+        assert worker.is_dirty and worker.version == 3
+
+
+def test_retry_on_conflict() -> None:
+    """Test that conflicts are retried and the last one is re-raised."""
+    operation = MagicMock(side_effect=[VersionConflictError('Worker', 7, 3), 'saved'])
+    assert retry_on_conflict(operation, delay=0) == 'saved'
+    assert operation.call_count == 2
+
+    failing = MagicMock(side_effect=VersionConflictError('Worker', 7, 3))
+    with pytest.raises(VersionConflictError):
+        retry_on_conflict(failing, attempts=2, delay=0)
+    assert failing.call_count == 2
@@ -0,0 +1,38 @@
+import pytest
+from unittest.mock import patch
+from src.store.valuation import StoreValuation, display_valuation_report, valuation_report
+
+
+def test_valuation_report_uses_one_grouped_query() -> None:
+    """Test that every store is valued by a single aggregate query."""
+    with patch('src.store.valuation.DBEngine') as mock_db_engine:
+        mock_cursor = mock_db_engine.return_value.__enter__.return_value.cursor
+        mock_cursor.fetchall.return_value = [
+            (1, 'Vilnius', 2, 500, 100, 400, 3, 90, {'Cold': 60, 'Dry': 30}),
+            (2, 'Kaunas', 0, 0, 0, 0, 0, 0, {}),
+        ]
+
+        report = valuation_report()
+
+    assert mock_cursor.execute.call_count == 1
+    query = mock_cursor.execute.call_args[0][0]
+    assert 'GROUP BY sdp."StoreID"' in query and 'FROM "StoreFoodProduct" sfp' in query
+    assert report.stores[0] == StoreValuation(1, 'Vilnius', 2, 500, 100, 400, 3, 90, {'Cold': 60, 'Dry': 30})
+    assert report.stores[0].total_value == 590
+    assert report.total_value == 590
+    assert report.elapsed >= 0
+
+
+def test_display_valuation_report(capsys: pytest.CaptureFixture[str]) -> None:
+    """Test that the report prints category splits and timing."""
+    with patch('src.store.valuation.DBEngine') as mock_db_engine:
+        mock_cursor = mock_db_engine.return_value.__enter__.return_value.cursor
+        mock_cursor.fetchall.return_value = [(1, 'Vilnius', 2, 500, 100, 400, 3, 90, {'Cold': 60})]
+
+        display_valuation_report()
+
+    out = capsys.readouterr().out
+    assert "ID: 1, Name: Vilnius, Total Value: 590" in out
+    assert "Dry: 2 items, Value: 500 (Chemical: 100, Recipe Items: 400)" in out
+    assert "Food: 3 items, Value: 90 (Cold: 60)" in out
+    assert "Valued 1 stores, total 590, in" in out